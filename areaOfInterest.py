@@ -0,0 +1,175 @@
+# Area of interest: η κατάσταση δημοσιεύεται ανά κελί του χάρτη σε ξεχωριστό topic του PUB
+#
+# Ο server χωρίζει τον χάρτη σε κελιά AOI_CELL × AOI_CELL pixels και κάθε κελί έχει δύο ροές από
+# delta snapshots (tiers): η κοντινή στέλνεται σε κάθε tick και η μακρινή κάθε FAR_EVERY ticks. Κάθε
+# ροή έχει δικό της DeltaEncoder, με keyframes μετατοπισμένα ανά κελί και όριο σε bytes ανά delta
+# (STATE_BUDGET) που γεμίζει με σειρά προτεραιότητας. Το topic είναι σταθερού μήκους: το byte
+# της μορφής (B/J), το tier και οι συντεταγμένες του κελιού ως 2 × uint16, ώστε το prefix matching
+# του ZeroMQ να μην μπερδεύει κελιά (π.χ. 1 με 12). Ένα subscribe στη μορφή + TIER_NEAR δίνει
+# όλα τα κελιά σε πλήρη ρυθμό.
+#
+# Ο client κάνει subscribe στα κελιά γύρω από την κάμερα και τα αλλάζει καθώς κινείται: στην κοντινή
+# ροή για τα κελιά δίπλα στον παίκτη του και στη μακρινή για τα υπόλοιπα. Το φιλτράρισμα γίνεται στον
+# publisher του ZeroMQ, οπότε ο client κατεβάζει και αποκωδικοποιεί μόνο τη γειτονιά του, και τα
+# μακρινά κελιά με το 1/FAR_EVERY του κόστους. Κελιά χωρίς κίνηση δεν στέλνουν τίποτα μέχρι το
+# επόμενο keyframe τους, και άδεια κελιά καθόλου.
+#
+# Budget: το δυαδικό μήνυμα ενός delta δεν ξεπερνάει τα STATE_BUDGET bytes. Μετράνε οι εγγραφές, τα
+# ονόματα των νέων οντοτήτων (NAME), οι αφαιρέσεις και τα μήκη των sections, ενώ για το header, το όνομα
+# της περιοχής (ως REGION_BYTES) και τα acks (ως ACK_LIMIT, βλ. server.py) κρατιέται σταθερός χώρος.
+# Τα keyframes εξαιρούνται (είναι πάντα πλήρη, βλ. deltaSnapshot.py). Η προτεραιότητα είναι ανά tier και
+# όχι ανά απόσταση από κάθε παίκτη: όλοι οι clients ενός κελιού μοιράζονται την ίδια ροή στο PUB, οπότε
+# ο server δεν μπορεί να διαλέξει διαφορετικές οντότητες για τον καθένα. Ό,τι είναι κοντά σε κάποιον
+# φτάνει σε κάθε tick από την κοντινή ροή, και μέσα στη ροή πρώτα οι νέες οντότητες και μετά όσες
+# περιμένουν περισσότερο (οι παίκτες πριν από τα mobs).
+
+import struct
+from collections import defaultdict
+from deltaSnapshot import DeltaEncoder, KEYFRAME_INTERVAL
+from wireProtocol import StateEncoder, record_bytes, SECTIONS, STATE_HEADER, COUNT, ACK, REMOVED_BYTES
+
+AOI_CELL = 512      # Μέγεθος κελιού σε pixels
+AOI_MARGIN = 128    # Ο client κάνει subscribe και σε κελιά τόσο έξω από την οθόνη
+AOI_KEEP = 384      # ... και κρατάει όσα είναι ως τόσο έξω (hysteresis στα όρια των κελιών)
+
+TIER_NEAR = 0       # Κάθε tick
+TIER_FAR = 1        # Κάθε FAR_EVERY ticks
+FAR_EVERY = 5       # 50 Hz / 5 = 10 Hz για ό,τι είναι μακριά
+NEAR_DISTANCE = 256 # Κελιά ως τόσο μακριά από τον παίκτη είναι "κοντινά"
+NEAR_KEEP = 384     # ... και μένουν κοντινά ως τόσο μακριά
+
+STATE_BUDGET = 1200     # Μέγιστα bytes για ένα delta (χωράει σε ένα πακέτο Ethernet)
+REGION_BYTES = 32       # Χώρος για το όνομα της περιοχής
+ACK_LIMIT = 16          # Μέγιστα acks σε ένα μήνυμα (τα υπόλοιπα φεύγουν στα επόμενα ticks)
+# Ό,τι μένει για αφαιρέσεις, εγγραφές και ονόματα: header, region, 3 μήκη ανά section, acks
+BUDGET_BYTES = (
+    STATE_BUDGET - STATE_HEADER.size - REGION_BYTES - 3 * COUNT.size * len(SECTIONS)
+    - COUNT.size - ACK_LIMIT * ACK.size
+)
+
+TOPIC = struct.Struct(">BHH")   # tier, συντεταγμένες κελιού μέσα στο topic
+
+def cell_of(x, y, size=AOI_CELL):
+    return (max(0, int(x // size)), max(0, int(y // size)))
+
+# Ροή = (tier, κελί)
+def stream_topic(prefix, stream):
+    tier, (cx, cy) = stream
+    return prefix + TOPIC.pack(tier, cx, cy)
+
+# Topic → ροή, None για topics χωρίς κελί
+def topic_stream(topic):
+    if len(topic) != 1 + TOPIC.size:
+        return None
+    tier, cx, cy = TOPIC.unpack_from(topic, 1)
+    return tier, (cx, cy)
+
+# Prefix για όλα τα κελιά ενός tier
+def tier_topic(prefix, tier):
+    return prefix + bytes((tier,))
+
+# Όλα τα κελιά που τέμνουν το ορθογώνιο
+def cells_in_rect(left, bottom, right, top, size=AOI_CELL):
+    x0, y0 = cell_of(left, bottom, size)
+    x1, y1 = cell_of(right, top, size)
+    return {(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)}
+
+# Κελιά που πρέπει να βλέπει ένας client με οθόνη w × h στο (x, y), κρατώντας όσα ήδη έχει αν είναι κοντά
+def cells_around(x, y, width, height, current=(), size=AOI_CELL):
+    half_w = width / 2
+    half_h = height / 2
+    cells = cells_in_rect(
+        x - half_w - AOI_MARGIN, y - half_h - AOI_MARGIN,
+        x + half_w + AOI_MARGIN, y + half_h + AOI_MARGIN, size
+    )
+    if current:
+        keep = cells_in_rect(
+            x - half_w - AOI_KEEP, y - half_h - AOI_KEEP,
+            x + half_w + AOI_KEEP, y + half_h + AOI_KEEP, size
+        )
+        cells |= keep.intersection(current)
+    return cells
+
+# Ροές για έναν client στο (x, y): κοντινή ροή για τα κελιά δίπλα του, μακρινή για τα υπόλοιπα
+def streams_around(x, y, width, height, current=(), size=AOI_CELL):
+    cells = cells_around(x, y, width, height, {cell for _, cell in current}, size)
+    near = cells_in_rect(x - NEAR_DISTANCE, y - NEAR_DISTANCE, x + NEAR_DISTANCE, y + NEAR_DISTANCE, size)
+    was_near = {cell for tier, cell in current if tier == TIER_NEAR}
+    if was_near:
+        keep = cells_in_rect(x - NEAR_KEEP, y - NEAR_KEEP, x + NEAR_KEEP, y + NEAR_KEEP, size)
+        near |= keep & was_near
+    return {(TIER_NEAR if cell in near else TIER_FAR, cell) for cell in cells}
+
+# Server: χωρίζει τις οντότητες σε κελιά και παράγει ένα delta μήνυμα ανά ροή που άλλαξε
+class CellDeltas:
+    def __init__(self, cell_size=AOI_CELL, keyframe_interval=KEYFRAME_INTERVAL, budget=BUDGET_BYTES):
+        self.cell_size = cell_size
+        self.keyframe_interval = keyframe_interval
+        self.budget = budget
+        self.tiers = ((TIER_NEAR, 1), (TIER_FAR, FAR_EVERY))
+        self.encoders = {tier: {} for tier, _ in self.tiers}   # tier → κελί → DeltaEncoder (μόνο κελιά με οντότητες)
+        self.retired_deferred = 0   # deferred των encoders που έχουν διαγραφεί
+
+    # Ενημερώσεις που μετατέθηκαν λόγω budget, σε όλες τις ροές
+    @property
+    def deferred(self):
+        return self.retired_deferred + sum(
+            encoder.deferred for encoders in self.encoders.values() for encoder in encoders.values()
+        )
+
+    # Το κελί μιας θέσης, με τον ίδιο υπολογισμό όπως στο encode
+    def cell(self, x, y):
+        inv = 1.0 / self.cell_size
+        return int(x * inv), int(y * inv)
+
+    # sections: section → iterable από (id, x, y). Επιστρέφει λίστα από (ροή, μήνυμα). Τα κελιά στο
+    # force στέλνουν κοντινό μήνυμα σε αυτό το tick ακόμα κι αν τίποτα δεν άλλαξε (π.χ. για ένα ack)
+    def encode(self, tick, sections, force=()):
+        # Οι θέσεις είναι πάντα μέσα στον χάρτη, οπότε το int() (προς το 0) δεν δίνει αρνητικά κελιά
+        inv = 1.0 / self.cell_size
+        buckets = {}
+        for name, items in sections.items():
+            section = buckets[name] = defaultdict(list)
+            for item in items:
+                section[int(item[1] * inv), int(item[2] * inv)].append(item)
+
+        occupied = set()
+        for section in buckets.values():
+            occupied.update(section)
+
+        messages = []
+        for tier, every in self.tiers:
+            encoders = self.encoders[tier]
+            for cell in occupied | encoders.keys():
+                # Η φάση μετατοπίζει και τα keyframes και τα ticks της μακρινής ροής (το every διαιρεί το interval)
+                phase = (cell[0] * 31 + cell[1] * 17) % self.keyframe_interval
+                if (tick + phase) % every:
+                    continue
+
+                encoder = encoders.get(cell)
+                if encoder is None:
+                    encoder = encoders[cell] = DeltaEncoder(
+                        self.keyframe_interval, phase, skip_unchanged=True, budget=self.budget,
+                        cost=record_bytes, removed_cost=REMOVED_BYTES
+                    )
+
+                bucket = {name: section.get(cell, ()) for name, section in buckets.items()}
+                msg = encoder.encode(tick, bucket, tier == TIER_NEAR and cell in force)
+                if msg is not None:
+                    messages.append(((tier, cell), msg))
+
+                # Το κελί άδειασε και όλες οι αφαιρέσεις στάλθηκαν: η επόμενη οντότητα ξεκινάει με keyframe
+                if cell not in occupied and not any(encoder.baselines.values()):
+                    self.retired_deferred += encoders.pop(cell).deferred
+
+        return messages
+
+# Ένας StateEncoder ανά ροή (τα net ids είναι ανά ροή)
+class CellEncoders(dict):
+    def __init__(self, scale):
+        super().__init__()
+        self.scale = scale
+
+    def __missing__(self, cell):
+        encoder = self[cell] = StateEncoder(self.scale)
+        return encoder
@@ -0,0 +1,97 @@
+# Checkpoints της κατάστασης του κόσμου για γρήγορο restart του server
+#
+# Μέσα στο tick κρατάμε μόνο ένα φθηνό αντίγραφο (pid, x, y) των παικτών. Η κωδικοποίηση
+# και η εγγραφή γίνονται σε thread, σε προσωρινό αρχείο που αντικαθιστά το παλιό με
+# os.replace (ατομικά), οπότε στον δίσκο υπάρχει πάντα ένα πλήρες checkpoint.
+#
+# Μορφή: header + μία εγγραφή ανά παίκτη (x, y, μήκος id, id σε JSON για να μένει int ή str).
+
+import json
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b"GCKP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHdIIIII")    # magic, version, χρόνος, tick, next_spawn_index, πλάτος, ύψος χάρτη, παίκτες
+PLAYER = struct.Struct("<ddH")          # x, y, μήκος id
+
+CHECKPOINT_PATH = "checkpoint.bin"
+CHECKPOINT_INTERVAL = 5.0       # Δευτερόλεπτα ανάμεσα σε δύο checkpoints
+
+# Αντίγραφο της κατάστασης που χρειάζεται το checkpoint (τρέχει μέσα στο tick, χωρίς I/O)
+def capture(world):
+    return {
+        "saved_at": time.time(),
+        "tick": world.tick,
+        "next_spawn_index": world.next_spawn_index,
+        "width": int(world.map.width),
+        "height": int(world.map.height),
+        "players": list(world.players.items()),
+    }
+
+def encode(state):
+    players = state["players"]
+    parts = [HEADER.pack(
+        MAGIC, VERSION, state["saved_at"], state["tick"], state["next_spawn_index"],
+        state["width"], state["height"], len(players)
+    )]
+    for pid, x, y in players:
+        raw = json.dumps(pid).encode()
+        parts.append(PLAYER.pack(x, y, len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+# Εγγραφή με ατομική αντικατάσταση (τρέχει σε thread executor)
+def write_checkpoint(path, state):
+    data = encode(state)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+# Ανάγνωση μέσω mmap, επιστρέφει None αν δεν υπάρχει ή δεν είναι έγκυρο checkpoint
+def read_checkpoint(path):
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            return None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            magic, version, saved_at, tick, next_spawn_index, width, height, count = HEADER.unpack_from(buf, 0)
+            if magic != MAGIC or version != VERSION:
+                return None
+
+            # Κομμένο ή χαλασμένο αρχείο (π.χ. αντιγραμμένο στη μέση): δεν είναι checkpoint
+            players = []
+            offset = HEADER.size
+            end = len(buf)
+            try:
+                for _ in range(count):
+                    x, y, size = PLAYER.unpack_from(buf, offset)
+                    offset += PLAYER.size + size
+                    if offset > end:
+                        return None
+                    players.append((json.loads(buf[offset - size:offset]), x, y))
+            except (struct.error, ValueError):
+                return None
+            if offset != end:
+                return None
+
+    return {
+        "saved_at": saved_at,
+        "tick": tick,
+        "next_spawn_index": next_spawn_index,
+        "width": width,
+        "height": height,
+        "players": players,
+    }
@@ -1,14 +1,30 @@
 import arcade
 import asyncio
+import json
+import os
 import threading
 import zmq
 import zmq.asyncio
+from collections import deque
 from queue import Queue
 import sys
 import time
 from login import MenuView
 from playerView import CreatePlayerView
 from classView import ClassSelectView
+from inputState import KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT
+from deltaSnapshot import DeltaDecoder
+from prediction import PlayerPrediction
+from clockSync import ClockSync
+from jitterBuffer import JitterBuffer
+from mapLoader import load_map
+from wireProtocol import (
+    StateDecoder, encode_input, encode_heartbeat, PROTOCOL_BINARY, PROTOCOL_JSON,
+    STATE_BINARY, STATE_JSON, HANDOFF_TOPIC
+)
+from regions import Region, REGIONS, START_REGION, INPUT_PORT, STATE_PORT, CONTROL_PORT, EVENT_INPUT_PORT, EVENT_PORT
+from eventChannel import TOPIC_CHAT, TOPIC_SYSTEM, TOPIC_GAME, CHAT_MAX_LEN
+from areaOfInterest import streams_around, stream_topic, topic_stream, tier_topic, TIER_NEAR, TIER_FAR, FAR_EVERY
 
 # Windows fix για να λειτουργεί το asyncio με τον κατάλληλο event loop σε Windows
 if sys.platform.startswith("win"):
@@ -31,8 +47,13 @@ UP    = "up"
 IDLE = "idle"
 WALK = "walk"
 
-# Queue για μεταφορά game state από networking thread προς το main (Arcade) thread
+MOB_COLOR = (255, 120, 120)     # Τα mobs ζωγραφίζονται με το sprite του παίκτη σε κόκκινη απόχρωση
+
+# Queue για μεταφορά game state από networking thread προς το main (Arcade) thread: (ροή, state, χρόνος άφιξης)
 state_queue = Queue()
+event_queue = Queue()   # (topic, γεγονότα) από το κανάλι γεγονότων (chat, system)
+
+CHAT_LINES = 8          # Πόσα μηνύματα chat φαίνονται στην οθόνη
 
 # Global references
 NETWORK_LOOP = None           # asyncio loop στο networking thread
@@ -40,70 +61,344 @@ SERVER_ACCEPTED = None        # True / False αφού απαντήσει ο serv
 CONTROL_ACTIVE = True         # γίνeται False όταν κλείσει το παράθυρο
 DISCONNECT_SENT = False       # γίνεται True όταν σταλεί DISCONNECT στον server
 
+CURRENT_REGION = REGIONS[START_REGION]  # Η περιοχή (server) στην οποία είμαστε συνδεδεμένοι
+PENDING_HANDOFF = None        # Περιοχή στην οποία μας έστειλε ο server, μέχρι να συνδεθούμε εκεί
+LOADED_REGIONS = {}           # Όνομα περιοχής → (GameMap, TileMap), φορτωμένα εκτός του render thread
+QUEUE_POSITION = None         # Θέση στην ουρά εισόδου όσο ο server είναι γεμάτος
+CONTROL_REQ = 0               # Αύξων αριθμός αιτημάτων control
+
+# Πρωτόκολλα που προτείνουμε στον server (GAME_WIRE_JSON=1 για JSON, π.χ. για debugging)
+OFFERED_PROTOCOLS = [PROTOCOL_JSON] if os.environ.get("GAME_WIRE_JSON") else [PROTOCOL_BINARY, PROTOCOL_JSON]
+WIRE_PROTOCOL = PROTOCOL_JSON     # Αυτό που διάλεξε ο server στο connect
+STATE_DECODERS = {}               # Ροή → StateDecoder (net id → id, ξεχωριστά για κάθε ροή)
+
+# Area of interest: ροές (tier, κελί) στις οποίες έχουμε κάνει subscribe
+# (None = όλα τα κελιά σε πλήρη ρυθμό, μέχρι να μάθουμε τη θέση μας)
+SUBSCRIBED_STREAMS = None
+VIEW_SIZE = (1000, 800)     # Μέγεθος της οθόνης για τα πρώτα κελιά, πριν αναλάβει η κάμερα
+
+# Relays της κατάστασης ανά περιοχή (relay.py), π.χ. GAME_RELAYS=firstRegion=tcp://host:5600,secondRegion=tcp://host:5610
+RELAYS = dict(
+    item.split("=", 1) for item in os.environ.get("GAME_RELAYS", "").split(",") if "=" in item
+)
+
+# Η ροή κατάστασης έρχεται από το relay της περιοχής αν υπάρχει, αλλιώς κατευθείαν από τον server
+def state_addr(region):
+    return RELAYS.get(region.name) or region.connect_addr(STATE_PORT)
+
 # ZeroMQ context για τη σύνδεση με τα sockets
 ctx = zmq.asyncio.Context()
 
 # PUSH socket, στέλνει inputs
 push_socket = ctx.socket(zmq.PUSH)
-push_socket.connect("tcp://127.0.0.1:5555")
+push_socket.connect(CURRENT_REGION.connect_addr(INPUT_PORT))
 
 # SUB socket, παίρνει το game state από το server
 sub_socket = ctx.socket(zmq.SUB)
-sub_socket.connect("tcp://127.0.0.1:5556")
-sub_socket.setsockopt_string(zmq.SUBSCRIBE, "")
-
-# CONTROL SOCKET, για σύνδεση/αποσύνδεση
-control_socket = ctx.socket(zmq.REQ)
-control_socket.connect("tcp://127.0.0.1:5557")
+sub_socket.connect(state_addr(CURRENT_REGION))
+sub_socket.setsockopt(zmq.SUBSCRIBE, HANDOFF_TOPIC)    # Τα topics της κατάστασης μπαίνουν μετά το connect
+
+# CONTROL SOCKET (DEALER), για σύνδεση/αποσύνδεση: οι απαντήσεις (π.χ. θέση στην ουρά) έρχονται όποτε τις στείλει ο server
+control_socket = ctx.socket(zmq.DEALER)
+control_socket.connect(CURRENT_REGION.connect_addr(CONTROL_PORT))
+
+# Κανάλι γεγονότων (eventChannel.py): χωριστά sockets, το chat δεν μπαίνει ποτέ μπροστά στην κατάσταση
+event_push = ctx.socket(zmq.PUSH)
+event_push.setsockopt(zmq.SNDHWM, 16)      # Αν το κανάλι δεν απαντάει, τα μηνύματα chat πετιούνται
+event_push.connect(CURRENT_REGION.connect_addr(EVENT_INPUT_PORT))
+event_sub = ctx.socket(zmq.SUB)
+event_sub.connect(CURRENT_REGION.connect_addr(EVENT_PORT))
+for topic in (TOPIC_CHAT, TOPIC_SYSTEM, TOPIC_GAME):
+    event_sub.setsockopt(zmq.SUBSCRIBE, topic.encode())
+
+INPUT_RESEND = 0.25     # Κάθε πόσα δευτερόλεπτα ξαναστέλνουμε την ίδια κατάσταση πλήκτρων
+HEARTBEAT_INTERVAL = 1.0    # Κάθε πόσα δευτερόλεπτα στέλνουμε heartbeat (ο server αποσυνδέει όσους σωπαίνουν)
+CONTROL_POLL_MS = 100       # Πόσο περιμένουμε μήνυμα στο control πριν ξαναδούμε αν κλείνει το παράθυρο
+CONTROL_TIMEOUT = 3.0       # Μέγιστη αναμονή για την απάντηση ενός αιτήματος (π.χ. disconnect)
+
+# Ρολόι του server (clockSync.py): μερικά "time" αμέσως μετά το connect και μετά περιοδικά
+CLOCK = ClockSync()
+CLOCK_SYNC_INTERVAL = 5.0   # Δευτερόλεπτα ανάμεσα στα "time"
+CLOCK_SYNC_BURST = 5        # Πρώτα δείγματα, κάθε CLOCK_BURST_INTERVAL
+CLOCK_BURST_INTERVAL = 0.2
+CLOCK_SYNC_TIMEOUT = 1.0    # Απαντήσεις που αργούν τόσο είναι άχρηστες για την εκτίμηση
+
+# Αντιστοίχιση πλήκτρων arcade σε bits του πρωτοκόλλου input
+KEY_BITS = {
+    arcade.key.UP: KEY_UP,
+    arcade.key.DOWN: KEY_DOWN,
+    arcade.key.LEFT: KEY_LEFT,
+    arcade.key.RIGHT: KEY_RIGHT,
+}
 
 # Ασύγχρονες μέθοδοι για το δίκτυο
 
-# Στέλνει input κίνησης στον server.
-async def send_move(direction: str):
+# Στέλνει στον server την κατάσταση των πατημένων πλήκτρων
+async def send_input(seq: int, keys: int):
+    if WIRE_PROTOCOL == PROTOCOL_BINARY:
+        await push_socket.send(encode_input(CLIENT_PLAYER_ID, seq, keys))
+        return
+    await push_socket.send_json({
+        "id": CLIENT_PLAYER_ID,
+        "seq": seq,
+        "keys": keys
+    })
+
+# Heartbeat στο κανάλι των inputs ώστε ο server να ξέρει ότι ο client είναι ζωντανός
+async def send_heartbeat():
+    if WIRE_PROTOCOL == PROTOCOL_BINARY:
+        await push_socket.send(encode_heartbeat(CLIENT_PLAYER_ID))
+        return
+    await push_socket.send_json({
+        "id": CLIENT_PLAYER_ID,
+        "hb": 1
+    })
+
+# Click-to-move: στέλνει στον server το σημείο του κόσμου που έγινε κλικ
+async def send_goto(seq: int, x: float, y: float):
+    if WIRE_PROTOCOL == PROTOCOL_BINARY:
+        await push_socket.send(encode_input(CLIENT_PLAYER_ID, seq, 0, (x, y)))
+        return
     await push_socket.send_json({
         "id": CLIENT_PLAYER_ID,
-        "move": direction
+        "seq": seq,
+        "keys": 0,
+        "goto": [x, y]
     })
 
+def state_prefix():
+    return STATE_BINARY if WIRE_PROTOCOL == PROTOCOL_BINARY else STATE_JSON
+
+# Αλλάζει τα subscriptions στις ροές που ζητάει το view (None = όλες). Τρέχει στο networking thread
+def subscribe_streams(streams):
+    global SUBSCRIBED_STREAMS
+    prefix = state_prefix()
+    old = SUBSCRIBED_STREAMS
+    if old is None:
+        sub_socket.setsockopt(zmq.UNSUBSCRIBE, tier_topic(prefix, TIER_NEAR))
+        old = set()
+
+    if streams is None:
+        for stream in old:
+            sub_socket.setsockopt(zmq.UNSUBSCRIBE, stream_topic(prefix, stream))
+        sub_socket.setsockopt(zmq.SUBSCRIBE, tier_topic(prefix, TIER_NEAR))
+        STATE_DECODERS.clear()
+    else:
+        for stream in old - streams:
+            sub_socket.setsockopt(zmq.UNSUBSCRIBE, stream_topic(prefix, stream))
+            STATE_DECODERS.pop(stream, None)
+        for stream in streams - old:
+            sub_socket.setsockopt(zmq.SUBSCRIBE, stream_topic(prefix, stream))
+
+    SUBSCRIBED_STREAMS = streams
+
+# Κρατάμε το πρωτόκολλο που διάλεξε ο server και κάνουμε subscribe στα κελιά γύρω από τη θέση μας
+def use_protocol(reply):
+    global WIRE_PROTOCOL
+    subscribe_streams(set())    # Τα topics της προηγούμενης μορφής/περιοχής
+    STATE_DECODERS.clear()
+
+    # Παλιός server χωρίς negotiation: JSON
+    WIRE_PROTOCOL = reply.get("protocol", PROTOCOL_JSON)
+
+    # Χωρίς θέση στην απάντηση δεν ξέρουμε πού είμαστε: όλα τα κελιά μέχρι να μας δει το view
+    if "x" in reply:
+        subscribe_streams(streams_around(reply["x"], reply["y"], *VIEW_SIZE))
+    else:
+        subscribe_streams(None)
+
 # Λαμβάνει συνεχώς game state από τον server και το βάζει στην thread-safe queue
 async def receive_state():
+    global PENDING_HANDOFF
     while True:
-        state = await sub_socket.recv_json()
-        state_queue.put(state)
+        topic, payload = await sub_socket.recv_multipart()
+
+        # Ο server μάς μεταφέρει σε άλλη περιοχή (τα handoffs άλλων παικτών αγνοούνται)
+        if topic == HANDOFF_TOPIC:
+            handoff = json.loads(payload)["handoff"]
+            if handoff["id"] == CLIENT_PLAYER_ID:
+                PENDING_HANDOFF = handoff["region"]
+            continue
+
+        # Μηνύματα από ροές που μόλις αφήσαμε
+        stream = topic_stream(topic)
+        if stream is None or (SUBSCRIBED_STREAMS is not None and stream not in SUBSCRIBED_STREAMS):
+            continue
+
+        if topic[:1] == STATE_BINARY:
+            decoder = STATE_DECODERS.get(stream)
+            if decoder is None:
+                decoder = STATE_DECODERS[stream] = StateDecoder()
+            state = decoder.decode(payload)
+        else:
+            state = json.loads(payload)
+
+        if state is not None:
+            state_queue.put((stream, state, time.monotonic()))     # Ο χρόνος άφιξης μετράει το jitter
+
+# Γεγονότα (ένα frame ανά topic με όσα μαζεύτηκαν σε ένα tick) → event_queue
+async def receive_events():
+    while True:
+        topic, payload = await event_sub.recv_multipart()
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            continue
+        event_queue.put((topic.decode(), events))
+
+# Μήνυμα chat (ο server το στέλνει σε όλους όσους έχουν κάνει subscribe στο topic)
+async def send_chat(text, topic=TOPIC_CHAT):
+    try:
+        await event_push.send_json({"id": CLIENT_PLAYER_ID, "topic": topic, "text": text[:CHAT_MAX_LEN]}, flags=zmq.NOBLOCK)
+    except zmq.Again:
+        pass
+
+# Αίτημα στο control (DEALER): κάθε αίτημα έχει δικό του req ώστε να ξεχωρίζουμε την απάντησή του
+async def send_control(msg):
+    global CONTROL_REQ
+    CONTROL_REQ += 1
+    msg["req"] = CONTROL_REQ
+    await control_socket.send_multipart([b"", json.dumps(msg).encode()])   # Κενό frame όπως στο envelope του REQ
+    return CONTROL_REQ
+
+# Επόμενο μήνυμα του control, None αν δεν ήρθε τίποτα μέσα στο timeout (ms)
+async def recv_control(timeout=None):
+    if timeout is not None and not await control_socket.poll(timeout):
+        return None
+    frames = await control_socket.recv_multipart()
+    return json.loads(frames[-1])
+
+# Connect στον server. Αν είναι γεμάτος περιμένουμε στην ουρά (ο server στέλνει τη θέση μας) μέχρι να μπούμε,
+# να κλείσει το παράθυρο ή να απαντήσει ότι δεν χωράμε ούτε στην ουρά. Επιστρέφει την τελική απάντηση
+async def connect_server():
+    global QUEUE_POSITION
+    req = await send_control({
+        "type": "connect",
+        "id": CLIENT_PLAYER_ID,
+        "protocols": OFFERED_PROTOCOLS
+    })
+
+    while CONTROL_ACTIVE:
+        reply = await recv_control(CONTROL_POLL_MS)
+        if reply is None or reply.get("req") != req:
+            continue
+        if reply.get("status") != "queued":
+            QUEUE_POSITION = None
+            return reply
+        if reply["position"] != QUEUE_POSITION:
+            QUEUE_POSITION = reply["position"]
+            print(f"[Control] server full, position in queue: {QUEUE_POSITION}")
+
+    return None
+
+# Στέλνει ένα αίτημα και περιμένει την απάντησή του (αγνοώντας ό,τι άλλο έρθει στο μεταξύ)
+async def control_request(msg, timeout=CONTROL_TIMEOUT):
+    req = await send_control(msg)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reply = await recv_control(CONTROL_POLL_MS)
+        if reply is not None and reply.get("req") == req:
+            return reply
+    return None
+
+# Ένα δείγμα για το ρολόι του server: t0/t3 στο τοπικό ρολόι γύρω από το "time"
+async def sync_clock():
+    t0 = time.monotonic()
+    reply = await control_request({"type": "time", "id": CLIENT_PLAYER_ID}, CLOCK_SYNC_TIMEOUT)
+    t3 = time.monotonic()
+    if reply is not None and "server_time" in reply:
+        CLOCK.on_sample(t0, t3, reply["server_time"])
+
+# Χάρτης (ίσως με compile σε subprocess) και tilemap μιας περιοχής. Τα SpriteLists είναι lazy: τα
+# δεδομένα του GL φτιάχνονται στο πρώτο draw, οπότε η φόρτωση μπορεί να γίνει σε άλλο thread
+def read_region(region):
+    game_map = load_map(region.map_path)
+    tile_map = arcade.load_tilemap(region.map_path, scaling=1.0, use_spatial_hash=True, lazy=True)
+    return game_map, tile_map
+
+# Φόρτωση περιοχής σε thread του executor, ώστε το load_region να μην κολλάει κανένα frame
+async def preload_region(region):
+    if region.name in LOADED_REGIONS:
+        return
+    try:
+        LOADED_REGIONS[region.name] = await asyncio.get_running_loop().run_in_executor(None, read_region, region)
+    except Exception as e:
+        print(f"Preloading {region.name} failed:", e)     # Το load_region θα τη φορτώσει μόνο του
+
+# Σύνδεση των sockets στη νέα περιοχή και connect εκεί (ο server της μας περιμένει ήδη)
+async def switch_region(info):
+    global CURRENT_REGION
+    old = CURRENT_REGION
+    new = Region(info["name"], info["map"], info["base_port"], info["host"])
+    preload = asyncio.create_task(preload_region(new))     # Παράλληλα με το connect στον νέο server
+
+    for sock, port in (
+        (push_socket, INPUT_PORT), (control_socket, CONTROL_PORT), (event_push, EVENT_INPUT_PORT), (event_sub, EVENT_PORT)
+    ):
+        sock.disconnect(old.connect_addr(port))
+        sock.connect(new.connect_addr(port))
+    sub_socket.disconnect(state_addr(old))
+    sub_socket.connect(state_addr(new))
+
+    CLOCK.reset()       # Κάθε περιοχή έχει τη δική της χρονογραμμή ticks
+    reply = await connect_server()
+    if reply is not None:
+        use_protocol(reply)
+
+    # Το view αλλάζει χάρτη μόλις αλλάξει το CURRENT_REGION, οπότε αυτό γίνεται αφού φορτωθεί η περιοχή
+    await preload
+    CURRENT_REGION = new
+    print(f"[Handoff] {old.name} → {new.name}:", reply)
 
 # Χειρίζεται CONNECT / DISCONNECT
 async def control_loop():
-    global SERVER_ACCEPTED, CONTROL_ACTIVE, DISCONNECT_SENT
+    global SERVER_ACCEPTED, CONTROL_ACTIVE, DISCONNECT_SENT, PENDING_HANDOFF
 
-    # Σύνδεση
-    await control_socket.send_json({
-        "type": "connect",
-        "id": CLIENT_PLAYER_ID
-    })
-    reply = await control_socket.recv_json()
+    # Σύνδεση (ίσως μετά από αναμονή στην ουρά)
+    reply = await connect_server()
     print("[Control reply]:", reply)
 
-    # # Server full? Δεν έχουμε Player cap οποτε δεν χρησιμοποιείται για τώρα
-    # if reply.get("status") == "full":
-    #     SERVER_ACCEPTED = False
-    #     CONTROL_ACTIVE = False
-    #     DISCONNECT_SENT = True   # δεν θα γίνει DISCONNECT, είμαστε ήδη εκτός
-    #     return
+    # Server full (ούτε θέση στην ουρά) ή άλλο σφάλμα
+    if reply is None or reply.get("status") != "ok":
+        SERVER_ACCEPTED = False
+        CONTROL_ACTIVE = False
+
+        # Αν φύγαμε από την ουρά ενημερώνουμε τον server, αλλιώς είμαστε ήδη εκτός
+        if reply is None:
+            await control_request({"type": "disconnect", "id": CLIENT_PLAYER_ID})
+        DISCONNECT_SENT = True
+        return
+
+    use_protocol(reply)
 
-    # Επιτυχής σύνδεση (πάντα)
+    # Επιτυχής σύνδεση
     SERVER_ACCEPTED = True
 
-    # Μένουμε ζωντανοί μέχρι να κλείσει το παράθυρο
+    # Μένουμε ζωντανοί μέχρι να κλείσει το παράθυρο, στέλνοντας heartbeats (και "time" για το ρολόι)
+    next_heartbeat = 0.0
+    next_sync = 0.0
+    syncs = 0
     while CONTROL_ACTIVE:
+        if PENDING_HANDOFF is not None:
+            info, PENDING_HANDOFF = PENDING_HANDOFF, None
+            await switch_region(info)
+            next_sync = 0.0
+            syncs = 0
+
+        now = time.monotonic()
+        if now >= next_heartbeat:
+            next_heartbeat = now + HEARTBEAT_INTERVAL
+            await send_heartbeat()
+        if now >= next_sync:
+            await sync_clock()
+            syncs += 1
+            next_sync = now + (CLOCK_BURST_INTERVAL if syncs < CLOCK_SYNC_BURST else CLOCK_SYNC_INTERVAL)
         await asyncio.sleep(0.1)
 
     # Αποσύνδεση
     try:
-        await control_socket.send_json({
-            "type": "disconnect",
-            "id": CLIENT_PLAYER_ID
-        })
-        await control_socket.recv_json()
+        if await control_request({"type": "disconnect", "id": CLIENT_PLAYER_ID}) is None:
+            print("DISCONNECT got no reply")
     except Exception as e:
         print("Error sending DISCONNECT:", e)
 
@@ -112,7 +407,9 @@ async def control_loop():
 
 # Κεντρικό async entry point του networking thread
 async def io_main():
+    asyncio.create_task(preload_region(CURRENT_REGION))    # Όσο περιμένουμε την απάντηση του connect
     asyncio.create_task(receive_state())
+    asyncio.create_task(receive_events())
     asyncio.create_task(control_loop())
 
     # Περιμένουμε να μάθουμε αν ο server μας δέχτηκε ή όχι
@@ -243,6 +540,10 @@ class ConnectingView(arcade.View):
     def on_update(self, delta_time: float):
         global SERVER_ACCEPTED      # Χρησιμοποιούμε global μεταβλητή που ενημερώνεται από το networking thread (control_loop)
 
+        # Ο server είναι γεμάτος: δείχνουμε τη θέση μας στην ουρά
+        if QUEUE_POSITION is not None:
+            self.msg.text = f"Server full - position in queue: {QUEUE_POSITION}"
+
         # Αν ο server απάντησε θετικά
         if SERVER_ACCEPTED is True:
             game_view = MyGame()                # Δημιουργούμε το βασικό Game View
@@ -260,6 +561,11 @@ class MyGame(arcade.View):
 
         self.held_keys = set()    # Set που κρατάει ποια πλήκτρα είναι πατημένα (για hold keys)
 
+        # Κατάσταση input που στάλθηκε στον server
+        self.input_seq = 0          # Αύξων αριθμός, αυξάνεται σε κάθε αλλαγή πλήκτρων
+        self.sent_keys = 0          # Bitmask που στάλθηκε τελευταίο
+        self.last_input_send = 0.0  # Πότε στάλθηκε τελευταία φορά
+
         self.actor_list = arcade.SpriteList()   # Λίστα με τα sprites που σχεδιάζονται
         
         # Tilemap layers
@@ -268,18 +574,33 @@ class MyGame(arcade.View):
         self.wall_list = None
 
         self.world_camera = arcade.Camera2D()   # Κάμερα για τον κόσμο
+        self.region_name = None                 # Περιοχή του χάρτη που έχει φορτωθεί
+        self.streams = {}                       # Ροή (tier, κελί) → DeltaDecoder: η κατάστασή της από keyframes + deltas
+        self.interest = None                    # Ροές που ζητήσαμε (None = ό,τι μας στείλει ο server)
+        self.player_seen = False                # Ο server μάς έχει δείξει τη θέση μας σε αυτή την περιοχή
 
         self.elapsed_time = 0.0     # Χρόνος που έχει περάσει στο match (από server)
+        self.tick_dt = 0.02         # Διάρκεια ενός tick του server (ενημερώνεται από το state)
+
+        # Prediction του τοπικού παίκτη με τους κανόνες κίνησης του server, διορθώνεται από τα acks
+        self.prediction = None
+        self.following_path = False     # Click-to-move: τη διαδρομή τη βρίσκει ο server, δεν την προβλέπουμε
 
         self.player_animations = None   # Animations του local player
         self.player_sprite = None       # Sprite του τοπικού παίκτη
 
         self.other_sprites = {}         # Άλλοι παίκτες
-        
-        # Μεταβλητές για smoothing στην κίνηση
-        self.position_buffers = {}      # Λεξικό που κρατά για κάθε παίκτη τις δύο πιο πρόσφατες θέσεις του με server tick για εξομάλυνση κίνησης
-        self.snapshots = {}             # Θέση sprite τη στιγμή που ήρθε το τελευταίο update
-        self.interp_t = {}              # Xρόνος που πέρασε από το τελευταίο server update
+        self.mob_sprites = {}           # Mobs του server: mob id → sprite
+
+        # Θέσεις των άλλων παικτών και των mobs με τον χρόνο του server, ζωγραφίζονται με καθυστέρηση (jitter buffer)
+        self.jitter = self.make_jitter_buffer()
+        self.clock_synced = False
+
+        # Chat: τα τελευταία μηνύματα πάνω αριστερά, και η γραμμή που γράφουμε (None = κλειστή, Enter για άνοιγμα)
+        self.chat_lines = deque(maxlen=CHAT_LINES)
+        self.chat_texts = []
+        self.chat_input = None
+        self.chat_prompt = arcade.Text("", 10, 40, arcade.color.YELLOW, font_size=12)
 
         # text για τον χρόνο παιχνιδιού (timer)
         self.timer_text = arcade.Text(
@@ -352,6 +673,42 @@ class MyGame(arcade.View):
             cam_y + (target_y - cam_y) * lerp
         )
 
+    # Area of interest: ζητάμε από τον server μόνο τα κελιά που φαίνονται στην οθόνη (και λίγο γύρω),
+    # σε πλήρη ρυθμό μόνο όσα είναι δίπλα στον παίκτη
+    def update_interest(self):
+        # Μέχρι να μας δει ο server η κάμερα δεν είναι ακόμα πάνω μας: κρατάμε τα κελιά του connect
+        if NETWORK_LOOP is None or not self.player_seen:
+            return
+
+        # Κέντρο ο παίκτης και όχι η κάμερα: η κάμερα τον ακολουθεί με καθυστέρηση (π.χ. μόλις μπούμε στον
+        # χάρτη ξεκινάει από το 0,0) και δεν απέχει ποτέ περισσότερο από τη νεκρή ζώνη, που χωράει στο AOI_MARGIN
+        streams = streams_around(
+            self.player_sprite.center_x, self.player_sprite.center_y,
+            self.world_camera.viewport_width, self.world_camera.viewport_height,
+            self.interest or ()
+        )
+
+        # Κελί που αλλάζει tier: κρατάμε και την παλιά ροή μέχρι η νέα να πάρει keyframe, αλλιώς το κελί θα άδειαζε
+        tiers = {cell: tier for tier, cell in streams}
+        for stream, baseline in self.streams.items():
+            tier, cell = stream
+            if stream in streams or cell not in tiers or baseline.tick is None:
+                continue
+            new = self.streams.get((tiers[cell], cell))
+            if new is None or new.tick is None:
+                streams.add(stream)
+
+        if streams == self.interest:
+            return
+
+        # Οι ροές που αφήσαμε φεύγουν μαζί με τις οντότητές τους
+        for stream in list(self.streams):
+            if stream not in streams:
+                del self.streams[stream]
+
+        self.interest = streams
+        NETWORK_LOOP.call_soon_threadsafe(subscribe_streams, streams)
+
     # Μέθοδος για την αρχικοποίηση του View όταν γίνεται ενεργό
     def on_show_view(self):
         # Reset κάμερας
@@ -360,13 +717,38 @@ class MyGame(arcade.View):
 
         arcade.set_background_color(arcade.color.BLACK)
 
-        # Φόρτωση tilemap για την πρώτη περιοχή
-        self.tile_map = arcade.load_tilemap(
-            "assets/maps/firstRegion.tmx",
-            scaling=1.0,
-            use_spatial_hash=True
-        )
-        
+        self.load_region()
+
+        # Τοποθέτηση timer στο UI
+        self.timer_text.x = 10
+        self.timer_text.y = self.window.height - 30
+
+        self.held_keys.clear()  # Καθαρισμός input
+
+    # Φόρτωση του χάρτη της περιοχής στην οποία είμαστε συνδεδεμένοι (και μετά από κάθε handoff)
+    def load_region(self):
+        region = CURRENT_REGION     # Το networking thread μπορεί να το αλλάξει στο μεταξύ
+        self.region_name = region.name
+
+        # Οι παίκτες και τα mobs της προηγούμενης περιοχής δεν υπάρχουν εδώ
+        self.streams = {}
+        self.interest = None
+        self.player_seen = False
+        self.other_sprites.clear()
+        self.mob_sprites.clear()
+        self.jitter = self.make_jitter_buffer()
+        self.clock_synced = False
+
+        # Χάρτης και tilemap από το networking thread (preload_region). Αν δεν πρόλαβαν, φόρτωση εδώ
+        loaded = LOADED_REGIONS.pop(region.name, None)
+        if loaded is None:
+            loaded = read_region(region)
+        game_map, self.tile_map = loaded
+
+        # Ίδιο πλέγμα collision με τον server της περιοχής (από τον compiled χάρτη)
+        self.prediction = PlayerPrediction(game_map.collision_grid, game_map.width, game_map.height, self.tick_dt)
+        self.following_path = False
+
         # Ανάθεση layers
         self.terrain_list = self.tile_map.sprite_lists["Terrain"]
         self.decor_list = self.tile_map.sprite_lists["Decor"]
@@ -398,12 +780,6 @@ class MyGame(arcade.View):
         # Προσθήκη player
         self.actor_list.append(self.player_sprite)
 
-        # Τοποθέτηση timer στο UI
-        self.timer_text.x = 10
-        self.timer_text.y = self.window.height - 30
-
-        self.held_keys.clear()  # Καθαρισμός input
-
     # Καθαρίζουμε τα πατημένα πλήκτρα όταν φεύγουμε από το view
     def on_hide_view(self):
         self.held_keys.clear()
@@ -422,35 +798,92 @@ class MyGame(arcade.View):
 
         self.timer_text.draw()      # Ζωγραφίζουμε το timer
 
-    # Μέθοδος που διαβάζει το πιο πρόσφατο state που έστειλε ο server και ενημερώνει τις τοπικές δομές (buffers, snapshots, sprites)
+        for text in self.chat_texts:
+            text.draw()
+        if self.chat_input is not None:
+            self.chat_prompt.draw()
+
+    # Νέα γεγονότα από το κανάλι: μόνο όταν αλλάζουν ξαναφτιάχνουμε τα Text
+    def process_events(self):
+        if event_queue.empty():
+            return
+        while not event_queue.empty():
+            topic, events = event_queue.get()
+            for event in events:
+                sender = event.get("from")
+                if topic == TOPIC_CHAT or topic.startswith(TOPIC_CHAT + "."):
+                    self.chat_lines.append((arcade.color.WHITE, f"{sender}: {event.get('text', '')}"))
+                else:
+                    self.chat_lines.append((arcade.color.LIGHT_GRAY, f"* {event.get('text', '')}"))
+
+        top = self.window.height - 20
+        self.chat_texts = [
+            arcade.Text(line, 10, top - i * 18, color, font_size=12)
+            for i, (color, line) in enumerate(self.chat_lines)
+        ]
+
+    def update_chat_prompt(self):
+        self.chat_prompt.text = f"> {self.chat_input}_"
+
+    # Μέθοδος που διαβάζει το πιο πρόσφατο state που έστειλε ο server και ενημερώνει τις τοπικές δομές (jitter buffer, sprites)
     def process_server_state(self):
         # Αν δεν υπάρχει κανένα state στην ουρά, δεν κάνουμε τίποτα
         if state_queue.empty():
             return None
 
-        # Παίρνουμε το πιο πρόσφατο state και αδειάζουμε την ουρά
+        # Τα μηνύματα είναι deltas: τα εφαρμόζουμε όλα με τη σειρά πάνω στη βάση της ροής τους, όχι μόνο το πιο πρόσφατο
         latest_state = None
         while not state_queue.empty():
-            latest_state = state_queue.get()
+            stream, state, arrival = state_queue.get()
+
+            # State από την περιοχή που μόλις αφήσαμε ή από ροή που δεν μας ενδιαφέρει πια
+            if state.get("region", self.region_name) != self.region_name:
+                continue
+            if self.interest is not None and stream not in self.interest:
+                continue
 
-        # Αν για κάποιο λόγο δεν πήραμε state, σταματάμε
+            baseline = self.streams.get(stream)
+            if baseline is None:
+                baseline = self.streams[stream] = DeltaDecoder()
+            if baseline.apply(state):
+                latest_state = state
+                self.buffer_positions(stream[0], state, arrival)
+
+                # Ack των inputs μας μαζί με τη θέση μας στο ίδιο tick: reconciliation της πρόβλεψης. Αν η θέση
+                # δεν άλλαξε, δεν είναι στο μήνυμα αλλά στη βάση της ροής
+                ack = state.get("acks", {}).get(CLIENT_PLAYER_ID)
+                pos = baseline.sections["players"].get(CLIENT_PLAYER_ID)
+                if ack is not None and pos is not None:
+                    self.prediction.reconcile(state["tick"], ack[0], ack[1], pos["x"], pos["y"])
+
+        # Δεν έχουμε ακόμα έγκυρη βάση (περιμένουμε keyframe)
         if latest_state is None:
             return None
-        
+
         # Παίρνουμε το tick του server (αύξων μετρητής)
-        tick = latest_state.get("tick")
-        if tick is None:
-            return None
+        tick = latest_state["tick"]
         
         # Διάρκεια ενός tick στον server
         tick_dt = latest_state.get("tick_dt", 0.02)
         self.tick_dt = tick_dt
+        self.prediction.tick_dt = tick_dt
 
         # Χρόνος αγώνα (elapsed time) από τον server
         self.elapsed_time = latest_state.get("elapsed_time", self.elapsed_time)
 
-        # Κατάσταση όλων των παικτών από τον server
-        players_state = latest_state.get("players", {})
+        # Κατάσταση όλων των παικτών στις ροές που βλέπουμε. Μια οντότητα που μόλις άλλαξε κελί (ή ένα κελί
+        # που αλλάζει tier) μπορεί να είναι για λίγο σε δύο ροές: κρατάμε τη θέση από την πιο πρόσφατη
+        players_state = {}
+        mobs_state = {}
+        for baseline in sorted(self.streams.values(), key=lambda b: -1 if b.tick is None else b.tick):
+            players_state.update(baseline.sections["players"])
+            mobs_state.update(baseline.sections["mobs"])
+
+        own = players_state.get(CLIENT_PLAYER_ID)
+        if own is not None:
+            self.player_seen = True
+            if not self.prediction.ready:
+                self.prediction.reset(own["x"], own["y"])     # Πρώτη θέση μας σε αυτή την περιοχή
 
         # Ενημέρωση του timer σε μορφή mm:ss
         minutes = int(self.elapsed_time) // 60
@@ -462,28 +895,20 @@ class MyGame(arcade.View):
             x = pos["x"]
             y = pos["y"]
 
-            # Αν είναι ο τοπικός παίκτης, χρησιμοποιούμε το main sprite
+            # Τον τοπικό παίκτη τον κινεί το prediction (update_prediction)
             if pid == CLIENT_PLAYER_ID:
-                sprite = self.player_sprite
-            else:
-                # Αν είναι άλλος παίκτης και δεν έχουμε sprite, το δημιουργούμε
-                if pid not in self.other_sprites:
-                    spr = PlayerSprite(self.player_animations)
-                    self.other_sprites[pid] = spr
-                    self.actor_list.append(spr)
-                sprite = self.other_sprites[pid]
-
-            # Buffer θέσεων: κρατάμε τις 2 πιο πρόσφατες θέσεις από τον server
-            buf = self.position_buffers.setdefault(pid, [])
-            buf.append((x, y, tick))
-            if len(buf) > 2:
-                buf.pop(0)
-
-            # Snapshot: αποθηκεύουμε τη θέση του sprite όταν ήρθε το update ώστε να κάνουμε interpolation από εκεί
-            self.snapshots[pid] = (sprite.center_x, sprite.center_y)
-            
-            # Reset του τοπικού χρονικού παραμέτρου interpolation
-            self.interp_t[pid] = 0.0
+                continue
+
+            # Αν είναι άλλος παίκτης και δεν έχουμε sprite, το δημιουργούμε (τη θέση του τη δίνει το jitter buffer)
+            if pid not in self.other_sprites:
+                spr = PlayerSprite(self.player_animations)
+                spr.center_x = x
+                spr.center_y = y
+                self.other_sprites[pid] = spr
+                self.actor_list.append(spr)
+
+        # Ενημέρωση των mobs
+        self.process_mobs(mobs_state)
 
         # Καθαρισμός παικτών που δεν υπάρχουν πια στο server state
         existing_pids = set(players_state.keys())
@@ -493,123 +918,200 @@ class MyGame(arcade.View):
                 spr = self.other_sprites[pid]
                 self.actor_list.remove(spr)
                 del self.other_sprites[pid]
-                self.position_buffers.pop(pid, None)
-                self.snapshots.pop(pid, None)
-                self.interp_t.pop(pid, None)
-
-    # Μέθοδος που κάνει interpolation και extrapolation ώστε η κίνηση των παικτών να φαίνεται ομαλή
-    def apply_smoothing(self, delta_time):
-        # Αν δεν υπάρχει player ή client id, δεν κάνουμε τίποτα
-        if CLIENT_PLAYER_ID is None or self.player_sprite is None:
+                self.jitter.remove(pid)
+
+    def make_jitter_buffer(self):
+        return JitterBuffer({TIER_NEAR: self.tick_dt, TIER_FAR: FAR_EVERY * self.tick_dt})
+
+    # Οι θέσεις που άλλαξαν σε ένα μήνυμα μπαίνουν στο jitter buffer με τον χρόνο του server
+    def buffer_positions(self, tier, state, arrival):
+        tick_dt = state.get("tick_dt", self.tick_dt)
+        snapshot_time = state["tick"] * tick_dt
+        CLOCK.seed(snapshot_time, arrival)      # Μέχρι να απαντήσει το πρώτο "time"
+        if CLOCK.synced != self.clock_synced:
+            self.clock_synced = CLOCK.synced
+            self.jitter.reset_transit()         # Το offset άλλαξε απότομα: οι παλιές διαδρομές δεν συγκρίνονται
+        self.jitter.on_arrival(tier, snapshot_time, CLOCK.to_server(arrival))
+
+        base = state.get("base")
+        base_time = None if base is None else base * tick_dt
+        for name in ("players", "mobs"):
+            changed = state.get(name)
+            if changed:
+                self.jitter.push(tier, snapshot_time, base_time, changed)
+
+    # Δημιουργεί/αφαιρεί τα sprites των mobs
+    def process_mobs(self, mobs_state):
+        for mid, pos in mobs_state.items():
+            if mid not in self.mob_sprites:
+                spr = PlayerSprite(self.player_animations)
+                spr.color = MOB_COLOR
+                spr.center_x = pos["x"]
+                spr.center_y = pos["y"]
+                self.mob_sprites[mid] = spr
+                self.actor_list.append(spr)
+
+        for mid in list(self.mob_sprites.keys()):
+            if mid not in mobs_state:
+                self.actor_list.remove(self.mob_sprites.pop(mid))
+                self.jitter.remove(mid)
+
+    # Άλλοι παίκτες και mobs: θέση από το jitter buffer στον χρόνο render (λίγο πίσω από τον server)
+    def update_remote(self, delta_time):
+        now = CLOCK.server_now()
+        if now is None:
             return
-
-        # Δημιουργούμε ενιαίο dict με όλα τα sprites
-        all_sprites = {CLIENT_PLAYER_ID: self.player_sprite}
-        all_sprites.update(self.other_sprites)
-
-        for pid, sprite in all_sprites.items():
-            buf = self.position_buffers.get(pid)
-            if not buf:
-                continue
-
-            # Αν έχουμε μόνο μία θέση, πάμε κατευθείαν εκεί
-            if len(buf) == 1:
-                x, y, _ = buf[0]
-                sprite.center_x = x
-                sprite.center_y = y
-                continue
-
-            # Παίρνουμε τις δύο πιο πρόσφατες θέσεις από τον server
-            (x0, y0, tick0), (x1, y1, tick1) = buf[0], buf[1]
-            dt_ticks = tick1 - tick0
-            dt_server = dt_ticks * getattr(self, "tick_dt", 0.02)
-
-            # Αν κάτι πάει στραβά με τα ticks
-            if dt_ticks <= 0 or dt_server <= 0:
-                # Πάμε απευθείας στην τελευταία θέση
-                target_x, target_y = x1, y1
-            else:
-                # Υπολογισμός ταχύτητας
-                vx = (x1 - x0) / dt_server
-                vy = (y1 - y0) / dt_server
-
-                # Extrapolation: πρόβλεψη θέσης λίγο μπροστά
-                prediction_dt = getattr(self, "tick_dt", 0.02)
-                target_x = x1 + vx * prediction_dt
-                target_y = y1 + vy * prediction_dt
-
-            # Τοπικός χρόνος interpolation
-            t_local = self.interp_t.get(pid, 0.0) + delta_time
-            self.interp_t[pid] = t_local
-
-            # Παράμετρος interpolation 0 ή 1
-            if dt_server > 0:
-                x_param = t_local / dt_server
-            else:
-                x_param = 1.0
-
-            if x_param > 1.0:
-                x_param = 1.0
-            elif x_param < 0.0:
-                x_param = 0.0
-
-            # Θέση snapshot (αφετηρία interpolation)
-            snap_x, snap_y = self.snapshots.get(pid, (sprite.center_x, sprite.center_y))
-
-            # Linear interpolation (LERP)
-            sprite.center_x = snap_x + (target_x - snap_x) * x_param
-            sprite.center_y = snap_y + (target_y - snap_y) * x_param
-
-            # Έλεγχος αν ο παίκτης κινείται
-            move_dx = x1 - x0
-            move_dy = y1 - y0
-            moving = abs(move_dx) > 0.01 or abs(move_dy) > 0.01
-
-            # Ορισμός animation και κατεύθυνσης
-            if moving:
-                if abs(move_dx) > abs(move_dy):
-                    direction = RIGHT if move_dx > 0 else LEFT
+        for sprites in (self.other_sprites, self.mob_sprites):
+            for eid, spr in sprites.items():
+                pos = self.jitter.sample(eid, now)
+                if pos is None:
+                    continue
+                move_dx = pos[0] - spr.center_x
+                move_dy = pos[1] - spr.center_y
+                spr.center_x, spr.center_y = pos
+
+                # Animation από την κίνηση στην οθόνη
+                if abs(move_dx) > 0.01 or abs(move_dy) > 0.01:
+                    if abs(move_dx) > abs(move_dy):
+                        direction = RIGHT if move_dx > 0 else LEFT
+                    else:
+                        direction = UP if move_dy > 0 else DOWN
+                    spr.last_direction = direction
+                    spr.set_state(WALK, direction)
                 else:
-                    direction = UP if move_dy > 0 else DOWN
+                    spr.set_state(IDLE, spr.last_direction)
+
+    # Ο τοπικός παίκτης κινείται αμέσως με τα πλήκτρα μας (prediction), χωρίς να περιμένει τον server
+    def update_prediction(self, delta_time):
+        prediction = self.prediction
+        sprite = self.player_sprite
+        if prediction is None or sprite is None or not prediction.ready:
+            return
 
-                sprite.last_direction = direction
-                sprite.set_state(WALK, direction)
+        keys = None if self.following_path else self.held_mask()
+        prediction.advance(delta_time, self.input_seq, keys)
+        x, y = prediction.render_position()
+        move_dx = x - sprite.center_x
+        move_dy = y - sprite.center_y
+        sprite.center_x = x
+        sprite.center_y = y
+
+        # Animation από την κίνηση στην οθόνη (ίδιος κανόνας με τους άλλους παίκτες)
+        if abs(move_dx) > 0.01 or abs(move_dy) > 0.01:
+            if abs(move_dx) > abs(move_dy):
+                direction = RIGHT if move_dx > 0 else LEFT
             else:
-                sprite.set_state(IDLE, sprite.last_direction)
+                direction = UP if move_dy > 0 else DOWN
+            sprite.last_direction = direction
+            sprite.set_state(WALK, direction)
+        else:
+            sprite.set_state(IDLE, sprite.last_direction)
 
     # Μέθοδος που καλείται κάθε frame συντονίζει networking, κίνηση, animation και κάμερα
     def on_update(self, delta_time):
+        # Handoff σε άλλη περιοχή: νέος χάρτης
+        if CURRENT_REGION.name != self.region_name:
+            self.load_region()
+
         # Ενημέρωση κατάστασης από τον server
         self.process_server_state()
+        self.process_events()
 
-        # Εφαρμογή smoothing στην κίνηση
-        self.apply_smoothing(delta_time)
+        # Άλλοι παίκτες και mobs από το jitter buffer
+        self.update_remote(delta_time)
 
-        # Αποστολή input στον server
-        if NETWORK_LOOP is not None:
-            if arcade.key.UP in self.held_keys:
-                asyncio.run_coroutine_threadsafe(send_move("UP"), NETWORK_LOOP)
-            if arcade.key.DOWN in self.held_keys:
-                asyncio.run_coroutine_threadsafe(send_move("DOWN"), NETWORK_LOOP)
-            if arcade.key.LEFT in self.held_keys:
-                asyncio.run_coroutine_threadsafe(send_move("LEFT"), NETWORK_LOOP)
-            if arcade.key.RIGHT in self.held_keys:
-                asyncio.run_coroutine_threadsafe(send_move("RIGHT"), NETWORK_LOOP)
+        # Αποστολή input στον server και πρόβλεψη της κίνησής μας με το ίδιο seq
+        self.send_input_state()
+        self.update_prediction(delta_time)
 
         # Ενημέρωση animation τοπικού παίκτη
         if self.player_sprite:
             self.player_sprite.update_animation(delta_time)
 
-        # Ενημέρωση animation άλλων παικτών
+        # Ενημέρωση animation άλλων παικτών και mobs
         for spr in self.other_sprites.values():
             spr.update_animation(delta_time)
+        for spr in self.mob_sprites.values():
+            spr.update_animation(delta_time)
             
         # Ενημέρωση κάμερας
         self.update_camera()
 
+        # Subscriptions στα κελιά γύρω από την κάμερα
+        self.update_interest()
+
+    # Στέλνει την κατάσταση πλήκτρων μόνο όταν αλλάζει (ή περιοδικά για ασφάλεια), όχι σε κάθε frame
+    def send_input_state(self):
+        if NETWORK_LOOP is None:
+            return
+
+        keys = self.held_mask()
+
+        now = time.monotonic()
+        if keys != self.sent_keys:
+            self.input_seq += 1     # Νέα κατάσταση → νέο seq
+            self.following_path = False
+        elif now - self.last_input_send < INPUT_RESEND:
+            return
+
+        self.sent_keys = keys
+        self.last_input_send = now
+        asyncio.run_coroutine_threadsafe(send_input(self.input_seq, keys), NETWORK_LOOP)
+
+    # Bitmask των πλήκτρων κίνησης που κρατάμε πατημένα
+    def held_mask(self):
+        keys = 0
+        for key in self.held_keys:
+            keys |= KEY_BITS.get(key, 0)
+        return keys
+
+    # Click-to-move: ο server βρίσκει μονοπάτι μέχρι το σημείο του κλικ
+    def on_mouse_press(self, x, y, button, modifiers):
+        if button != arcade.MOUSE_BUTTON_LEFT or NETWORK_LOOP is None:
+            return
+
+        # Μετατροπή από συντεταγμένες οθόνης σε συντεταγμένες κόσμου
+        world_pos = self.world_camera.unproject((x, y))
+
+        self.input_seq += 1
+        self.sent_keys = 0
+        self.following_path = True
+        self.last_input_send = time.monotonic()
+        asyncio.run_coroutine_threadsafe(
+            send_goto(self.input_seq, world_pos[0], world_pos[1]),
+            NETWORK_LOOP
+        )
+
     def on_key_press(self, key, modifiers):
+        # Όσο γράφουμε στο chat τα πλήκτρα δεν κινούν τον παίκτη
+        if self.chat_input is not None:
+            if key in (arcade.key.ENTER, arcade.key.RETURN):
+                if self.chat_input.strip() and NETWORK_LOOP is not None:
+                    asyncio.run_coroutine_threadsafe(send_chat(self.chat_input), NETWORK_LOOP)
+                self.chat_input = None
+            elif key == arcade.key.ESCAPE:
+                self.chat_input = None
+            elif key == arcade.key.BACKSPACE:
+                self.chat_input = self.chat_input[:-1]
+                self.update_chat_prompt()
+            return
+
+        if key in (arcade.key.ENTER, arcade.key.RETURN):
+            self.chat_input = ""
+            self.held_keys.clear()      # Ο παίκτης σταματάει όσο γράφουμε
+            self.update_chat_prompt()
+            return
+
         self.held_keys.add(key)     
 
+    # Χαρακτήρες για το chat (το on_text δίνει και κεφαλαία/τόνους σωστά, σε αντίθεση με το on_key_press)
+    def on_text(self, text):
+        if self.chat_input is None or text in ("\r", "\n"):
+            return
+        if len(self.chat_input) < CHAT_MAX_LEN:
+            self.chat_input += text
+            self.update_chat_prompt()
+
     def on_key_release(self, key, modifiers):
         if key in self.held_keys:
             self.held_keys.remove(key)
@@ -0,0 +1,60 @@
+# Εκτίμηση του ρολογιού του server στον client (NTP-style πάνω από το control)
+#
+# Ο client στέλνει "time" στο control τη στιγμή t0 (τοπικό monotonic ρολόι) και ο server απαντάει με
+# τον χρόνο του (server_time, στη χρονογραμμή των ticks: tick × tick_dt). Με την απάντηση τη στιγμή t3:
+#     rtt = t3 - t0,  offset = server_time - (t0 + t3) / 2
+# Η ουρά στο δίκτυο και στον server μεγαλώνει το rtt και χαλάει το offset, οπότε από τα τελευταία δείγματα
+# κρατάμε αυτό με το μικρότερο rtt. Όταν αλλάζει η εκτίμηση, το offset που χρησιμοποιούμε πλησιάζει
+# σταδιακά τη νέα τιμή, ώστε ο χρόνος του server να μην πηδάει (και μαζί του το interpolation).
+
+import time
+from collections import deque
+
+CLOCK_SAMPLES = 8           # Δείγματα από τα οποία κρατάμε αυτό με το μικρότερο rtt
+CLOCK_SLEW = 0.1            # Μέρος της διαφοράς που διορθώνεται σε κάθε δείγμα
+CLOCK_STEP = 0.25           # Διαφορές πάνω από τόσα δευτερόλεπτα διορθώνονται αμέσως
+
+class ClockSync:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.samples = deque(maxlen=CLOCK_SAMPLES)  # (rtt, offset)
+        self.offset = None      # server_time - τοπικός χρόνος (None μέχρι το πρώτο δείγμα)
+        self.rtt = None
+        self.rough = False      # Το offset βγήκε από snapshot (χωρίς rtt) και όχι από ping
+
+    @property
+    def synced(self):
+        return self.offset is not None and not self.rough
+
+    # Απάντηση στο "time": t0 και t3 στο τοπικό ρολόι, server_time από την απάντηση
+    def on_sample(self, t0, t3, server_time):
+        rtt = t3 - t0
+        self.samples.append((rtt, server_time - (t0 + t3) / 2))
+        self.rtt, estimate = min(self.samples)
+
+        if self.offset is None or self.rough or abs(estimate - self.offset) > CLOCK_STEP:
+            self.offset = estimate
+        else:
+            self.offset += (estimate - self.offset) * CLOCK_SLEW
+        self.rough = False
+
+    # Πριν το πρώτο ping: ο χρόνος ενός snapshot τη στιγμή που έφτασε (χωρίς τη μισή διαδρομή)
+    def seed(self, server_time, local_time):
+        if self.offset is None:
+            self.offset = server_time - local_time
+            self.rough = True
+
+    def reset(self):
+        self.samples.clear()
+        self.offset = None
+        self.rtt = None
+        self.rough = False
+
+    def to_server(self, local_time):
+        return local_time + self.offset
+
+    # Εκτίμηση του τωρινού χρόνου του server, None αν δεν ξέρουμε ακόμα τίποτα
+    def server_now(self):
+        if self.offset is None:
+            return None
+        return self.clock() + self.offset
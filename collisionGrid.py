@@ -0,0 +1,126 @@
+# Πλέγμα collision για τους τοίχους του χάρτη
+#
+# Χτίζεται μία φορά στην εκκίνηση από τα ορθογώνια του Walls layer και αντί να ελέγχουμε
+# κάθε τοίχο σε κάθε κίνηση, κοιτάμε μόνο τα λίγα πλακίδια που καλύπτει το κουτί του παίκτη.
+#
+# - solid:   bytearray (1 byte ανά πλακίδιο) με τα πλακίδια που καλύπτονται ακριβώς από έναν τοίχο
+# - partial: πλακίδιο → λίστα τοίχων που δεν είναι ευθυγραμμισμένοι με το πλέγμα (ακριβής έλεγχος AABB)
+# - outside: τοίχοι που βγαίνουν έξω από τα όρια του χάρτη
+#
+# Οι απαντήσεις είναι ίδιες με τον γραμμικό έλεγχο (αυστηρές ανισότητες, όπως στο collides_with_walls).
+
+import math
+
+class CollisionGrid:
+    def __init__(self, wall_rects, map_width, map_height, tile_width, tile_height):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.map_width = map_width
+        self.map_height = map_height
+
+        # Διαστάσεις πλέγματος σε πλακίδια
+        self.cols = max(1, math.ceil(map_width / tile_width))
+        self.rows = max(1, math.ceil(map_height / tile_height))
+
+        self.solid = bytearray(self.cols * self.rows)   # 1 = το πλακίδιο είναι γεμάτο τοίχο
+        self.partial = {}                               # index πλακιδίου → [(left, bottom, right, top), ...]
+        self.outside = []                               # Τοίχοι εκτός ορίων πλέγματος
+
+        for rect in wall_rects:
+            self.add_wall(*rect)
+
+    # Πλέγμα από έτοιμο πίνακα solid (π.χ. από compiled χάρτη) και τους τοίχους που δεν χωράνε σε αυτόν
+    @classmethod
+    def from_solid(cls, solid, extra_walls, map_width, map_height, tile_width, tile_height):
+        grid = cls((), map_width, map_height, tile_width, tile_height)
+        if len(solid) != len(grid.solid):
+            raise ValueError("solid table does not match the grid size")
+        grid.solid[:] = solid
+        for rect in extra_walls:
+            grid.add_wall(*rect)
+        return grid
+
+    # Οι τοίχοι που δεν περιγράφονται πλήρως από το solid (μη ευθυγραμμισμένοι ή εκτός ορίων)
+    def extra_walls(self):
+        walls = set(self.outside)
+        for rects in self.partial.values():
+            walls.update(rects)
+        return sorted(walls)
+
+    # Πλακίδια (κλειστό διάστημα) που τέμνει το ανοιχτό διάστημα (lo, hi) σε έναν άξονα
+    @staticmethod
+    def _span(lo, hi, size):
+        return math.floor(lo / size), math.ceil(hi / size) - 1
+
+    # Προσθήκη ενός τοίχου στο πλέγμα
+    def add_wall(self, left, bottom, right, top):
+        if right <= left or top <= bottom:
+            return
+
+        c0, c1 = self._span(left, right, self.tile_width)
+        r0, r1 = self._span(bottom, top, self.tile_height)
+
+        # Αν ο τοίχος βγαίνει εκτός πλέγματος, τον κρατάμε και για ελέγχους εκτός ορίων
+        if c0 < 0 or r0 < 0 or c1 >= self.cols or r1 >= self.rows:
+            self.outside.append((left, bottom, right, top))
+
+        # Ευθυγραμμισμένος τοίχος: ακριβώς ένα ή περισσότερα ολόκληρα πλακίδια
+        aligned = (
+            left == c0 * self.tile_width and right == (c1 + 1) * self.tile_width and
+            bottom == r0 * self.tile_height and top == (r1 + 1) * self.tile_height
+        )
+
+        for r in range(max(r0, 0), min(r1, self.rows - 1) + 1):
+            for c in range(max(c0, 0), min(c1, self.cols - 1) + 1):
+                idx = r * self.cols + c
+                if aligned:
+                    self.solid[idx] = 1
+                else:
+                    self.partial.setdefault(idx, []).append((left, bottom, right, top))
+
+    # Έλεγχος αν ένα κουτί (left, bottom, right, top) τέμνει κάποιον τοίχο
+    def box_collides(self, left, bottom, right, top):
+        c0, c1 = self._span(left, right, self.tile_width)
+        r0, r1 = self._span(bottom, top, self.tile_height)
+
+        # Αν το κουτί βγαίνει εκτός πλέγματος ελέγχουμε και τους τοίχους εκτός ορίων
+        if c0 < 0 or r0 < 0 or c1 >= self.cols or r1 >= self.rows:
+            for w_left, w_bottom, w_right, w_top in self.outside:
+                if right > w_left and left < w_right and top > w_bottom and bottom < w_top:
+                    return True
+
+        c0 = max(c0, 0)
+        c1 = min(c1, self.cols - 1)
+        r0 = max(r0, 0)
+        r1 = min(r1, self.rows - 1)
+
+        solid = self.solid
+        partial = self.partial
+        cols = self.cols
+
+        for r in range(r0, r1 + 1):
+            base = r * cols
+            for c in range(c0, c1 + 1):
+                idx = base + c
+                if solid[idx]:
+                    return True
+                rects = partial.get(idx)
+                if rects:
+                    for w_left, w_bottom, w_right, w_top in rects:
+                        if right > w_left and left < w_right and top > w_bottom and bottom < w_top:
+                            return True
+
+        return False
+
+    # Έλεγχος για κουτί πλάτους width και ύψους height με κέντρο (x, y)
+    def collides(self, x, y, width, height):
+        half_w = width / 2
+        half_h = height / 2
+        return self.box_collides(x - half_w, y - half_h, x + half_w, y + half_h)
+
+    # Έλεγχος αν ένα πλακίδιο είναι ελεύθερο από τοίχους
+    def tile_is_free(self, col, row):
+        if col < 0 or row < 0 or col >= self.cols or row >= self.rows:
+            return False
+        idx = row * self.cols + col
+        return not self.solid[idx] and idx not in self.partial
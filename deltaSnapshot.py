@@ -0,0 +1,198 @@
+# Delta snapshots: στέλνουμε μόνο ό,τι άλλαξε από το προηγούμενο tick
+#
+# Κάθε KEYFRAME_INTERVAL ticks στέλνεται ολόκληρη η κατάσταση ("key": 1). Στα ενδιάμεσα ticks
+# το μήνυμα έχει "base" (το tick πάνω στο οποίο εφαρμόζεται), τις οντότητες που κινήθηκαν ή
+# εμφανίστηκαν και τη λίστα "removed" με όσες εξαφανίστηκαν. Ένας client που έχασε μήνυμα
+# (ή μόλις συνδέθηκε) αγνοεί τα deltas μέχρι το επόμενο keyframe.
+#
+# Με skip_unchanged ένα tick χωρίς αλλαγές δεν παράγει μήνυμα και η βάση μένει το τελευταίο
+# μήνυμα που στάλθηκε (π.χ. για κελιά του χάρτη όπου τίποτα δεν κινείται).
+#
+# Με budget ένα delta κοστίζει το πολύ τόσο: κάθε οντότητα κοστίζει cost(id, new) (χωρίς cost 1, δηλαδή
+# το budget μετράει οντότητες) και κάθε αφαίρεση removed_cost. Όσες άλλαξαν αλλά δεν χώρεσαν μένουν στη
+# βάση με την παλιά τους θέση (οπότε ξαναβγαίνουν "αλλαγμένες" στο επόμενο tick) και μαζεύουν
+# προτεραιότητα ανάλογα με το βάρος του section τους, ώστε καμία να μη μένει πίσω για πάντα. Οι
+# αφαιρέσεις και οι νέες οντότητες μπαίνουν πρώτες, και όσες δεν χώρεσαν μένουν κι αυτές στη βάση για
+# το επόμενο tick.
+#
+# Τα keyframes εξαιρούνται από το budget: είναι πάντα πλήρη, αλλιώς ένας client που μόλις μπήκε δεν θα
+# ήξερε ποιες οντότητες λείπουν ακόμα και ένας συγχρονισμένος θα τις έχανε για λίγα ticks. Το κόστος
+# τους μοιράζεται στον χρόνο με το phase (κάθε ροή έχει keyframe σε άλλο tick).
+
+from operator import itemgetter
+
+KEYFRAME_INTERVAL = 50      # Ticks ανάμεσα σε δύο πλήρη snapshots (50 × 20ms = 1s)
+
+SECTIONS = ("players", "mobs")
+
+PRIORITY_WEIGHTS = {"players": 2, "mobs": 1}    # Προτεραιότητα που μαζεύει ανά tick μια οντότητα που περιμένει
+
+# Server: κρατάει την τελευταία κατάσταση που στάλθηκε και παράγει τα deltas
+class DeltaEncoder:
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, phase=0, skip_unchanged=False, budget=None,
+                 cost=None, removed_cost=0):
+        self.keyframe_interval = keyframe_interval
+        self.phase = phase                      # Μετατόπιση των keyframes ώστε να μην πέφτουν όλα στο ίδιο tick
+        self.skip_unchanged = skip_unchanged
+        self.budget = budget                    # Μέγιστο κόστος ανά delta (None = χωρίς όριο)
+        self.cost = cost                        # cost(id, new) → κόστος μιας οντότητας (None = 1)
+        self.removed_cost = removed_cost        # Κόστος μιας αφαίρεσης
+        self.baselines = {}         # section → {id: (x, y)} όπως τα έχουν οι clients
+        self.priority = {}          # (section, id) → συσσωρευμένη προτεραιότητα όσων περιμένουν
+        self.deferred = 0           # Ενημερώσεις που μετατέθηκαν λόγω budget
+        self.last_tick = None
+
+    # sections: section → iterable από (id, x, y). Με force δεν παραλείπεται ούτε μήνυμα χωρίς αλλαγές
+    def encode(self, tick, sections, force=False):
+        keyframe = self.last_tick is None or (tick + self.phase) % self.keyframe_interval == 0
+
+        msg = {"tick": tick}
+        if keyframe:
+            msg["key"] = 1
+        else:
+            msg["base"] = self.last_tick
+
+        removed = {}
+        changes = {}
+        prevs = {}
+        for name, items in sections.items():
+            prev = self.baselines.get(name, {})
+            current = {}
+            changed = {}
+            new = 0
+            for eid, x, y in items:
+                pos = (x, y)
+                current[eid] = pos
+                old = prev.get(eid)
+                if old is None:
+                    new += 1
+                if keyframe or old != pos:
+                    changed[eid] = {"x": x, "y": y}
+
+            # Κάποιες οντότητες της βάσης λείπουν μόνο αν δεν βρέθηκαν όλες στην τρέχουσα κατάσταση
+            if not keyframe and len(current) - new < len(prev):
+                removed[name] = [eid for eid in prev if eid not in current]
+
+            self.baselines[name] = current
+            changes[name] = changed
+            prevs[name] = prev
+
+        if keyframe:
+            self.priority.clear()   # Όλα στάλθηκαν
+        elif self.budget is not None:
+            self.apply_budget(changes, prevs, removed)
+
+        for name, changed in changes.items():
+            if changed or keyframe:
+                msg[name] = changed
+
+        if removed:
+            msg["removed"] = removed
+        elif self.skip_unchanged and len(msg) == 2 and not force:
+            return None     # Μόνο tick και base: τίποτα δεν άλλαξε
+
+        self.last_tick = tick
+        return msg
+
+    # Το επόμενο encode είναι keyframe (π.χ. για subscriber που μόλις μπήκε σε κοινή ροή)
+    def force_keyframe(self):
+        self.last_tick = None
+
+    # Κρατάει στο delta ό,τι έχει τη μεγαλύτερη προτεραιότητα και χωράει, τα υπόλοιπα περιμένουν
+    def apply_budget(self, changes, prevs, removed):
+        priority = self.priority
+        cost = self.cost
+        for name, gone in removed.items():
+            for eid in gone:
+                priority.pop((name, eid), None)
+
+        # (section, id, κόστος, νέα) για τις αλλαγές, με new None για τις αφαιρέσεις
+        items = [(name, eid, self.removed_cost, None) for name, gone in removed.items() for eid in gone]
+        for name, changed in changes.items():
+            prev = prevs[name]
+            for eid in changed:
+                new = eid not in prev
+                items.append((name, eid, 1 if cost is None else cost(eid, new), new))
+
+        if sum(item[2] for item in items) <= self.budget:
+            # Όλα χωράνε: όσοι περίμεναν στάλθηκαν
+            if priority:
+                for name, changed in changes.items():
+                    for eid in changed:
+                        priority.pop((name, eid), None)
+            return
+
+        # Αφαιρέσεις και νέες οντότητες (ο client δεν τις έχει καθόλου) πρώτες, με τη σειρά της λίστας
+        ranked = []
+        for item in items:
+            name, eid, _, new = item
+            if new is False:
+                acc = priority[name, eid] = priority.get((name, eid), 0) + PRIORITY_WEIGHTS.get(name, 1)
+            else:
+                acc = float("inf")
+            ranked.append((acc, item))
+        ranked.sort(key=itemgetter(0), reverse=True)
+
+        left = self.budget
+        kept = {name: set() for name in removed}
+        for _, (name, eid, size, new) in ranked:
+            if size <= left:
+                left -= size
+                if new is None:
+                    kept[name].add(eid)
+                else:
+                    priority.pop((name, eid), None)
+                continue
+
+            # Δεν χώρεσε: η βάση κρατάει ό,τι έχει ο client
+            self.deferred += 1
+            if new is None:
+                self.baselines[name][eid] = prevs[name][eid]
+            else:
+                del changes[name][eid]
+                if new:
+                    del self.baselines[name][eid]
+                else:
+                    self.baselines[name][eid] = prevs[name][eid]
+
+        for name, gone in kept.items():
+            if len(gone) < len(removed[name]):
+                removed[name] = [eid for eid in removed[name] if eid in gone]
+                if not removed[name]:
+                    del removed[name]
+
+# Client: εφαρμόζει τα deltas πάνω στη βάση που έχει
+class DeltaDecoder:
+    def __init__(self):
+        self.sections = {name: {} for name in SECTIONS}    # section → {id: {"x", "y"}}
+        self.tick = None        # Tick της βάσης (None = περιμένουμε keyframe)
+        self.missed = 0         # Deltas που αγνοήθηκαν επειδή δεν ταίριαζαν με τη βάση
+
+    # Επιστρέφει True αν η βάση ενημερώθηκε
+    def apply(self, msg):
+        if msg.get("key"):
+            for name in SECTIONS:
+                self.sections[name] = dict(msg.get(name, {}))
+            self.tick = msg["tick"]
+            return True
+
+        if self.tick is None or msg.get("base") != self.tick:
+            if self.tick is not None:
+                self.missed += 1
+            self.tick = None    # Χάσαμε μήνυμα: περιμένουμε το επόμενο keyframe
+            return False
+
+        # Πρώτα οι αφαιρέσεις: ένα id που ελευθερώθηκε μπορεί να ξαναδοθεί στο ίδιο μήνυμα
+        for name, gone in msg.get("removed", {}).items():
+            section = self.sections.get(name)
+            if section is not None:
+                for eid in gone:
+                    section.pop(eid, None)
+
+        for name in SECTIONS:
+            changed = msg.get(name)
+            if changed:
+                self.sections[name].update(changed)
+
+        self.tick = msg["tick"]
+        return True
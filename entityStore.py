@@ -0,0 +1,430 @@
+# Αποθήκευση παικτών σε μορφή structure-of-arrays
+#
+# Αντί για λεξικό με μικρά dicts ανά παίκτη, οι θέσεις και οι ταχύτητες κρατιούνται σε
+# συνεχόμενους πίνακες (ένα slot ανά παίκτη) με free-list για connect/disconnect.
+#
+# - PlayerStore:      καθαρή Python (array), κίνηση ένας-ένας παίκτης
+# - NumpyPlayerStore: προαιρετικό NumPy backend, κίνηση/clamp/collision για όλους μαζί σε κάθε tick
+#
+# Και τα δύο backends δίνουν τα ίδια αποτελέσματα με το movement.move(), που χρησιμοποιεί και ο client.
+
+import math
+from array import array
+from movement import move
+
+# Το ίδιο κελί και τα μισά γειτονικά του: τα άλλα μισά βγάζουν τα ίδια ζεύγη ανάποδα
+NEIGHBOR_CELLS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+try:
+    import numpy as np
+except ImportError:     # Το NumPy είναι προαιρετικό
+    np = None
+
+class PlayerStore:
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.high = 0           # Πόσα slots έχουν χρησιμοποιηθεί ποτέ (high-water mark)
+
+        self.slots = {}         # pid → slot
+        self.ids = []           # slot → pid (None για ελεύθερο slot)
+        self.free = []          # Ελεύθερα slots για επαναχρησιμοποίηση
+
+        self._allocate(capacity)
+
+    # Δέσμευση πινάκων (και επέκταση όταν γεμίσουν)
+    def _allocate(self, capacity):
+        extra = capacity - self.capacity
+
+        if self.capacity == 0:
+            self.x = array("d")
+            self.y = array("d")
+            self.vx = array("d")
+            self.vy = array("d")
+            self.gen = array("I")       # Generation ανά slot (αλλάζει σε κάθε νέο παίκτη στο ίδιο slot)
+            self.alive = bytearray()
+
+        for arr in (self.x, self.y, self.vx, self.vy):
+            arr.extend(array("d", bytes(8 * extra)))
+        self.gen.extend(array("I", bytes(4 * extra)))
+        self.alive.extend(bytes(extra))
+
+        self.ids.extend([None] * extra)
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, pid):
+        return pid in self.slots
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    # Προσθήκη παίκτη σε ελεύθερο slot
+    def add(self, pid, x, y):
+        if pid in self.slots:
+            slot = self.slots[pid]
+        elif self.free:
+            slot = self.free.pop()
+        else:
+            if self.high == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.high
+            self.high += 1
+
+        self.slots[pid] = slot
+        self.ids[slot] = pid
+        self.alive[slot] = 1
+        self.gen[slot] += 1
+        self.x[slot] = x
+        self.y[slot] = y
+        self.vx[slot] = 0.0
+        self.vy[slot] = 0.0
+        return slot
+
+    # Αφαίρεση παίκτη, το slot του μπαίνει στη free-list
+    def remove(self, pid):
+        slot = self.slots.pop(pid, None)
+        if slot is None:
+            return False
+
+        self.ids[slot] = None
+        self.alive[slot] = 0
+        self.vx[slot] = 0.0
+        self.vy[slot] = 0.0
+        self.free.append(slot)
+        return True
+
+    def slot_of(self, pid):
+        return self.slots.get(pid)
+
+    def get(self, pid):
+        slot = self.slots[pid]
+        return float(self.x[slot]), float(self.y[slot])
+
+    def set_position(self, pid, x, y):
+        slot = self.slots[pid]
+        self.x[slot] = x
+        self.y[slot] = y
+
+    def set_velocity(self, pid, vx, vy):
+        slot = self.slots[pid]
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+
+    # (pid, x, y) για κάθε ενεργό παίκτη
+    def items(self):
+        x = self.x
+        y = self.y
+        for pid, slot in self.slots.items():
+            yield pid, float(x[slot]), float(y[slot])
+
+    # Η κατάσταση των παικτών όπως τη στέλνουμε στους clients
+    def to_dict(self):
+        return {pid: {"x": x, "y": y} for pid, x, y in self.items()}
+
+    # Κίνηση όλων των παικτών με την ταχύτητά τους, με clamp στα όρια και collision στους τοίχους
+    # Επιστρέφει [(slot, old_x, old_y), ...] για τους παίκτες που άλλαξαν θέση
+    def step(self, grid, map_width, map_height, width, height):
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        alive = self.alive
+        moved = []
+
+        # Με τη σειρά των slots, όπως και στο NumPy backend (ντετερμινιστική σειρά)
+        for slot in range(self.high):
+            if not alive[slot]:
+                continue
+
+            vx = vxs[slot]
+            vy = vys[slot]
+            if not vx and not vy:
+                continue
+
+            old_x = xs[slot]
+            old_y = ys[slot]
+            x, y = move(grid, old_x, old_y, vx, vy, map_width, map_height, width, height)
+            if x != old_x or y != old_y:
+                xs[slot] = x
+                ys[slot] = y
+                moved.append((slot, old_x, old_y))
+
+        return moved
+
+    # Κουτιά που πιάνει κάθε ενεργός παίκτης σε αυτό το tick: όλη η περιοχή ανάμεσα στην παλιά και τη νέα
+    # του θέση (εκεί βρίσκονται όλες οι θέσεις που δοκιμάζει ο ακριβής έλεγχος collision)
+    def _swept_boxes(self, moved, width, height):
+        old = {slot: (old_x, old_y) for slot, old_x, old_y in moved}
+        half_w = width / 2
+        half_h = height / 2
+        boxes = []
+        for slot in range(self.high):
+            if not self.alive[slot]:
+                continue
+            x = float(self.x[slot])
+            y = float(self.y[slot])
+            old_x, old_y = old.get(slot, (x, y))
+            boxes.append((
+                slot, slot in old, x, y,
+                min(x, old_x) - half_w, max(x, old_x) + half_w,
+                min(y, old_y) - half_h, max(y, old_y) + half_h
+            ))
+        return boxes
+
+    # Broad phase για collision μεταξύ παικτών: για κάθε slot του moved που ίσως ακούμπησε άλλον παίκτη,
+    # τα slots των υποψήφιων (ταξινομημένα). Υποψήφιοι είναι όσοι τα κουτιά τους τέμνονται σε όλη τη
+    # διαδρομή του tick, και ο παίκτης μπαίνει στο αποτέλεσμα μόνο αν στη νέα του θέση ακουμπάει τη διαδρομή
+    # κάποιου (αλλιώς ο ακριβής έλεγχος θα την κρατούσε έτσι κι αλλιώς). Τα κουτιά μπαίνουν σε κελιά
+    # μεγέθους ≥ κάθε κουτιού, οπότε δύο κουτιά που τέμνονται είναι στο ίδιο ή σε γειτονικό κελί
+    def contacts(self, moved, width, height, cell_size):
+        if not moved:
+            return {}
+
+        half_w = width / 2
+        half_h = height / 2
+        boxes = self._swept_boxes(moved, width, height)
+        cell_size = max(cell_size, max(max(b[5] - b[4], b[7] - b[6]) for b in boxes))
+        cells = {}
+        for box in boxes:
+            cells.setdefault((math.floor(box[4] / cell_size), math.floor(box[6] / cell_size)), []).append(box)
+
+        pairs = {}
+        contested = set()
+        for (cx, cy), bucket in cells.items():
+            for dcx, dcy in NEIGHBOR_CELLS:
+                other = bucket if (dcx, dcy) == (0, 0) else cells.get((cx + dcx, cy + dcy))
+                if not other:
+                    continue
+                for i, moving_i, x_i, y_i, left_i, right_i, bottom_i, top_i in bucket:
+                    for j, moving_j, x_j, y_j, left_j, right_j, bottom_j, top_j in other:
+                        if not (
+                            i != j and (moving_i or moving_j)
+                            and left_i < right_j and left_j < right_i and bottom_i < top_j and bottom_j < top_i
+                        ):
+                            continue
+                        if moving_i:
+                            pairs.setdefault(i, set()).add(j)
+                            if x_i - half_w < right_j and left_j < x_i + half_w and y_i - half_h < top_j and bottom_j < y_i + half_h:
+                                contested.add(i)
+                        if moving_j:
+                            pairs.setdefault(j, set()).add(i)
+                            if x_j - half_w < right_i and left_i < x_j + half_w and y_j - half_h < top_i and bottom_i < y_j + half_h:
+                                contested.add(j)
+
+        return {slot: sorted(pairs[slot]) for slot in contested}
+
+class NumpyPlayerStore(PlayerStore):
+    def __init__(self, capacity=64):
+        self._grid = None       # Cache των πινάκων του πλέγματος collision σε μορφή NumPy
+        super().__init__(capacity)
+
+    def _allocate(self, capacity):
+        old = self.capacity
+
+        def grow(arr, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old:
+                new[:old] = arr
+            return new
+
+        self.x = grow(getattr(self, "x", None), np.float64)
+        self.y = grow(getattr(self, "y", None), np.float64)
+        self.vx = grow(getattr(self, "vx", None), np.float64)
+        self.vy = grow(getattr(self, "vy", None), np.float64)
+        self.gen = grow(getattr(self, "gen", None), np.uint32)
+        self.alive = grow(getattr(self, "alive", None), np.bool_)
+
+        self.ids.extend([None] * (capacity - old))
+        self.capacity = capacity
+
+    def items(self):
+        xs = self.x.tolist()
+        ys = self.y.tolist()
+        for pid, slot in self.slots.items():
+            yield pid, xs[slot], ys[slot]
+
+    # Πίνακες solid/partial του πλέγματος σε 2D μορφή (rows, cols), χτίζονται μία φορά
+    def _grid_arrays(self, grid):
+        if self._grid is None or self._grid[0] is not grid:
+            solid = np.frombuffer(bytes(grid.solid), dtype=np.uint8).reshape(grid.rows, grid.cols).astype(np.bool_)
+            partial = np.zeros(grid.rows * grid.cols, dtype=np.bool_)
+            if grid.partial:
+                partial[np.fromiter(grid.partial.keys(), dtype=np.int64)] = True
+            self._grid = (grid, solid, partial.reshape(grid.rows, grid.cols))
+        return self._grid[1], self._grid[2]
+
+    # Vectorized έλεγχος collision για πολλά κουτιά μαζί
+    def _collides_many(self, grid, xs, ys, width, height):
+        solid, partial = self._grid_arrays(grid)
+        tw = grid.tile_width
+        th = grid.tile_height
+
+        half_w = width / 2
+        half_h = height / 2
+
+        # Πλακίδια που καλύπτει το κουτί κάθε παίκτη (ίδιος κανόνας με το CollisionGrid._span)
+        c0 = np.floor((xs - half_w) / tw).astype(np.int64)
+        c1 = np.ceil((xs + half_w) / tw).astype(np.int64) - 1
+        r0 = np.floor((ys - half_h) / th).astype(np.int64)
+        r1 = np.ceil((ys + half_h) / th).astype(np.int64) - 1
+
+        # Κουτιά εκτός πλέγματος ή πάνω σε μη ευθυγραμμισμένους τοίχους πάνε στον ακριβή έλεγχο
+        slow = (c0 < 0) | (r0 < 0) | (c1 >= grid.cols) | (r1 >= grid.rows)
+
+        c0 = np.clip(c0, 0, grid.cols - 1)
+        c1 = np.clip(c1, 0, grid.cols - 1)
+        r0 = np.clip(r0, 0, grid.rows - 1)
+        r1 = np.clip(r1, 0, grid.rows - 1)
+
+        hit = np.zeros(len(xs), dtype=np.bool_)
+        span_c = math.ceil(width / tw) + 1
+        span_r = math.ceil(height / th) + 1
+
+        for dr in range(span_r):
+            r = r0 + dr
+            valid_r = r <= r1
+            r = np.minimum(r, r1)
+            for dc in range(span_c):
+                c = c0 + dc
+                valid = valid_r & (c <= c1)
+                c = np.minimum(c, c1)
+                hit |= valid & solid[r, c]
+                slow |= valid & partial[r, c]
+
+        # Ακριβής (scalar) έλεγχος μόνο για τα λίγα κουτιά που χρειάζονται
+        for i in np.flatnonzero(slow & ~hit):
+            hit[i] = grid.collides(float(xs[i]), float(ys[i]), width, height)
+
+        return hit
+
+    def step(self, grid, map_width, map_height, width, height):
+        high = self.high
+        vx = self.vx[:high]
+        vy = self.vy[:high]
+
+        moving = np.flatnonzero(self.alive[:high] & ((vx != 0) | (vy != 0)))
+        if not len(moving):
+            return []
+
+        half_w = width / 2
+        half_h = height / 2
+
+        old_x = x = self.x[moving]
+        old_y = y = self.y[moving]
+
+        # Περιορισμός της νέας θέσης ώστε οι παίκτες να μην βγουν εκτός των ορίων του χάρτη
+        new_x = np.clip(x + vx[moving], half_w, map_width - half_w)
+        new_y = np.clip(y + vy[moving], half_h, map_height - half_h)
+
+        # Έλεγχος collision, πρώτα στον x και μετά στον y άξονα (όπως στο scalar backend)
+        free_x = ~self._collides_many(grid, new_x, y, width, height)
+        x = np.where(free_x, new_x, x)
+
+        free_y = ~self._collides_many(grid, x, new_y, width, height)
+        y = np.where(free_y, new_y, y)
+
+        self.x[moving] = x
+        self.y[moving] = y
+
+        changed = (x != old_x) | (y != old_y)
+        return list(zip(
+            moving[changed].tolist(),
+            old_x[changed].tolist(),
+            old_y[changed].tolist()
+        ))
+
+    # Ίδια ζεύγη με το PlayerStore.contacts, αλλά η ταξινόμηση σε κελιά και η δημιουργία/έλεγχος των
+    # ζευγών γίνονται για όλους μαζί, χωρίς loop στην Python
+    def contacts(self, moved, width, height, cell_size):
+        if not moved:
+            return {}
+
+        slots = np.flatnonzero(self.alive[:self.high])
+        x = self.x[slots]
+        y = self.y[slots]
+        old_x = x.copy()
+        old_y = y.copy()
+        moved = np.array(moved, dtype=np.float64)
+        index = np.searchsorted(slots, moved[:, 0].astype(np.int64))
+        old_x[index] = moved[:, 1]
+        old_y[index] = moved[:, 2]
+        moving = np.zeros(len(slots), dtype=np.bool_)
+        moving[index] = True
+
+        half_w = width / 2
+        half_h = height / 2
+        left = np.minimum(x, old_x) - half_w
+        right = np.maximum(x, old_x) + half_w
+        bottom = np.minimum(y, old_y) - half_h
+        top = np.maximum(y, old_y) + half_h
+        cell_size = max(cell_size, float((right - left).max()), float((top - bottom).max()))
+
+        cx = np.floor(left / cell_size).astype(np.int64)
+        cy = np.floor(bottom / cell_size).astype(np.int64)
+        cx -= cx.min() - 1
+        cy -= cy.min() - 1
+        stride = int(cy.max()) + 2      # Κλειδί κελιού cx * stride + cy, με περιθώριο για τα γειτονικά
+        keys = cx * stride + cy
+
+        # Παίκτες ταξινομημένοι ανά κελί, και για κάθε κελί πού ξεκινάει και πόσοι είναι (πυκνός πίνακας)
+        order = np.argsort(keys, kind="stable")
+        cell_count = np.bincount(keys, minlength=int(keys.max()) + stride + 2)
+        cell_start = np.cumsum(cell_count) - cell_count
+        everyone = np.arange(len(slots))
+
+        found_i = []
+        found_j = []
+        for dcx, dcy in NEIGHBOR_CELLS:
+            neighbor = keys + (dcx * stride + dcy)
+            lo = cell_start[neighbor]
+            counts = cell_count[neighbor]
+            total = int(counts.sum())
+            if not total:
+                continue
+
+            # Όλα τα ζεύγη (i, j) με j στο γειτονικό κελί του i
+            i = np.repeat(everyone, counts)
+            j = order[np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(total)]
+
+            touching = (
+                (i != j) & (moving[i] | moving[j])
+                & (left[i] < right[j]) & (left[j] < right[i])
+                & (bottom[i] < top[j]) & (bottom[j] < top[i])
+            )
+            found_i.append(i[touching])
+            found_j.append(j[touching])
+
+        if not found_i:
+            return {}
+
+        # Κάθε ζεύγος και προς τις δύο κατευθύνσεις, μόνο για όσους κινήθηκαν
+        i = np.concatenate(found_i + found_j)
+        j = np.concatenate(found_j + found_i)
+        keep = moving[i]
+        i = i[keep]
+        j = j[keep]
+
+        # Η νέα θέση του i ακουμπάει τη διαδρομή του j
+        near = (
+            (x[i] - half_w < right[j]) & (left[j] < x[i] + half_w)
+            & (y[i] - half_h < top[j]) & (bottom[j] < y[i] + half_h)
+        )
+        contested = np.zeros(len(slots), dtype=np.bool_)
+        contested[i[near]] = True
+        keep = contested[i]
+
+        pairs = {}
+        for a, b in zip(slots[i[keep]].tolist(), slots[j[keep]].tolist()):
+            pairs.setdefault(a, set()).add(b)
+        return {slot: sorted(others) for slot, others in pairs.items()}
+
+# Δημιουργία store: NumPy αν υπάρχει (ή αν ζητηθεί ρητά), αλλιώς καθαρή Python
+def make_player_store(use_numpy=None):
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return NumpyPlayerStore()
+
+    return PlayerStore()
@@ -0,0 +1,166 @@
+# Κανάλι γεγονότων: chat, μηνύματα συστήματος και γεγονότα του παιχνιδιού, χωριστά από την κατάσταση
+#
+# Δικά του sockets (PULL για ό,τι στέλνουν οι clients, PUB προς τους clients) σε δικό του thread με
+# δικό του ZeroMQ context, ώστε μια ριπή στο chat να μην περιμένει ποτέ το tick ούτε να μπαίνει στην
+# ουρά του PUB της κατάστασης. Κάθε γεγονός έχει topic ("chat", "chat.<κανάλι>", "system", "game")
+# και οι clients κάνουν subscribe μόνο σε όσα θέλουν. Οι clients στέλνουν μόνο στα topics του chat,
+# με όριο ανά sender (TokenBucket) και μήκους. Ό,τι φτάνει μέσα σε ένα tick στέλνεται μαζί, ένα frame
+# [topic, λίστα γεγονότων σε JSON] ανά topic, οπότε πολλά μικρά μηνύματα κοστίζουν ένα send.
+#
+# Ο server δημοσιεύει γεγονότα με post() από οποιοδήποτε thread (μπαίνουν σε queue, χωρίς αναμονή).
+
+import json
+import queue
+import threading
+import time
+import zmq
+from rateLimit import TokenBucket
+
+# Θύρες του καναλιού (χωρίς regions· οι περιοχές έχουν τις δικές τους, βλ. regions.py)
+EVENT_INPUT_ADDR = "tcp://*:5559"   # Μηνύματα των clients (PULL)
+EVENT_ADDR       = "tcp://*:5560"   # Γεγονότα προς τους clients (PUB)
+
+# Topics
+TOPIC_CHAT = "chat"         # Chat όλης της περιοχής ("chat.<κανάλι>" για άλλα κανάλια)
+TOPIC_SYSTEM = "system"     # Μηνύματα του server (συνδέσεις, ανακοινώσεις)
+TOPIC_GAME = "game"         # Γεγονότα του παιχνιδιού (handoffs κ.λπ.)
+TOPIC_MAX_LEN = 32
+
+SERVER_SENDER = "server"
+
+CHAT_RATE = 1.0         # Μηνύματα chat ανά δευτερόλεπτο ανά sender
+CHAT_BURST = 5          # Μέγιστη ριπή
+CHAT_MAX_LEN = 200      # Μέγιστο μήκος μηνύματος (χαρακτήρες)
+
+EVENT_BATCH = 50        # Μέγιστα γεγονότα ανά topic σε ένα frame, τα υπόλοιπα πάνε στο επόμενο tick
+RECV_BATCH = 500        # Μέγιστα μηνύματα clients ανά tick, τα υπόλοιπα μένουν στο socket
+EVENT_HWM = 1000        # Ουρές των sockets: σε πλημμύρα πετιούνται γεγονότα, όχι κατάσταση
+SENDER_IDLE = 60.0      # Buckets senders που σώπασαν τόσο πολύ διαγράφονται
+
+def is_client_topic(topic):
+    return topic == TOPIC_CHAT or topic.startswith(TOPIC_CHAT + ".")
+
+class EventChannel:
+    def __init__(self, input_addr=EVENT_INPUT_ADDR, pub_addr=EVENT_ADDR, flush_interval=0.02, accept=None):
+        self.input_addr = input_addr
+        self.pub_addr = pub_addr
+        self.flush_interval = flush_interval    # Ένα frame ανά topic σε κάθε διάστημα (ένα tick)
+        self.accept = accept                    # Προαιρετικό: sender → True αν επιτρέπεται να στείλει
+
+        self.posted = queue.SimpleQueue()       # Γεγονότα του server (thread-safe)
+        self.pending = {}                       # topic → λίστα γεγονότων για το επόμενο flush
+        self.buckets = {}                       # sender → TokenBucket
+
+        self.received = 0
+        self.rate_limited = 0
+        self.rejected = 0       # Άκυρα μηνύματα, topics που δεν επιτρέπονται, άγνωστοι senders
+        self.frames = 0
+
+        self.thread = None
+        self.running = False
+
+    # Γεγονός από τον server, π.χ. post(TOPIC_SYSTEM, "alice joined")
+    def post(self, topic, text, **fields):
+        event = {"from": SERVER_SENDER, "text": text}
+        event.update(fields)
+        self.posted.put((topic, event))
+
+    # Μήνυμα client: {"id", "topic", "text"}
+    def on_message(self, raw):
+        self.received += 1
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            msg = None
+        if not isinstance(msg, dict):
+            self.rejected += 1
+            return
+
+        sender = msg.get("id")
+        topic = msg.get("topic", TOPIC_CHAT)
+        text = msg.get("text")
+        if (
+            not isinstance(topic, str) or len(topic) > TOPIC_MAX_LEN or not is_client_topic(topic)
+            or not isinstance(text, str) or not text.strip()
+            or not isinstance(sender, (str, int)) or (self.accept is not None and not self.accept(sender))
+        ):
+            self.rejected += 1
+            return
+
+        bucket = self.buckets.get(sender)
+        if bucket is None:
+            bucket = self.buckets[sender] = TokenBucket(CHAT_RATE, CHAT_BURST)
+        if not bucket.consume():
+            self.rate_limited += 1
+            return
+
+        self.pending.setdefault(topic, []).append({"from": sender, "text": text[:CHAT_MAX_LEN]})
+
+    # Ένα frame ανά topic με ό,τι μαζεύτηκε
+    def flush(self, pub_socket):
+        while True:
+            try:
+                topic, event = self.posted.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.setdefault(topic, []).append(event)
+
+        for topic in list(self.pending):
+            events = self.pending[topic]
+            batch = events[:EVENT_BATCH]
+            if len(events) > EVENT_BATCH:
+                self.pending[topic] = events[EVENT_BATCH:]
+            else:
+                del self.pending[topic]
+            try:
+                pub_socket.send_multipart([topic.encode(), json.dumps(batch).encode()], zmq.NOBLOCK)
+                self.frames += 1
+            except zmq.Again:
+                pass
+
+    def forget_idle(self, now):
+        for sender in [sender for sender, bucket in self.buckets.items() if now - bucket.last > SENDER_IDLE]:
+            del self.buckets[sender]
+
+    def run(self):
+        ctx = zmq.Context()
+        pull_socket = ctx.socket(zmq.PULL)
+        pull_socket.setsockopt(zmq.RCVHWM, EVENT_HWM)
+        pull_socket.bind(self.input_addr)
+        pub_socket = ctx.socket(zmq.PUB)
+        pub_socket.setsockopt(zmq.SNDHWM, EVENT_HWM)
+        pub_socket.bind(self.pub_addr)
+
+        next_flush = time.monotonic() + self.flush_interval
+        next_cleanup = time.monotonic() + SENDER_IDLE
+        try:
+            while self.running:
+                timeout = max(0, int((next_flush - time.monotonic()) * 1000))
+                if pull_socket.poll(timeout):
+                    for _ in range(RECV_BATCH):
+                        try:
+                            self.on_message(pull_socket.recv(zmq.NOBLOCK))
+                        except zmq.Again:
+                            break
+
+                now = time.monotonic()
+                if now >= next_flush:
+                    # Χωρίς catch-up: αν αργήσαμε, το επόμενο flush μετράει από τώρα
+                    next_flush = max(next_flush + self.flush_interval, now)
+                    self.flush(pub_socket)
+                if now >= next_cleanup:
+                    next_cleanup = now + SENDER_IDLE
+                    self.forget_idle(now)
+        finally:
+            ctx.destroy(linger=0)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="events", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,386 @@
+# Headless προσομοίωση του κόσμου
+#
+# Όλη η κατάσταση του παιχνιδιού (παίκτες, inputs, tick, spawn) ζει σε ένα αντικείμενο GameWorld,
+# χωρίς sockets και χωρίς globals. Ο server.py είναι απλώς ένας adapter πάνω από ZeroMQ,
+# ενώ tests και εργαλεία μπορούν να τρέξουν χιλιάδες ticks ανά δευτερόλεπτο χωρίς δίκτυο.
+
+import hashlib
+import json
+import random
+from inputState import KEY_MASK
+from movement import PLAYER_WIDTH, PLAYER_HEIGHT, SPEED, velocity
+from entityStore import make_player_store
+from spatialHash import SpatialHash
+from mobSystem import MobSystem, MOB_COUNT
+from pathfinding import Pathfinder
+from snapshotHistory import SnapshotHistory, HISTORY_TICKS
+
+TICK_DT = 0.02      # Η διάρκεια κάθε "tick" σε δευτερόλεπτα (ρυθμίζει το frame rate)
+
+PLAYER_COLLISION = True     # Οι παίκτες δεν περνάνε ο ένας μέσα από τον άλλο
+SPATIAL_CELL_SIZE = 128     # Μέγεθος κελιού του spatial hash σε pixels
+
+PATH_EXPANSIONS_PER_TICK = 3000    # Επεκτάσεις A* ανά tick για όλα τα αιτήματα μαζί (οι υπόλοιπες στο επόμενο tick)
+PATH_COOLDOWN_TICKS = 10    # Ελάχιστα ticks ανάμεσα σε δύο αναζητήσεις του ίδιου παίκτη (το νεότερο κλικ περιμένει)
+PATH_STUCK_TICKS = 25       # Ticks χωρίς πρόοδο πριν ακυρωθεί ένα μονοπάτι
+
+class GameWorld:
+    def __init__(self, game_map, tick_dt=TICK_DT, use_numpy=None, mob_count=MOB_COUNT, seed=0):
+        self.map = game_map
+        self.collision_grid = game_map.collision_grid
+        self.tick_dt = tick_dt
+
+        self.rng = random.Random(seed)  # Ντετερμινιστική τυχαιότητα (AI των mobs)
+
+        self.tick = 0               # Μετρητής "tick" για το παιχνίδι
+
+        # Player data
+        self.players = make_player_store(use_numpy)    # Θέσεις/ταχύτητες παικτών σε πίνακες (structure-of-arrays)
+        self.connected = set()      # Σύνολο συνδεδεμένων παικτών
+
+        # Spatial hash με τις θέσεις των παικτών (ερωτήσεις γειτνίασης, π.χ. transitions και mobs)
+        self.spatial = SpatialHash(SPATIAL_CELL_SIZE)
+
+        self.next_spawn_index = 0   # Round-robin στα σημεία spawn
+
+        # Input: κρατάμε μόνο το πιο πρόσφατο μήνυμα ανά παίκτη μέχρι το επόμενο tick (coalescing)
+        self.pending_inputs = {}    # pid → τελευταίο μήνυμα input (μεγαλύτερο seq)
+        self.player_inputs = {}     # pid → {"seq", "keys"} η κατάσταση πλήκτρων που εφαρμόζεται σε κάθε tick
+        self.dropped_inputs = 0     # Inputs που απορρίφθηκαν ως περιττά (παλιό ή ίδιο seq)
+
+        # Click-to-move: A* πάνω στα βατά πλακίδια με LRU cache μονοπατιών
+        self.pathfinder = Pathfinder(self.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+        self.path_requests = {}     # pid → (x, y) στόχος που περιμένει να ξεκινήσει η αναζήτησή του
+        self.path_searches = {}     # pid → (PathSearch, x, y) αναζητήσεις σε εξέλιξη, με σειρά άφιξης
+        self.path_started = {}      # pid → tick της τελευταίας αναζήτησης (όριο ρυθμού ανά παίκτη)
+        self.paths = {}             # pid → waypoints σε αντίστροφη σειρά (το επόμενο στο τέλος)
+        self.path_stuck = {}        # pid → ticks χωρίς πρόοδο
+
+        # Mobs που ελέγχει ο server
+        self.mobs = MobSystem(self, use_numpy)
+        self.mobs.populate(mob_count)
+
+        # Ιστορικό θέσεων των τελευταίων ticks (lag compensation, deltas ως προς παλιό baseline)
+        self.history = SnapshotHistory(self.players, HISTORY_TICKS)
+        self.mob_history = SnapshotHistory(self.mobs.store, HISTORY_TICKS)
+        self.record_history()
+
+    # Σύνδεση παίκτη, επιστρέφει True αν ο παίκτης είναι νέος
+    def connect(self, pid):
+        if pid in self.connected:
+            self.player_inputs[pid] = {"seq": -1, "tick": 0, "keys": 0}   # Ο client ξεκινάει ξανά τα seq από την αρχή
+            return False
+
+        # Spawn place
+        spawn_index = self.next_spawn_index
+        self.next_spawn_index += 1
+
+        spawn_points = self.map.spawn_points
+        x, y = spawn_points[spawn_index % len(spawn_points)]
+        self.add_player(pid, x, y)
+
+        return True
+
+    def add_player(self, pid, x, y):
+        # Προσθήκη του παίκτη στo σύνολο των συνδεδεμένων
+        self.connected.add(pid)
+
+        self.players.add(pid, x, y)         # Αποθήκευση θέσης παίκτη
+        self.spatial.insert(pid, x, y, PLAYER_WIDTH, PLAYER_HEIGHT)
+        self.player_inputs[pid] = {"seq": -1, "tick": 0, "keys": 0}
+
+    # Παίκτης που έρχεται από άλλη περιοχή: μπαίνει (ή μετακινείται) στη θέση άφιξης
+    def place_player(self, pid, x, y):
+        half_w = PLAYER_WIDTH / 2
+        half_h = PLAYER_HEIGHT / 2
+        x = max(half_w, min(x, self.map.width - half_w))
+        y = max(half_h, min(y, self.map.height - half_h))
+
+        # Αν η θέση άφιξης είναι τοίχος, το πλησιέστερο βατό πλακίδιο (αλλιώς σημείο spawn)
+        if self.collides_with_walls(x, y):
+            cell = self.pathfinder.nearest_walkable(*self.pathfinder.cell_of(x, y))
+            if cell is not None:
+                x, y = self.pathfinder.cell_center(*cell)
+            else:
+                x, y = self.map.spawn_points[0]
+
+        if pid not in self.connected:
+            self.add_player(pid, x, y)
+            return True
+
+        self.cancel_path(pid)
+        self.players.set_position(pid, x, y)
+        self.spatial.update(pid, x, y)
+        return False
+
+    # Επαναφορά από checkpoint: οι παίκτες μπαίνουν ξανά στις θέσεις τους, όχι στα σημεία spawn
+    def restore(self, tick, next_spawn_index, players):
+        self.tick = tick
+        self.next_spawn_index = next_spawn_index
+        for pid, x, y in players:
+            if pid not in self.connected:
+                self.add_player(pid, x, y)
+        self.record_history()
+
+    # Αποσύνδεση παίκτη
+    def disconnect(self, pid):
+        self.connected.discard(pid)         # Αφαίρεση του παίκτη από το σύνολο των συνδεδεμένων
+        self.players.remove(pid)            # Αφαίρεση του παίκτη από τα δεδομένα (το slot επαναχρησιμοποιείται)
+        self.spatial.remove(pid)
+
+        # Καθαρισμός της κατάστασης input του παίκτη
+        self.player_inputs.pop(pid, None)
+        self.pending_inputs.pop(pid, None)
+        self.cancel_path(pid)
+        self.path_started.pop(pid, None)
+
+    # Παραλαβή ενός input, εφαρμόζεται στο επόμενο step(). Το replay περνάει check_seq=False:
+    # το journal κρατάει μόνο inputs που είχαν ήδη περάσει τον έλεγχο του seq στον server
+    def apply_input(self, pid, msg, check_seq=True):
+        state = self.player_inputs.get(pid)
+        if state is None:
+            return False    # Αγνοεί τα inputs από παίκτες που δεν είναι συνδεδεμένοι
+
+        seq = msg.get("seq", 0)
+        if check_seq and seq <= state["seq"]:
+            self.dropped_inputs += 1
+            return False    # Επανάληψη κατάστασης που έχει ήδη εφαρμοστεί
+
+        # Coalescing: κρατάμε μόνο το πιο πρόσφατο input κάθε παίκτη μέχρι το tick
+        pending = self.pending_inputs.get(pid)
+        if pending is None or seq > pending.get("seq", 0):
+            self.pending_inputs[pid] = msg
+
+        return True
+
+    # Μέθοδος για το collision
+    def collides_with_walls(self, x, y):
+        # Το κουτί του παίκτη με κέντρο (x, y) ελέγχεται μόνο στα πλακίδια που καλύπτει
+        return self.collision_grid.collides(x, y, PLAYER_WIDTH, PLAYER_HEIGHT)
+
+    # Ενημερώνει την κατάσταση πλήκτρων με τα inputs που ήρθαν από το προηγούμενο tick
+    def apply_pending_inputs(self):
+        for pid, msg in self.pending_inputs.items():
+            state = self.player_inputs.get(pid)
+            if state is None:
+                continue
+
+            state["seq"] = msg.get("seq", 0)
+            state["tick"] = self.tick   # Πρώτο tick με αυτό το input (ack προς τον client για το prediction)
+            state["keys"] = int(msg.get("keys", 0)) & KEY_MASK
+
+            # Click-to-move: ο στόχος λύνεται στο process_path_requests, τα πλήκτρα ακυρώνουν το μονοπάτι
+            goto = msg.get("goto")
+            if goto:
+                self.cancel_path(pid)
+                self.path_requests[pid] = (float(goto[0]), float(goto[1]))
+                state["keys"] = 0
+            else:
+                self.cancel_path(pid)
+
+            # Η ταχύτητα αλλάζει μόνο όταν αλλάζουν τα πλήκτρα, η κίνηση γίνεται στο simulate_players
+            self.players.set_velocity(pid, *velocity(state["keys"]))
+
+        self.pending_inputs.clear()
+
+    def cancel_path(self, pid):
+        self.path_requests.pop(pid, None)
+        self.path_searches.pop(pid, None)
+        self.paths.pop(pid, None)
+        self.path_stuck.pop(pid, None)
+
+    # Αιτήματα click-to-move με φραγμένο κόστος ανά tick: PATH_EXPANSIONS_PER_TICK επεκτάσεις A* για όλους
+    # μαζί, και όποια αναζήτηση δεν τελείωσε συνεχίζει στο επόμενο tick. Κάθε παίκτης ξεκινάει το πολύ μία
+    # αναζήτηση ανά PATH_COOLDOWN_TICKS: ένα νεότερο κλικ στο μεταξύ απλώς αλλάζει τον στόχο που περιμένει
+    def process_path_requests(self):
+        pathfinder = self.pathfinder
+        started = self.path_started
+
+        for pid in list(self.path_requests):
+            last = started.get(pid)
+            if last is not None and self.tick - last < PATH_COOLDOWN_TICKS:
+                continue
+            tx, ty = self.path_requests.pop(pid)
+            if pid not in self.players:
+                continue
+            x, y = self.players.get(pid)
+            started[pid] = self.tick
+            self.path_searches[pid] = (pathfinder.search_world(x, y, tx, ty), tx, ty)
+
+        budget = PATH_EXPANSIONS_PER_TICK
+        for pid in list(self.path_searches):
+            search, tx, ty = self.path_searches[pid]
+            if not search.done:
+                if budget <= 0:
+                    continue    # Οι απαντήσεις από cache τελειώνουν και χωρίς budget
+                budget -= search.run(budget)
+                if not search.done:
+                    continue
+
+            del self.path_searches[pid]
+            waypoints = pathfinder.world_waypoints(search, tx, ty, PLAYER_WIDTH, PLAYER_HEIGHT)
+            if waypoints:
+                waypoints.reverse()
+                self.paths[pid] = waypoints
+                self.path_stuck[pid] = 0
+
+    # Ταχύτητα προς το επόμενο waypoint για κάθε παίκτη που ακολουθεί μονοπάτι
+    def follow_paths(self):
+        store = self.players
+        finished = []
+
+        for pid, waypoints in self.paths.items():
+            x, y = store.get(pid)
+
+            # Φτάσαμε στο waypoint → πάμε στο επόμενο
+            while waypoints and abs(waypoints[-1][0] - x) < 1e-6 and abs(waypoints[-1][1] - y) < 1e-6:
+                waypoints.pop()
+                self.path_stuck[pid] = 0
+
+            if not waypoints:
+                finished.append(pid)
+                continue
+
+            # Αν ο παίκτης δεν προχωράει (π.χ. τον μπλοκάρει άλλος παίκτης), κάποια στιγμή σταματάμε
+            self.path_stuck[pid] += 1
+            if self.path_stuck[pid] > PATH_STUCK_TICKS:
+                finished.append(pid)
+                continue
+
+            # Ίδιος κανόνας με τα πλήκτρα: μέχρι SPEED ανά άξονα, χωρίς να προσπεράσουμε το waypoint
+            tx, ty = waypoints[-1]
+            vx = max(-SPEED, min(SPEED, tx - x))
+            vy = max(-SPEED, min(SPEED, ty - y))
+            store.set_velocity(pid, vx, vy)
+
+        for pid in finished:
+            self.cancel_path(pid)
+            if pid in store:
+                store.set_velocity(pid, 0.0, 0.0)
+
+    # Κίνηση όλων των παικτών μαζί (clamp στα όρια του χάρτη και collision με τους τοίχους)
+    def simulate_players(self):
+        self.process_path_requests()
+        self.follow_paths()
+
+        moved = self.players.step(
+            self.collision_grid,
+            self.map.width,
+            self.map.height,
+            PLAYER_WIDTH,
+            PLAYER_HEIGHT
+        )
+
+        self.resolve_player_collisions(moved)
+
+    # Collision μεταξύ παικτών με τη σειρά των slots, μόνο για όσους κινήθηκαν σε αυτό το tick
+    def resolve_player_collisions(self, moved):
+        store = self.players
+        spatial = self.spatial
+
+        # Broad phase για όλους μαζί: ακριβής έλεγχος μόνο για όσους μπορεί να ακούμπησαν κάποιον, και μόνο
+        # με τους υποψήφιους που βρήκε (χωρίς queries στο spatial hash)
+        contacts = store.contacts(moved, PLAYER_WIDTH, PLAYER_HEIGHT, SPATIAL_CELL_SIZE) if PLAYER_COLLISION else {}
+
+        # Όσοι δεν έχουν ελεγχθεί ακόμα μετράνε στην παλιά τους θέση
+        waiting = {slot: (old_x, old_y) for slot, old_x, old_y in moved} if contacts else {}
+        xs = store.x.tolist()
+        ys = store.y.tolist()
+
+        for slot, old_x, old_y in moved:
+            pid = store.ids[slot]
+            x = xs[slot]
+            y = ys[slot]
+            waiting.pop(slot, None)
+
+            others = contacts.get(slot)
+            if others:
+                positions = [waiting.get(other) or (xs[other], ys[other]) for other in others]
+                x, y = self.unblocked_position(old_x, old_y, x, y, positions)
+                xs[slot] = store.x[slot] = x
+                ys[slot] = store.y[slot] = y
+
+            spatial.update(pid, x, y)
+
+            # Πρόοδος στο μονοπάτι
+            if pid in self.path_stuck and (x != old_x or y != old_y):
+                self.path_stuck[pid] = 0
+
+    # Η θέση που μπορεί να πάρει ο παίκτης χωρίς να μπει μέσα σε κάποιον από τους άλλους (θέσεις others)
+    def unblocked_position(self, old_x, old_y, x, y, others):
+        half_w = PLAYER_WIDTH / 2
+        half_h = PLAYER_HEIGHT / 2
+
+        def touching(cx, cy):
+            left = cx - half_w
+            right = cx + half_w
+            bottom = cy - half_h
+            top = cy + half_h
+            return [
+                k for k, (ox, oy) in enumerate(others)
+                if right > ox - half_w and left < ox + half_w and top > oy - half_h and bottom < oy + half_h
+            ]
+
+        # Παίκτες που ήδη τέμνονται (π.χ. ίδιο spawn) μπορούν να απομακρυνθούν μεταξύ τους
+        already = touching(old_x, old_y)
+
+        def blocked(cx, cy):
+            return any(k not in already for k in touching(cx, cy))
+
+        if not blocked(x, y):
+            return x, y     # Οι υποψήφιοι δεν ακουμπάνε πραγματικά (ή τέμνονταν ήδη)
+
+        # Δοκιμάζουμε κίνηση μόνο σε έναν άξονα (γλίστρημα πάνω στον άλλο παίκτη)
+        if x != old_x and not blocked(x, old_y):
+            return x, old_y
+
+        if y != old_y and not blocked(old_x, y) and not self.collides_with_walls(old_x, y):
+            return old_x, y
+
+        return old_x, old_y
+
+    # Παίκτες με κέντρο σε απόσταση ≤ radius από το (x, y)
+    def players_near(self, x, y, radius):
+        return self.spatial.query_radius(x, y, radius)
+
+    # Παίκτες με κέντρο μέσα στο ορθογώνιο
+    def players_in_rect(self, left, bottom, right, top):
+        return self.spatial.query_rect(left, bottom, right, top)
+
+    # Παίκτες που το κουτί τους ακουμπάει το ορθογώνιο
+    def players_touching(self, left, bottom, right, top):
+        half_w = PLAYER_WIDTH / 2
+        half_h = PLAYER_HEIGHT / 2
+        return self.spatial.query_rect(left - half_w, bottom - half_h, right + half_w, top + half_h)
+
+    # Πού ήταν ο παίκτης στο tick (δεκαδικό tick → interpolation), None αν δεν υπάρχει στο ιστορικό
+    def player_position_at(self, pid, tick):
+        return self.history.position_at(pid, tick)
+
+    def mob_position_at(self, mid, tick):
+        return self.mob_history.position_at(mid, tick)
+
+    def record_history(self):
+        self.history.record(self.tick)
+        self.mob_history.record(self.tick)
+
+    # Ένα βήμα προσομοίωσης: inputs → κίνηση παικτών → mobs
+    def step(self):
+        self.tick += 1
+        self.apply_pending_inputs()     # Batch εφαρμογή των inputs
+        self.simulate_players()         # Κίνηση με βάση τα πλήκτρα που κρατάνε οι παίκτες
+        self.mobs.step(self.tick)       # AI και κίνηση των mobs
+        self.record_history()           # Αντιγραφή των θέσεων στο ring buffer
+
+    # Η κατάσταση του κόσμου όπως τη βλέπουν οι clients
+    def snapshot(self):
+        return {
+            "tick": self.tick,
+            "tick_dt": self.tick_dt,                # Διάρκεια κάθε "tick"
+            "players": self.players.to_dict(),      # Κατάσταση των παικτών
+            "mobs": self.mobs.snapshot(),           # Κατάσταση των mobs
+        }
+
+    # Hash της κατάστασης (για έλεγχο ότι ένα replay καταλήγει στην ίδια κατάσταση)
+    def state_digest(self):
+        return hashlib.sha1(json.dumps(self.snapshot()).encode()).hexdigest()
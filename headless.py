@@ -0,0 +1,66 @@
+# Headless εκτέλεση του GameWorld χωρίς δίκτυο
+#
+# Τρέχει την προσομοίωση όσο πιο γρήγορα γίνεται με bots που αλλάζουν τυχαία πλήκτρα,
+# για capacity planning και γρήγορους ελέγχους:
+#     python headless.py --players 500 --ticks 5000
+#     python headless.py --players 2000 --empty 4096x4096
+
+import argparse
+import random
+import time
+from gameWorld import GameWorld
+from mapLoader import load_map, empty_map
+from inputState import KEY_MASK
+from mobSystem import MOB_COUNT
+
+# Bots: κάθε bot αλλάζει κατάσταση πλήκτρων κάθε λίγα ticks
+def run_bots(world, pids, ticks, change_every=25, seed=0):
+    rng = random.Random(seed)
+    seqs = dict.fromkeys(pids, 0)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for pid in pids:
+            if rng.randrange(change_every) == 0:
+                seqs[pid] += 1
+                world.apply_input(pid, {"seq": seqs[pid], "keys": rng.randrange(KEY_MASK + 1)})
+        world.step()
+
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless προσομοίωση του κόσμου")
+    parser.add_argument("--map", default="assets/maps/firstRegion.tmx")
+    parser.add_argument("--empty", default=None, help="Άδειος χάρτης WxH σε pixels αντί για TMX")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--mobs", type=int, default=MOB_COUNT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-numpy", action="store_true", help="Καθαρή Python αντί για NumPy store")
+    args = parser.parse_args()
+
+    if args.empty:
+        width, height = (int(v) for v in args.empty.lower().split("x"))
+        game_map = empty_map(width, height)
+    else:
+        game_map = load_map(args.map)
+
+    world = GameWorld(
+        game_map,
+        use_numpy=False if args.no_numpy else None,
+        mob_count=args.mobs,
+        seed=args.seed
+    )
+    pids = [f"bot-{i}" for i in range(args.players)]
+    for pid in pids:
+        world.connect(pid)
+
+    elapsed = run_bots(world, pids, args.ticks, seed=args.seed)
+    rate = args.ticks / elapsed if elapsed > 0 else float("inf")
+    realtime = rate * world.tick_dt
+
+    print(f"{args.players} players, {len(world.mobs)} mobs ({type(world.players).__name__}), {args.ticks} ticks in {elapsed:.3f}s")
+    print(f"{rate:.0f} ticks/s ({realtime:.1f}x real time), {elapsed / args.ticks * 1000:.3f} ms/tick")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Append-only δυαδικό journal με τα γεγονότα που φτάνουν στον server
+#
+# Κάθε εγγραφή: header (tick, τύπος, μήκος) + JSON payload. Το tick είναι το world.tick τη
+# στιγμή που έφτασε το γεγονός, δηλαδή το γεγονός εφαρμόζεται στο step() του tick + 1.
+# Στην αρχή του αρχείου γράφονται οι παράμετροι του κόσμου (χάρτης, seed, tick_dt, mobs)
+# ώστε το replay.py να ξαναφτιάξει τον ίδιο κόσμο, και κάθε λίγα ticks ένα digest της
+# κατάστασης για να βρίσκουμε σε ποιο σημείο αποκλίνει το replay.
+
+import json
+import struct
+
+MAGIC = b"GJNL"
+VERSION = 2     # 2: μόνο inputs που δέχτηκε ο κόσμος, χωρίς επανασυνδέσεις
+
+FILE_HEADER = struct.Struct("<4sHI")    # magic, version, μήκος JSON παραμέτρων
+RECORD_HEADER = struct.Struct("<IBI")   # tick, τύπος, μήκος payload
+
+# Τύποι εγγραφών
+CONNECT = 1
+DISCONNECT = 2
+INPUT = 3
+DIGEST = 4
+HANDOFF = 5     # Παίκτης που ήρθε από άλλη περιοχή
+
+DIGEST_INTERVAL = 250   # Κάθε πόσα ticks γράφουμε digest της κατάστασης (250 × 20ms = 5s)
+
+def _encode(payload):
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+class JournalWriter:
+    def __init__(self, path, params, digest_interval=DIGEST_INTERVAL):
+        self.file = open(path, "wb")
+        self.digest_interval = digest_interval
+        self.records = 0
+
+        meta = _encode(params)
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, len(meta)))
+        self.file.write(meta)
+
+    def write(self, tick, kind, payload):
+        data = _encode(payload)
+        self.file.write(RECORD_HEADER.pack(tick, kind, len(data)))
+        self.file.write(data)
+        self.records += 1
+
+    def connect(self, tick, pid):
+        self.write(tick, CONNECT, {"id": pid})
+
+    def disconnect(self, tick, pid):
+        self.write(tick, DISCONNECT, {"id": pid})
+
+    def handoff(self, tick, pid, x, y):
+        self.write(tick, HANDOFF, {"id": pid, "x": x, "y": y})
+
+    def input(self, tick, pid, msg):
+        self.write(tick, INPUT, {"id": pid, "msg": msg})
+
+    # Digest μετά το step() του tick (καλείται από το tick loop)
+    def after_step(self, world):
+        if world.tick % self.digest_interval == 0:
+            self.digest(world)
+
+    def digest(self, world):
+        self.write(world.tick, DIGEST, {"digest": world.state_digest()})
+        self.file.flush()
+
+    def close(self, world=None):
+        if self.file.closed:
+            return
+        if world is not None:
+            self.digest(world)      # Τελική κατάσταση για τον έλεγχο του replay
+        self.file.close()
+
+# Ανάγνωση: επιστρέφει (παράμετροι, iterator από (tick, τύπος, payload))
+def read_journal(path):
+    f = open(path, "rb")
+    magic, version, size = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        f.close()
+        raise ValueError(f"{path}: not a journal file (version {VERSION})")
+    params = json.loads(f.read(size))
+
+    def records():
+        with f:
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return      # Τέλος αρχείου (ή κομμένη τελευταία εγγραφή μετά από crash)
+                tick, kind, size = RECORD_HEADER.unpack(header)
+                data = f.read(size)
+                if len(data) < size:
+                    return
+                yield tick, kind, json.loads(data)
+
+    return params, records()
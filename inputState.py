@@ -0,0 +1,19 @@
+# Κοινό πρωτόκολλο input για client και server
+#
+# Ο client δεν στέλνει πια μία εντολή κίνησης ανά frame, αλλά την κατάσταση των πλήκτρων
+# που κρατάει πατημένα (bitmask) μαζί με έναν αύξοντα αριθμό (seq):
+#     {"id": pid, "seq": 12, "keys": UP | LEFT}
+# Ο server κρατάει την τελευταία κατάσταση κάθε παίκτη και την εφαρμόζει μία φορά ανά tick.
+
+KEY_UP    = 1
+KEY_DOWN  = 2
+KEY_LEFT  = 4
+KEY_RIGHT = 8
+
+KEY_MASK = KEY_UP | KEY_DOWN | KEY_LEFT | KEY_RIGHT
+
+# Μετατροπή bitmask σε κατεύθυνση (dx, dy) με τιμές -1, 0, 1
+def keys_to_direction(keys):
+    dx = (1 if keys & KEY_RIGHT else 0) - (1 if keys & KEY_LEFT else 0)
+    dy = (1 if keys & KEY_UP else 0) - (1 if keys & KEY_DOWN else 0)
+    return dx, dy
@@ -0,0 +1,115 @@
+# Jitter buffer για το interpolation των οντοτήτων στον client
+#
+# Κάθε οντότητα κρατάει τις τελευταίες θέσεις της με τον χρόνο του server (tick × tick_dt), και
+# ζωγραφίζεται σε χρόνο render = τωρινός χρόνος του server (clockSync.py) - delay, ανάμεσα στα δύο
+# snapshots γύρω από αυτόν. Έτσι ένα πακέτο που αργεί λίγο δεν φαίνεται, αρκεί να έρθει πριν το χρειαστούμε.
+#
+# Το delay προσαρμόζεται στο jitter που μετράμε: για κάθε μήνυμα η "διαδρομή" (χρόνος άφιξης στο ρολόι
+# του server - χρόνος του snapshot) και η μεταβολή της από μήνυμα σε μήνυμα (εκτίμηση όπως στο RTP,
+# RFC 3550). Delay = απόσταση ανάμεσα στα snapshots της ροής + JITTER_K × jitter: ανεβαίνει γρήγορα όταν
+# το δίκτυο χειροτερεύει και κατεβαίνει αργά. Κάθε tier του area of interest έχει δικό του delay (η
+# μακρινή ροή στέλνει κάθε FAR_EVERY ticks).
+#
+# Τα deltas περιέχουν μόνο όσες οντότητες άλλαξαν: μια οντότητα που ξεκινάει να κινείται μετά από ώρα
+# παίρνει και τη θέση της στο base tick του μηνύματος, αλλιώς το interpolation θα την έσερνε από το
+# τελευταίο παλιό snapshot. Μετά το τελευταίο snapshot μένει ακίνητη (χωρίς extrapolation).
+
+from collections import deque
+
+BUFFER_SNAPSHOTS = 16       # Θέσεις ανά οντότητα
+JITTER_GAIN = 1 / 16        # Βάρος κάθε νέας μέτρησης στο jitter (RFC 3550)
+JITTER_K = 3.0              # Πόσα "jitter" περιθώριο πάνω από την απόσταση των snapshots
+MIN_DELAY = 0.05            # Όρια του delay (δευτερόλεπτα)
+MAX_DELAY = 0.5
+DELAY_UP = 0.2              # Μέρος της διαφοράς προς τον στόχο ανά μήνυμα όταν το delay ανεβαίνει
+DELAY_DOWN = 0.005          # ... και όταν κατεβαίνει
+
+class AdaptiveDelay:
+    def __init__(self, interval):
+        self.interval = interval    # Απόσταση ανάμεσα στα snapshots της ροής (δευτερόλεπτα)
+        self.jitter = 0.0
+        self.last_transit = None
+        self.delay = max(MIN_DELAY, min(MAX_DELAY, 2 * interval))
+
+    # Μήνυμα με snapshot στο snapshot_time που έφτασε στο arrival (και τα δύο στο ρολόι του server)
+    def on_arrival(self, snapshot_time, arrival):
+        transit = arrival - snapshot_time
+        if self.last_transit is not None:
+            self.jitter += (abs(transit - self.last_transit) - self.jitter) * JITTER_GAIN
+        self.last_transit = transit
+
+        target = max(MIN_DELAY, min(MAX_DELAY, self.interval + JITTER_K * self.jitter))
+        gain = DELAY_UP if target > self.delay else DELAY_DOWN
+        self.delay += (target - self.delay) * gain
+
+    # Νέα εκτίμηση ρολογιού: οι παλιές διαδρομές δεν συγκρίνονται με τις νέες
+    def reset_transit(self):
+        self.last_transit = None
+
+class JitterBuffer:
+    def __init__(self, intervals):
+        self.delays = {tier: AdaptiveDelay(interval) for tier, interval in intervals.items()}
+        self.entities = {}      # id → deque από (χρόνος, x, y)
+        self.tiers = {}         # id → tier της ροής από την οποία ήρθε το τελευταίο snapshot
+
+    # Οντότητες που άλλαξαν σε ένα μήνυμα της ροής (tier): positions = {id: {"x", "y"}}
+    def push(self, tier, time, base_time, positions):
+        entities = self.entities
+        for eid, pos in positions.items():
+            samples = entities.get(eid)
+            if samples is None:
+                samples = entities[eid] = deque(maxlen=BUFFER_SNAPSHOTS)
+            elif base_time is not None and samples[-1][0] < base_time:
+                _, x, y = samples[-1]
+                samples.append((base_time, x, y))   # Ήταν ακίνητη μέχρι το base tick
+            if samples and samples[-1][0] >= time:
+                continue    # Ίδιο tick από δεύτερη ροή (αλλαγή κελιού ή tier)
+            samples.append((time, pos["x"], pos["y"]))
+            self.tiers[eid] = tier
+
+    def on_arrival(self, tier, snapshot_time, arrival):
+        delay = self.delays.get(tier)
+        if delay is not None:
+            delay.on_arrival(snapshot_time, arrival)
+
+    def reset_transit(self):
+        for delay in self.delays.values():
+            delay.reset_transit()
+
+    def remove(self, eid):
+        self.entities.pop(eid, None)
+        self.tiers.pop(eid, None)
+
+    def clear(self):
+        self.entities.clear()
+        self.tiers.clear()
+
+    # Θέση της οντότητας για την οθόνη, None αν δεν έχουμε κανένα snapshot
+    def sample(self, eid, server_now):
+        samples = self.entities.get(eid)
+        if not samples:
+            return None
+
+        delay = self.delays.get(self.tiers.get(eid))
+        render_time = server_now - (delay.delay if delay is not None else MIN_DELAY)
+
+        # Μετά το τελευταίο snapshot: στέκεται εκεί (ή δεν έχει έρθει ακόμα το επόμενο)
+        t1, x1, y1 = samples[-1]
+        if render_time >= t1:
+            return x1, y1
+
+        # Πριν το πρώτο: στο πρώτο
+        t0, x0, y0 = samples[0]
+        if render_time <= t0:
+            return x0, y0
+
+        # Τα snapshots πριν το ζεύγος γύρω από το render_time δεν θα χρειαστούν ξανά
+        while len(samples) > 2 and samples[1][0] <= render_time:
+            samples.popleft()
+
+        t0, x0, y0 = samples[0]
+        t1, x1, y1 = samples[1]
+        if t1 <= t0:
+            return x1, y1
+        alpha = (render_time - t0) / (t1 - t0)
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
@@ -0,0 +1,29 @@
+# Offline μετατροπή χαρτών TMX σε compiled αρχεία (.mapbin) για τον server
+#
+# Μόνο αυτό το βήμα χρειάζεται arcade. Ο server καλεί αυτόματα το mapCompiler όταν το TMX
+# είναι νεότερο από το compiled αρχείο, αλλά μπορεί να τρέξει και χειροκίνητα (π.χ. στο build):
+#     python mapCompiler.py                          # Όλοι οι χάρτες του πίνακα περιοχών
+#     python mapCompiler.py assets/maps/firstRegion.tmx
+
+import argparse
+import time
+from mapLoader import compile_map
+from regions import REGIONS
+
+def main():
+    parser = argparse.ArgumentParser(description="Μετατροπή TMX σε compiled χάρτες")
+    parser.add_argument("maps", nargs="*", help="Αρχεία TMX (προεπιλογή: οι χάρτες όλων των περιοχών)")
+    parser.add_argument("-o", "--output", default=None, help="Αρχείο εξόδου (μόνο με ένα TMX)")
+    args = parser.parse_args()
+
+    maps = args.maps or sorted({region.map_path for region in REGIONS.values()})
+    if args.output and len(maps) != 1:
+        parser.error("--output needs exactly one TMX file")
+
+    for tmx_path in maps:
+        start = time.perf_counter()
+        out_path = compile_map(tmx_path, args.output)
+        print(f"{tmx_path} → {out_path} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# Φόρτωση χάρτη για τον server
+#
+# Από το TMX κρατάμε μόνο ό,τι χρειάζεται η προσομοίωση: πλέγμα collision από το Walls layer,
+# διαστάσεις χάρτη, τα σημεία spawn (παικτών και mobs) και τις μεταβάσεις σε άλλες περιοχές
+# από το Object layer.
+#
+# Ο server δεν διαβάζει το TMX: το mapCompiler.py (με arcade) το μετατρέπει μία φορά σε compiled
+# αρχείο (.mapbin) που φορτώνεται με mmap. Αν το TMX αλλάξει, το load_map το ξαναχτίζει σε
+# ξεχωριστό process ώστε ο server να μη φορτώνει ποτέ το arcade.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+from collisionGrid import CollisionGrid
+from regions import Transition
+
+TILE_SCALING = 1.0                      # Scale Πλακιδίων
+
+MAGIC = b"GMAP"
+VERSION = 1
+COMPILED_EXT = ".mapbin"
+
+# magic, version, πλάτος, ύψος, πλάτος/ύψος πλακιδίου, στήλες, γραμμές,
+# mtime και μέγεθος του TMX, sha1 του TMX, πλήθος επιπλέον τοίχων, μήκος JSON μεταδεδομένων
+HEADER = struct.Struct("<4sHddIIIIQQ20sII")
+MTIME = struct.Struct("<Q")
+MTIME_OFFSET = struct.calcsize("<4sHddIIII")    # Θέση του mtime μέσα στο header
+WALL = struct.Struct("<dddd")
+
+class GameMap:
+    def __init__(self, collision_grid, width, height, tile_width, tile_height, spawn_points, mob_spawns=None, transitions=None):
+        self.collision_grid = collision_grid
+        self.width = width                  # Πλάτος χάρτη σε pixels
+        self.height = height                # Ύψος χάρτη σε pixels
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.spawn_points = spawn_points    # Λίστα (x, y) για το spawn παικτών
+        self.mob_spawns = mob_spawns or []  # Λίστα (x, y) για το spawn των mobs (προαιρετικά)
+        self.transitions = transitions or []    # Μεταβάσεις (Transition) προς άλλες περιοχές
+
+# Άδειος χάρτης χωρίς τοίχους (για headless δοκιμές χωρίς assets)
+def empty_map(width, height, tile_width=32, tile_height=32, spawn_spacing=96):
+    collision_grid = CollisionGrid([], width, height, tile_width, tile_height)
+
+    # Σημεία spawn σε πλέγμα ώστε οι παίκτες να μην ξεκινάνε ο ένας πάνω στον άλλο
+    spawn_points = [
+        (x, y)
+        for y in range(spawn_spacing, height - spawn_spacing + 1, spawn_spacing)
+        for x in range(spawn_spacing, width - spawn_spacing + 1, spawn_spacing)
+    ] or [(width / 2, height / 2)]
+
+    return GameMap(collision_grid, width, height, tile_width, tile_height, spawn_points)
+
+# Φόρτωση χάρτη από το tiled
+def load_tmx_map(path):
+    import arcade   # Το arcade χρειάζεται μόνο για την ανάγνωση του TMX
+
+    tile_map = arcade.load_tilemap(
+        path,
+        scaling=TILE_SCALING,
+        use_spatial_hash=True           # Το collision γίνεται μόνο με κοντινά αντικείμενα (βελτίωση απόδοσης)
+    )
+
+    wall_list = tile_map.sprite_lists["Walls"]  # Παίρνουμε το walls layer του tiled για να βάλουμε collision μόνο σε αυτά
+
+    # Διαστάσεις χάρτη σε pixels
+    width = tile_map.width * tile_map.tile_width
+    height = tile_map.height * tile_map.tile_height
+
+    # Πλέγμα collision: χτίζεται μία φορά από τα ορθογώνια των walls
+    collision_grid = CollisionGrid(
+        [(wall.left, wall.bottom, wall.right, wall.top) for wall in wall_list],
+        width,
+        height,
+        tile_map.tile_width,
+        tile_map.tile_height
+    )
+
+    object_layer = tile_map.object_lists.get("Object")  # Παίρνουμε το object layer για το spawn
+
+    if not object_layer:
+        raise RuntimeError("No Object layer found in TMX map")
+
+    spawn_points = []
+    mob_spawns = []
+    transitions = []
+    for obj in object_layer:
+        if obj.name == "player_spawn":  # Για κάθε object με το όνομα player_spawn (έτσι έχει ονομαστεί στο tiled), προσθέτουμε το σημείο στη λίστα
+            x, y = obj.shape
+            spawn_points.append((x, y))
+        elif obj.name == "mob_spawn":   # Σημεία για τα mobs (αν δεν υπάρχουν, τα mobs μπαίνουν σε τυχαία ελεύθερα πλακίδια)
+            x, y = obj.shape
+            mob_spawns.append((x, y))
+        elif obj.name == "transition":  # Ορθογώνιο που στέλνει τον παίκτη σε άλλη περιοχή (properties: region, x, y)
+            xs = [p[0] for p in obj.shape]
+            ys = [p[1] for p in obj.shape]
+            props = obj.properties or {}
+            transitions.append(Transition(
+                min(xs), min(ys), max(xs), max(ys),
+                props["region"],
+                props.get("x"),
+                props.get("y")
+            ))
+
+    if not spawn_points:
+        raise RuntimeError("No player_spawn objects found in Object layer")
+
+    return GameMap(
+        collision_grid,
+        width,
+        height,
+        tile_map.tile_width,
+        tile_map.tile_height,
+        spawn_points,
+        mob_spawns,
+        transitions
+    )
+
+# Το compiled αρχείο που αντιστοιχεί σε ένα TMX
+def compiled_path(tmx_path):
+    return os.path.splitext(tmx_path)[0] + COMPILED_EXT
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+# TMX → compiled αρχείο (χρειάζεται arcade, τρέχει από το mapCompiler.py)
+def compile_map(tmx_path, out_path=None):
+    out_path = out_path or compiled_path(tmx_path)
+    game_map = load_tmx_map(tmx_path)
+    grid = game_map.collision_grid
+    stat = os.stat(tmx_path)
+
+    walls = grid.extra_walls()
+    meta = json.dumps({
+        "spawn_points": game_map.spawn_points,
+        "mob_spawns": game_map.mob_spawns,
+        "transitions": [
+            {"rect": t.rect, "region": t.region, "x": t.x, "y": t.y}
+            for t in game_map.transitions
+        ],
+    }).encode()
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION, game_map.width, game_map.height, grid.tile_width, grid.tile_height,
+        grid.cols, grid.rows, stat.st_mtime_ns, stat.st_size, _file_hash(tmx_path), len(walls), len(meta)
+    )]
+    parts.append(bytes(grid.solid))
+    parts.extend(WALL.pack(*rect) for rect in walls)
+    parts.append(meta)
+
+    # Ατομική αντικατάσταση ώστε ένας server που ξεκινάει να μη δει μισογραμμένο αρχείο
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp, out_path)
+    return out_path
+
+# Φόρτωση compiled χάρτη μέσω mmap (χωρίς arcade)
+def load_compiled_map(path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        (magic, version, width, height, tile_width, tile_height, cols, rows,
+         _, _, _, wall_count, meta_size) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a compiled map (version {VERSION})")
+
+        offset = HEADER.size
+        solid = buf[offset:offset + cols * rows]
+        offset += cols * rows
+
+        walls = [WALL.unpack_from(buf, offset + i * WALL.size) for i in range(wall_count)]
+        offset += wall_count * WALL.size
+
+        meta = json.loads(buf[offset:offset + meta_size])
+
+    collision_grid = CollisionGrid.from_solid(solid, walls, width, height, tile_width, tile_height)
+    transitions = [Transition(*t["rect"], t["region"], t["x"], t["y"]) for t in meta["transitions"]]
+
+    return GameMap(
+        collision_grid,
+        width,
+        height,
+        tile_width,
+        tile_height,
+        [tuple(p) for p in meta["spawn_points"]],
+        [tuple(p) for p in meta["mob_spawns"]],
+        transitions
+    )
+
+# Ισχύει ακόμα το compiled αρχείο για το TMX; (πρώτα mtime/μέγεθος, μετά hash αν άλλαξε το mtime)
+def compiled_is_fresh(tmx_path, path):
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+
+    fields = HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return False
+
+    mtime_ns, size, digest = fields[8], fields[9], fields[10]
+    stat = os.stat(tmx_path)
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime_ns:
+        return True
+    if _file_hash(tmx_path) != digest:
+        return False
+
+    # Ίδιο περιεχόμενο με νέο mtime (checkout, copy): γράφουμε το νέο mtime ώστε το hash να μη
+    # ξαναϋπολογίζεται σε κάθε φόρτωση. Αν το αρχείο δεν γράφεται (read-only deploy), απλώς συνεχίζουμε
+    try:
+        with open(path, "r+b") as f:
+            f.seek(MTIME_OFFSET)
+            f.write(MTIME.pack(stat.st_mtime_ns))
+    except OSError:
+        pass
+    return True
+
+# Χάρτης για τον server: compiled αρχείο, που ξαναχτίζεται σε subprocess όταν το TMX είναι νεότερο
+def load_map(tmx_path):
+    path = compiled_path(tmx_path)
+
+    # Χωρίς TMX (π.χ. deploy μόνο με compiled χάρτες) φορτώνουμε ό,τι υπάρχει
+    if os.path.exists(tmx_path) and not compiled_is_fresh(tmx_path, path):
+        print(f"Compiling {tmx_path} → {path}")
+        compiler = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mapCompiler.py")
+        subprocess.run([sys.executable, compiler, tmx_path, "-o", path], check=True)
+
+    return load_compiled_map(path)
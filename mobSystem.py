@@ -0,0 +1,197 @@
+# Mobs (NPCs) που ελέγχει ο server
+#
+# Η κατάσταση των mobs ζει σε πίνακες: θέσεις/ταχύτητες στο ίδιο structure-of-arrays store
+# με τους παίκτες (vectorized κίνηση και collision με τους τοίχους όταν υπάρχει NumPy),
+# και σπίτι/κατάσταση/στόχος σε παράλληλους πίνακες ανά slot.
+#
+# Η κίνηση γίνεται για όλα τα mobs σε κάθε tick, ενώ οι "ακριβές" αποφάσεις (αναζήτηση
+# κοντινού παίκτη, wandering, leashing) μοιράζονται σε ticks: κάθε mob αποφασίζει μία φορά
+# κάθε DECISION_INTERVAL ticks, οπότε σε κάθε tick δουλεύει μόνο ένα κομμάτι των mobs.
+
+import math
+from array import array
+from entityStore import make_player_store
+
+# Διαστάσεις mob
+MOB_WIDTH  = 32
+MOB_HEIGHT = 32
+
+MOB_SPEED = 3               # Pixels ανά tick (πιο αργά από τον παίκτη)
+MOB_COUNT = 50              # Πόσα mobs μπαίνουν αν ο χάρτης δεν έχει σημεία mob_spawn
+
+DECISION_INTERVAL = 10      # Κάθε πόσα ticks αποφασίζει ένα mob (staggered)
+AGGRO_RADIUS = 200          # Απόσταση στην οποία ένα mob κυνηγάει παίκτη
+LOSE_RADIUS = 300           # Απόσταση στην οποία χάνει τον στόχο του
+LEASH_RADIUS = 400          # Μέγιστη απόσταση από το σπίτι πριν γυρίσει πίσω
+ARRIVE_RADIUS = MOB_SPEED * DECISION_INTERVAL  # Απόσταση στην οποία θεωρούμε ότι έφτασε στο σπίτι
+
+# Καταστάσεις AI
+IDLE   = 0
+WANDER = 1
+CHASE  = 2
+RETURN = 3
+
+# Οι 8 κατευθύνσεις για το wandering
+WANDER_DIRECTIONS = [
+    (math.cos(i * math.pi / 4), math.sin(i * math.pi / 4)) for i in range(8)
+]
+
+class MobSystem:
+    def __init__(self, world, use_numpy=None):
+        self.world = world
+        self.store = make_player_store(use_numpy)   # Θέσεις/ταχύτητες (ίδιο backend με τους παίκτες)
+
+        # Παράλληλοι πίνακες ανά slot του store
+        self.home_x = array("d")
+        self.home_y = array("d")
+        self.state = bytearray()
+        self.target = []            # pid του παίκτη που κυνηγάει (ή None)
+
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.store)
+
+    # Δημιουργία mob στο σημείο (x, y), που γίνεται και το "σπίτι" του
+    def spawn(self, x, y):
+        mid = f"m{self.next_id}"
+        self.next_id += 1
+
+        slot = self.store.add(mid, x, y)
+        while len(self.state) <= slot:
+            self.home_x.append(0.0)
+            self.home_y.append(0.0)
+            self.state.append(IDLE)
+            self.target.append(None)
+
+        self.home_x[slot] = x
+        self.home_y[slot] = y
+        self.state[slot] = IDLE
+        self.target[slot] = None
+        return mid
+
+    def despawn(self, mid):
+        slot = self.store.slot_of(mid)
+        if slot is not None:
+            self.target[slot] = None
+        self.store.remove(mid)
+
+    # Spawn στα σημεία mob_spawn του χάρτη, αλλιώς σε τυχαία ελεύθερα σημεία
+    def populate(self, count=MOB_COUNT):
+        game_map = self.world.map
+        if game_map.mob_spawns:
+            for x, y in game_map.mob_spawns:
+                self.spawn(x, y)
+            return
+
+        grid = self.world.collision_grid
+        rng = self.world.rng
+        attempts = count * 20
+
+        while len(self.store) < count and attempts > 0:
+            attempts -= 1
+            x = rng.uniform(MOB_WIDTH / 2, game_map.width - MOB_WIDTH / 2)
+            y = rng.uniform(MOB_HEIGHT / 2, game_map.height - MOB_HEIGHT / 2)
+            if not grid.collides(x, y, MOB_WIDTH, MOB_HEIGHT):
+                self.spawn(x, y)
+
+    # Ταχύτητα προς ένα σημείο
+    def _aim(self, slot, x, y, tx, ty):
+        dx = tx - x
+        dy = ty - y
+        dist = math.hypot(dx, dy)
+        if dist < 1e-6:
+            self.store.vx[slot] = 0.0
+            self.store.vy[slot] = 0.0
+            return
+
+        self.store.vx[slot] = dx / dist * MOB_SPEED
+        self.store.vy[slot] = dy / dist * MOB_SPEED
+
+    def _stop(self, slot):
+        self.store.vx[slot] = 0.0
+        self.store.vy[slot] = 0.0
+
+    # Απόφαση AI για ένα mob (wander, aggro, leash)
+    def decide(self, slot):
+        store = self.store
+        spatial = self.world.spatial
+        rng = self.world.rng
+
+        x = float(store.x[slot])
+        y = float(store.y[slot])
+        hx = self.home_x[slot]
+        hy = self.home_y[slot]
+        home_d2 = (x - hx) ** 2 + (y - hy) ** 2
+        state = self.state[slot]
+
+        # Leash: αν απομακρύνθηκε πολύ από το σπίτι, γυρίζει πίσω και ξεχνάει τον στόχο
+        if state != RETURN and home_d2 > LEASH_RADIUS * LEASH_RADIUS:
+            state = RETURN
+            self.target[slot] = None
+
+        if state == RETURN:
+            if home_d2 <= ARRIVE_RADIUS * ARRIVE_RADIUS:
+                state = IDLE
+                self._stop(slot)
+            else:
+                self._aim(slot, x, y, hx, hy)
+            self.state[slot] = state
+            return
+
+        # Aggro: κρατάμε τον τρέχοντα στόχο όσο είναι κοντά, αλλιώς ψάχνουμε τον πλησιέστερο παίκτη
+        target = self.target[slot]
+        if target is not None and target in spatial:
+            tx, ty = spatial.position(target)
+            if (tx - x) ** 2 + (ty - y) ** 2 > LOSE_RADIUS * LOSE_RADIUS:
+                target = None
+        else:
+            target = None
+
+        if target is None:
+            target = spatial.nearest(x, y, AGGRO_RADIUS)
+
+        self.target[slot] = target
+
+        if target is not None:
+            state = CHASE
+            tx, ty = spatial.position(target)
+            self._aim(slot, x, y, tx, ty)
+
+        # Wandering γύρω από το σπίτι
+        elif state == WANDER and rng.random() < 0.3:
+            state = IDLE
+            self._stop(slot)
+        elif state != WANDER and rng.random() < 0.3:
+            state = WANDER
+            dx, dy = WANDER_DIRECTIONS[rng.randrange(8)]
+            self.store.vx[slot] = dx * MOB_SPEED
+            self.store.vy[slot] = dy * MOB_SPEED
+        elif state == CHASE:
+            state = IDLE
+            self._stop(slot)
+
+        self.state[slot] = state
+
+    # Ένα tick: αποφάσεις για ένα κομμάτι των mobs, κίνηση για όλα
+    def step(self, tick):
+        store = self.store
+        alive = store.alive
+
+        # Staggered αποφάσεις: σε κάθε tick αποφασίζουν τα slots με slot % DECISION_INTERVAL == tick % DECISION_INTERVAL
+        for slot in range(tick % DECISION_INTERVAL, store.high, DECISION_INTERVAL):
+            if alive[slot]:
+                self.decide(slot)
+
+        # Κίνηση/clamp/collision για όλα τα mobs μαζί
+        store.step(
+            self.world.collision_grid,
+            self.world.map.width,
+            self.world.map.height,
+            MOB_WIDTH,
+            MOB_HEIGHT
+        )
+
+    # Η κατάσταση των mobs όπως τη στέλνουμε στους clients
+    def snapshot(self):
+        return self.store.to_dict()
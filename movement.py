@@ -0,0 +1,32 @@
+# Κανόνες κίνησης του παίκτη, κοινοί για τον server και τον client
+#
+# Ο server (GameWorld, entityStore) κινεί τους παίκτες με αυτούς τους κανόνες, και ο client τους
+# χρησιμοποιεί για να προβλέψει τη δική του κίνηση πριν απαντήσει ο server (prediction.py). Ό,τι αλλάζει
+# εδώ αλλάζει και στις δύο πλευρές, οπότε η πρόβλεψη συμφωνεί με τον server εκτός από ό,τι ξέρει μόνο
+# εκείνος (άλλοι παίκτες, μονοπάτια click-to-move). Χωρίς εξαρτήσεις από arcade/NumPy/ZeroMQ.
+
+from inputState import keys_to_direction
+
+# Διαστάσεις παίκτη
+PLAYER_WIDTH  = 32
+PLAYER_HEIGHT = 48
+
+SPEED = 5           # Ταχύτητα κίνησης του παίκτη (pixels ανά tick)
+
+# Ταχύτητα (pixels ανά tick) για μια κατάσταση πλήκτρων
+def velocity(keys):
+    dx, dy = keys_to_direction(keys)
+    return dx * SPEED, dy * SPEED
+
+# Ένα tick κίνησης: clamp στα όρια του χάρτη και collision με τους τοίχους, πρώτα στον x και μετά στον y
+def move(grid, x, y, vx, vy, map_width, map_height, width=PLAYER_WIDTH, height=PLAYER_HEIGHT):
+    half_w = width / 2
+    half_h = height / 2
+    new_x = max(half_w, min(x + vx, map_width - half_w))
+    new_y = max(half_h, min(y + vy, map_height - half_h))
+
+    if not grid.collides(new_x, y, width, height):
+        x = new_x
+    if not grid.collides(x, new_y, width, height):
+        y = new_y
+    return x, y
@@ -0,0 +1,120 @@
+# Processes δικτύου για τη λειτουργία πολλών processes του server (server.py --processes)
+#
+# Ingress: PULL και control (ROUTER) sockets, αποκωδικοποίηση inputs → ring εισόδου προς την προσομοίωση,
+# και οι απαντήσεις control από το ring απαντήσεων πίσω στους clients (με το identity τους).
+# Egress: ring καταστάσεων (ανά κελί) από την προσομοίωση → κωδικοποίηση (wireProtocol) → XPUB, και η ροή
+# των spectators όσο κάποιος έχει κάνει subscribe σε αυτήν.
+# Η προσομοίωση βλέπει μόνο marshal (γρήγορο, σε C) και δεν αγγίζει καθόλου sockets ή JSON.
+
+import json
+import marshal
+import time
+import zmq
+from sharedRing import SharedRing
+from areaOfInterest import CellEncoders, stream_topic
+from spectatorStream import SpectatorStream
+from wireProtocol import encode_json, decode_input, STATE_BINARY, STATE_JSON, SPECTATOR_TOPIC
+
+# Τύποι μηνυμάτων στο ring εισόδου
+INPUT = 0
+CONTROL = 1
+
+REPLY_POLL_MS = 1       # Πόσο συχνά κοιτάμε για απαντήσεις control από την προσομοίωση
+EGRESS_IDLE = 0.001     # Αναμονή του egress όταν δεν υπάρχει νέα κατάσταση
+
+def ingress_worker(input_name, reply_name, pull_addr, control_addr):
+    inputs = SharedRing.attach(input_name)
+    replies = SharedRing.attach(reply_name)
+
+    ctx = zmq.Context()
+    pull_socket = ctx.socket(zmq.PULL)
+    pull_socket.bind(pull_addr)
+    control_socket = ctx.socket(zmq.ROUTER)
+    control_socket.bind(control_addr)
+
+    poller = zmq.Poller()
+    poller.register(pull_socket, zmq.POLLIN)
+    poller.register(control_socket, zmq.POLLIN)
+
+    try:
+        while True:
+            # Οι απαντήσεις της προσομοίωσης έρχονται από το ring, οπότε ξυπνάμε συχνά και χωρίς νέα αιτήματα
+            events = dict(poller.poll(REPLY_POLL_MS))
+
+            # Όλα τα inputs που έχουν φτάσει, χωρίς να μπλοκάρουμε
+            if pull_socket in events:
+                while True:
+                    try:
+                        raw = pull_socket.recv(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    msg = decode_input(raw)
+                    if msg is not None:
+                        inputs.put(marshal.dumps((INPUT, msg)))
+
+            # Αιτήματα control: προωθούνται με το identity του client, η απάντηση έρχεται όποτε είναι έτοιμη
+            if control_socket in events:
+                while True:
+                    try:
+                        frames = control_socket.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    identity = frames[0]
+                    try:
+                        msg = json.loads(frames[-1])
+                    except ValueError:
+                        msg = None
+
+                    if not isinstance(msg, dict):
+                        reply = {"status": "error", "reason": "bad request"}
+                    elif inputs.put(marshal.dumps((CONTROL, (identity, msg)))):
+                        continue
+                    else:
+                        reply = {"status": "error", "reason": "busy", "req": msg.get("req")}
+                    control_socket.send_multipart([identity, b"", json.dumps(reply).encode()])
+
+            for data in replies.drain():
+                identity, reply = marshal.loads(data)
+                control_socket.send_multipart([identity, b"", json.dumps(reply).encode()])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ctx.destroy(linger=0)
+        inputs.close()
+        replies.close()
+
+def egress_worker(state_name, pub_addr, scale, spectator_every):
+    states = SharedRing.attach(state_name)
+    encoders = CellEncoders(scale)
+    spectators = SpectatorStream(spectator_every)
+
+    ctx = zmq.Context()
+    pub_socket = ctx.socket(zmq.XPUB)
+    pub_socket.setsockopt(zmq.XPUB_VERBOSE, 1)     # Κάθε subscribe (κάθε νέος spectator θέλει keyframe)
+    pub_socket.bind(pub_addr)
+
+    try:
+        while True:
+            # Subscriptions (1/0 + topic) που έφτασαν στο μεταξύ
+            while True:
+                try:
+                    spectators.on_subscription(pub_socket.recv(zmq.NOBLOCK))
+                except zmq.Again:
+                    break
+
+            data = states.get()
+            if data is None:
+                time.sleep(EGRESS_IDLE)
+                continue
+            messages, json_needed, spectator = marshal.loads(data)
+            for stream, state in messages:
+                pub_socket.send_multipart([stream_topic(STATE_BINARY, stream), encoders[stream].encode(state)])
+                if json_needed:
+                    pub_socket.send_multipart([stream_topic(STATE_JSON, stream), encode_json(state)])
+            if spectator is not None and spectators.watching:
+                pub_socket.send_multipart([SPECTATOR_TOPIC, spectators.encode(*spectator)])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ctx.destroy(linger=0)
+        states.close()
@@ -0,0 +1,421 @@
+# Pathfinding (A*) πάνω στο πλέγμα πλακιδίων του χάρτη
+#
+# Ένα πλακίδιο είναι "βατό" αν το κουτί του παίκτη χωράει με κέντρο το κέντρο του πλακιδίου
+# (υπολογίζεται μία φορά από το CollisionGrid).
+#
+# Δύο επίπεδα: ο χάρτης χωρίζεται σε clusters CLUSTER_SIZE × CLUSTER_SIZE πλακιδίων και κάθε cluster
+# σε περιοχές (βατά πλακίδια που ενώνονται μέσα στο cluster). Ένα αίτημα λύνεται πρώτα στον γράφο των
+# περιοχών (λίγες εκατοντάδες κόμβοι): αν ο στόχος είναι σε άλλο συνεκτικό κομμάτι του χάρτη η απάντηση
+# είναι αμέσως "όχι", αλλιώς το A* στα πλακίδια ψάχνει μόνο μέσα στον διάδρομο των περιοχών του
+# χονδρικού μονοπατιού (και των γειτόνων τους). Έτσι και τα μεγάλα μονοπάτια σε μεγάλους χάρτες έχουν
+# κόστος ανάλογο με το μήκος τους, και κανένα αίτημα δεν ψάχνει όλο τον χάρτη.
+#
+# Η αναζήτηση στα πλακίδια (PathSearch) μπορεί να σταματήσει και να συνεχίσει: ο κόσμος της δίνει
+# έναν αριθμό επεκτάσεων ανά tick για όλα τα αιτήματα μαζί (gameWorld.py).
+#
+# Τα μονοπάτια κρατιούνται σε LRU cache: ίδιο αίτημα → ίδιο μονοπάτι, και αίτημα από σημείο
+# που βρίσκεται ήδη πάνω σε αποθηκευμένο μονοπάτι προς τον ίδιο στόχο → το υπόλοιπο μονοπάτι.
+# Τα αιτήματα χωρίς μονοπάτι μένουν σε δική τους cache, με την έκδοση του χάρτη στο key.
+
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+
+CLUSTER_SIZE = 16           # Πλακίδια ανά πλευρά cluster για το χονδρικό επίπεδο
+PATH_CACHE_SIZE = 256       # Πόσα μονοπάτια κρατάει η LRU cache
+FAILURE_CACHE_SIZE = 1024   # Πόσα αιτήματα χωρίς μονοπάτι θυμόμαστε
+GOAL_SEARCH_RADIUS = 3      # Σε πόσα πλακίδια ψάχνουμε βατό στόχο αν ο στόχος είναι τοίχος
+
+SQRT2 = math.sqrt(2)
+
+# Γείτονες: (dc, dr, κόστος)
+NEIGHBORS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2),
+]
+
+def octile(c0, r0, c1, r1):
+    dx = abs(c0 - c1)
+    dy = abs(r0 - r1)
+    return (dx + dy) + (SQRT2 - 2) * min(dx, dy)
+
+# A* στα πλακίδια που μπορεί να τρέξει σε κομμάτια (run με όριο επεκτάσεων)
+class PathSearch:
+    def __init__(self, finder, start, goal, corridor=None, key=None, path=None):
+        self.finder = finder
+        self.version = finder.version
+        self.start = start
+        self.goal = goal
+        self.corridor = corridor    # Περιοχές όπου επιτρέπεται να ψάξει (None = έτοιμη απάντηση)
+        self.key = key              # Key της cache για το αποτέλεσμα
+        self.path = path
+        self.done = corridor is None
+        self.expansions = 0
+
+        if not self.done:
+            self.open = [(octile(*start, *goal), 0.0, start)]
+            self.came_from = {start: None}
+            self.cost = {start: 0.0}
+
+    # Μέχρι budget επεκτάσεις, επιστρέφει πόσες έγιναν
+    def run(self, budget):
+        if self.done:
+            return 0
+
+        finder = self.finder
+        cols = finder.cols
+        rows = finder.rows
+        walkable = finder.walkable
+        region = finder.region
+        corridor = self.corridor
+        gc, gr = self.goal
+        open_heap = self.open
+        came_from = self.came_from
+        cost = self.cost
+        used = 0
+
+        while open_heap and used < budget:
+            _, g, current = heapq.heappop(open_heap)
+            if current == self.goal:
+                self.expansions += used
+                self._finish(current)
+                return used
+            if g > cost[current]:
+                continue    # Παλιά εγγραφή στο heap
+
+            used += 1
+            c, r = current
+            for dc, dr, step in NEIGHBORS:
+                nc = c + dc
+                nr = r + dr
+                if not (0 <= nc < cols and 0 <= nr < rows):
+                    continue
+                idx = nr * cols + nc
+                if not walkable[idx] or region[idx] not in corridor:
+                    continue
+
+                # Χωρίς κόψιμο γωνίας: στις διαγώνιες πρέπει να είναι βατά και τα δύο ορθογώνια πλακίδια
+                if dc and dr and not (walkable[r * cols + nc] and walkable[nr * cols + c]):
+                    continue
+
+                ng = g + step
+                nxt = (nc, nr)
+                if ng < cost.get(nxt, math.inf):
+                    cost[nxt] = ng
+                    came_from[nxt] = current
+                    heapq.heappush(open_heap, (ng + octile(nc, nr, gc, gr), ng, nxt))
+
+        self.expansions += used
+        if not open_heap:
+            self._finish(None)
+        return used
+
+    def _finish(self, node):
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.came_from[node]
+        path.reverse()
+
+        self.path = tuple(path) or None
+        self.done = True
+        self.open = self.came_from = self.cost = None
+        self.finder.finished(self)
+
+class Pathfinder:
+    def __init__(self, collision_grid, width, height):
+        self.grid = collision_grid
+        self.cols = collision_grid.cols
+        self.rows = collision_grid.rows
+        self.tile_width = collision_grid.tile_width
+        self.tile_height = collision_grid.tile_height
+        self.width = width
+        self.height = height
+
+        self.version = 0                # Αλλάζει σε κάθε rebuild: αποτελέσματα παλιότερης έκδοσης δεν μπαίνουν στις caches
+        self.cache = OrderedDict()      # (start, goal) → tuple από πλακίδια
+        self.by_goal = {}               # goal → set από keys της cache (για μερική επαναχρησιμοποίηση)
+        self.unreachable = OrderedDict()    # (έκδοση, κομμάτι του start, goal) → True
+
+        # Στατιστικά
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.failure_hits = 0
+
+        self.rebuild()
+
+    # Βατά πλακίδια και περιοχές από το πλέγμα collision (στην αρχή, και αν αλλάξουν οι τοίχοι)
+    def rebuild(self):
+        cols = self.cols
+        rows = self.rows
+
+        # Βατά πλακίδια για το κουτί του παίκτη (1 = βατό)
+        self.walkable = bytearray(cols * rows)
+        for r in range(rows):
+            for c in range(cols):
+                x, y = self.cell_center(c, r)
+                if not self.grid.collides(x, y, self.width, self.height):
+                    self.walkable[r * cols + c] = 1
+
+        self._build_regions()
+
+        self.version += 1
+        self.cache.clear()
+        self.by_goal.clear()
+        self.unreachable.clear()
+
+    # Περιοχές: βατά πλακίδια που ενώνονται (4 γείτονες) μέσα στο ίδιο cluster. Οι διαγώνιες κινήσεις
+    # θέλουν βατά και τα δύο ορθογώνια πλακίδια, οπότε δεν ενώνουν τίποτα που δεν ενώνεται ήδη έτσι
+    def _build_regions(self):
+        cols = self.cols
+        rows = self.rows
+        walkable = self.walkable
+
+        region = array("i", [-1]) * (cols * rows)     # πλακίδιο → περιοχή (-1 για τοίχο)
+        sums = []       # περιοχή → [άθροισμα c, άθροισμα r, πλακίδια]
+
+        for r0 in range(0, rows, CLUSTER_SIZE):
+            for c0 in range(0, cols, CLUSTER_SIZE):
+                r1 = min(r0 + CLUSTER_SIZE, rows)
+                c1 = min(c0 + CLUSTER_SIZE, cols)
+                for r in range(r0, r1):
+                    for c in range(c0, c1):
+                        idx = r * cols + c
+                        if not walkable[idx] or region[idx] != -1:
+                            continue
+
+                        rid = len(sums)
+                        total = [0, 0, 0]
+                        region[idx] = rid
+                        stack = [(c, r)]
+                        while stack:
+                            sc, sr = stack.pop()
+                            total[0] += sc
+                            total[1] += sr
+                            total[2] += 1
+                            for nc, nr in ((sc + 1, sr), (sc - 1, sr), (sc, sr + 1), (sc, sr - 1)):
+                                if c0 <= nc < c1 and r0 <= nr < r1:
+                                    nidx = nr * cols + nc
+                                    if walkable[nidx] and region[nidx] == -1:
+                                        region[nidx] = rid
+                                        stack.append((nc, nr))
+                        sums.append(total)
+
+        self.region = region
+        self.region_center = [(sc / n, sr / n) for sc, sr, n in sums]
+
+        # Ακμές ανάμεσα σε περιοχές γειτονικών clusters, με κόστος την απόσταση των κέντρων τους
+        edges = [{} for _ in sums]
+        for r in range(rows):
+            for c in range(cols):
+                a = region[r * cols + c]
+                if a == -1:
+                    continue
+                for nc, nr in ((c + 1, r), (c, r + 1)):
+                    if nc < cols and nr < rows:
+                        b = region[nr * cols + nc]
+                        if b != -1 and b != a and b not in edges[a]:
+                            (ax, ay), (bx, by) = self.region_center[a], self.region_center[b]
+                            edges[a][b] = edges[b][a] = math.hypot(ax - bx, ay - by)
+        self.region_edges = edges
+
+        # Συνεκτικά κομμάτια του χάρτη: περιοχές σε διαφορετικό κομμάτι δεν έχουν μονοπάτι
+        component = [-1] * len(sums)
+        for rid in range(len(sums)):
+            if component[rid] != -1:
+                continue
+            component[rid] = rid
+            stack = [rid]
+            while stack:
+                for other in edges[stack.pop()]:
+                    if component[other] == -1:
+                        component[other] = rid
+                        stack.append(other)
+        self.component = component
+
+    def cell_of(self, x, y):
+        return int(x // self.tile_width), int(y // self.tile_height)
+
+    def cell_center(self, c, r):
+        return (c + 0.5) * self.tile_width, (r + 0.5) * self.tile_height
+
+    def is_walkable(self, c, r):
+        return 0 <= c < self.cols and 0 <= r < self.rows and self.walkable[r * self.cols + c] == 1
+
+    def region_of(self, c, r):
+        return self.region[r * self.cols + c]
+
+    # Το πλησιέστερο βατό πλακίδιο γύρω από το (c, r)
+    def nearest_walkable(self, c, r, radius=GOAL_SEARCH_RADIUS):
+        if self.is_walkable(c, r):
+            return c, r
+
+        best = None
+        best_d = None
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                if self.is_walkable(c + dc, r + dr):
+                    d = dc * dc + dr * dr
+                    if best_d is None or d < best_d:
+                        best = (c + dc, r + dr)
+                        best_d = d
+        return best
+
+    # Αναζήτηση από πλακίδιο σε πλακίδιο. Αν η απάντηση είναι γνωστή (cache, ίδιο πλακίδιο, στόχος σε
+    # άλλο κομμάτι του χάρτη) η αναζήτηση είναι ήδη done, αλλιώς συνεχίζεται με run()
+    def search(self, start, goal):
+        if not self.is_walkable(*start) or not self.is_walkable(*goal):
+            return PathSearch(self, start, goal)
+        if start == goal:
+            return PathSearch(self, start, goal, path=(start,))
+
+        key = (start, goal)
+
+        # Ολόκληρο μονοπάτι στην cache
+        path = self.cache.get(key)
+        if path is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return PathSearch(self, start, goal, path=path)
+
+        # Το start βρίσκεται πάνω σε αποθηκευμένο μονοπάτι προς τον ίδιο στόχο
+        for other in self.by_goal.get(goal, ()):
+            cached = self.cache[other]
+            if start in cached:
+                self.cache.move_to_end(other)
+                self.partial_hits += 1
+                return PathSearch(self, start, goal, path=cached[cached.index(start):])
+
+        # Στόχος χωρίς μονοπάτι από αυτό το κομμάτι του χάρτη
+        start_region = self.region_of(*start)
+        goal_region = self.region_of(*goal)
+        failure_key = (self.version, self.component[start_region], goal)
+        if failure_key in self.unreachable:
+            self.unreachable.move_to_end(failure_key)
+            self.failure_hits += 1
+            return PathSearch(self, start, goal)
+
+        self.misses += 1
+        regions = self._region_path(start_region, goal_region)
+        if regions is None:
+            self._remember_failure(failure_key)
+            return PathSearch(self, start, goal)
+
+        # Διάδρομος: οι περιοχές του χονδρικού μονοπατιού και οι γείτονές τους
+        corridor = set(regions)
+        for rid in regions:
+            corridor.update(self.region_edges[rid])
+        return PathSearch(self, start, goal, corridor, key)
+
+    # Καλείται από το PathSearch όταν τελειώσει
+    def finished(self, search):
+        if search.version != self.version:
+            return      # Ο χάρτης άλλαξε όσο έτρεχε η αναζήτηση
+        if search.path is None:
+            self.failures += 1
+            self._remember_failure((self.version, self.component[self.region_of(*search.start)], search.goal))
+        elif search.key is not None:
+            self._remember(search.key, search.path)
+
+    # Μονοπάτι από πλακίδιο σε πλακίδιο (tuple από (c, r)) ή None, χωρίς όριο επεκτάσεων
+    def find_path(self, start, goal):
+        search = self.search(start, goal)
+        while not search.done:
+            search.run(math.inf)
+        return search.path
+
+    def _remember(self, key, path):
+        self.cache[key] = path
+        self.by_goal.setdefault(key[1], set()).add(key)
+
+        # LRU: πετάμε το παλαιότερο μονοπάτι όταν γεμίσει η cache
+        while len(self.cache) > PATH_CACHE_SIZE:
+            old_key, _ = self.cache.popitem(last=False)
+            keys = self.by_goal.get(old_key[1])
+            if keys is not None:
+                keys.discard(old_key)
+                if not keys:
+                    del self.by_goal[old_key[1]]
+
+    def _remember_failure(self, key):
+        self.unreachable[key] = True
+        while len(self.unreachable) > FAILURE_CACHE_SIZE:
+            self.unreachable.popitem(last=False)
+
+    # A* στον γράφο των περιοχών: λίστα περιοχών από την αρχή ως τον στόχο, ή None
+    def _region_path(self, start, goal):
+        component = self.component
+        if component[start] != component[goal]:
+            return None
+        if start == goal:
+            return [start]
+
+        centers = self.region_center
+        edges = self.region_edges
+        gx, gy = centers[goal]
+
+        def heuristic(rid):
+            x, y = centers[rid]
+            return math.hypot(x - gx, y - gy)
+
+        open_heap = [(heuristic(start), 0.0, start)]
+        came_from = {start: None}
+        cost = {start: 0.0}
+        while open_heap:
+            _, g, current = heapq.heappop(open_heap)
+            if current == goal:
+                break
+            if g > cost[current]:
+                continue
+            for other, step in edges[current].items():
+                ng = g + step
+                if ng < cost.get(other, math.inf):
+                    cost[other] = ng
+                    came_from[other] = current
+                    heapq.heappush(open_heap, (ng + heuristic(other), ng, other))
+        else:
+            return None
+
+        regions = []
+        node = goal
+        while node is not None:
+            regions.append(node)
+            node = came_from[node]
+        regions.reverse()
+        return regions
+
+    # Αναζήτηση σε συντεταγμένες κόσμου, από το (x0, y0) προς το (x1, y1)
+    def search_world(self, x0, y0, x1, y1):
+        start = self.nearest_walkable(*self.cell_of(x0, y0))
+        goal = self.nearest_walkable(*self.cell_of(x1, y1))
+        if start is None or goal is None:
+            return PathSearch(self, start, goal)
+        return self.search(start, goal)
+
+    # Waypoints σε συντεταγμένες κόσμου για μια αναζήτηση που τελείωσε (None αν δεν βρέθηκε μονοπάτι)
+    def world_waypoints(self, search, x1, y1, width, height):
+        cells = search.path
+        if cells is None:
+            return None
+
+        # Το πρώτο πλακίδιο είναι αυτό που ήδη στέκεται ο παίκτης
+        waypoints = [self.cell_center(c, r) for c, r in cells[1:]]
+
+        # Αν ο στόχος είναι ελεύθερος, το τελευταίο σημείο είναι ακριβώς εκεί που έγινε το κλικ
+        if search.goal == self.cell_of(x1, y1) and not self.grid.collides(x1, y1, width, height):
+            if waypoints:
+                waypoints[-1] = (x1, y1)
+            else:
+                waypoints.append((x1, y1))
+
+        return waypoints
+
+    # Μονοπάτι σε συντεταγμένες κόσμου (λίστα από σημεία) από το (x0, y0) προς το (x1, y1)
+    def find_world_path(self, x0, y0, x1, y1, width, height):
+        search = self.search_world(x0, y0, x1, y1)
+        while not search.done:
+            search.run(math.inf)
+        return self.world_waypoints(search, x1, y1, width, height)
@@ -0,0 +1,133 @@
+# Client-side prediction της κίνησης του τοπικού παίκτη, με reconciliation από τα acks του server
+#
+# Ο client κινεί τον παίκτη του αμέσως, σε σταθερά ticks όπως ο server και με τους ίδιους κανόνες
+# (movement.py), και κρατάει για κάθε tick που προέβλεψε το input (seq, πλήκτρα) που χρησιμοποίησε.
+# Μαζί με τη θέση του παίκτη ο server στέλνει ack: το τελευταίο seq που εφάρμοσε και από ποιο tick.
+# Τα inputs που έχει ήδη τρέξει ο server (μικρότερο seq, και όσα ticks του ίδιου seq πέρασαν από τότε)
+# φεύγουν από το buffer, και τα υπόλοιπα ξαναπαίζονται πάνω στη θέση του server. Όταν η πρόβλεψη ήταν
+# σωστή δεν αλλάζει τίποτα. Όταν δεν ήταν (άλλος παίκτης στη μέση, χαμένο input), η διαφορά απλώνεται σε
+# λίγα frames αντί για απότομο πήδημα.
+#
+# Το click-to-move δεν προβλέπεται (το μονοπάτι το βρίσκει ο server): όσο ισχύει ο παίκτης ακολουθεί τον server.
+
+import math
+from collections import deque
+from movement import move, velocity
+
+PREDICTION_TICKS = 150      # Μέγιστα ticks χωρίς ack στο buffer (3 s): ό,τι είναι πιο παλιό ξεχνιέται
+MAX_CATCHUP_TICKS = 5       # Μέγιστα ticks πρόβλεψης σε ένα frame (π.χ. μετά από πάγωμα του παραθύρου)
+CORRECTION_TIME = 0.1       # Σταθερά χρόνου (s) για το σβήσιμο του λάθους της πρόβλεψης στην οθόνη
+SNAP_DISTANCE = 64          # Λάθη μεγαλύτερα από αυτό διορθώνονται αμέσως (π.χ. teleport)
+
+class PlayerPrediction:
+    def __init__(self, grid, map_width, map_height, tick_dt):
+        self.grid = grid
+        self.map_width = map_width
+        self.map_height = map_height
+        self.tick_dt = tick_dt
+
+        self.x = None               # Προβλεπόμενη θέση (None μέχρι να δούμε τη θέση του server)
+        self.y = None
+        self.prev_x = None          # Θέση στο προηγούμενο tick (interpolation ανάμεσα στα ticks για την οθόνη)
+        self.prev_y = None
+        self.accumulator = 0.0
+        self.pending = deque(maxlen=PREDICTION_TICKS)  # (seq, πλήκτρα) για κάθε tick που προβλέψαμε χωρίς ack
+
+        self.error_x = 0.0          # Διαφορά που δεν έχει σβήσει ακόμα στην οθόνη
+        self.error_y = 0.0
+        self.last_ack_tick = -1
+        self.acked_seq = None       # Seq του τελευταίου ack και πόσα ticks του έχουν ήδη φύγει από το buffer
+        self.acked_ticks = 0
+        self.corrections = 0        # Reconciliations που άλλαξαν τη θέση
+
+    @property
+    def ready(self):
+        return self.x is not None
+
+    def reset(self, x, y):
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.pending.clear()
+        self.acked_seq = None
+        self.last_ack_tick = -1
+        self.error_x = self.error_y = 0.0
+
+    # Προχωράει την πρόβλεψη όσα ticks χωράνε στο dt. keys=None: ο server κινεί τον παίκτη (click-to-move)
+    def advance(self, dt, seq, keys):
+        if self.x is None:
+            return
+        self.accumulator += dt
+        steps = int(self.accumulator / self.tick_dt)
+        self.accumulator -= steps * self.tick_dt
+        if steps > MAX_CATCHUP_TICKS:
+            steps = MAX_CATCHUP_TICKS
+
+        for _ in range(steps):
+            self.prev_x, self.prev_y = self.x, self.y
+            if keys is None:
+                continue
+            self.pending.append((seq, keys))
+            self.x, self.y = self.step(self.x, self.y, keys)
+
+        decay = math.exp(-dt / CORRECTION_TIME)
+        self.error_x *= decay
+        self.error_y *= decay
+
+    def step(self, x, y, keys):
+        vx, vy = velocity(keys)
+        if not vx and not vy:
+            return x, y
+        return move(self.grid, x, y, vx, vy, self.map_width, self.map_height)
+
+    # Θέση (x, y) του server στο tick, μετά από όλα τα inputs ως το seq, που εφαρμόστηκε στο tick applied
+    def reconcile(self, tick, seq, applied, x, y):
+        if self.x is None:
+            self.reset(x, y)
+            self.last_ack_tick = tick
+            return
+        if tick <= self.last_ack_tick:
+            return
+        self.last_ack_tick = tick
+
+        # Ό,τι έχει ήδη τρέξει ο server: τα παλιότερα seq, και τα ticks applied..tick του ίδιου seq
+        # (μείον όσα έφυγαν με προηγούμενο ack του ίδιου seq)
+        pending = self.pending
+        while pending and pending[0][0] < seq:
+            pending.popleft()
+        if seq != self.acked_seq:
+            self.acked_seq = seq
+            self.acked_ticks = 0
+        done = tick - applied + 1 - self.acked_ticks
+        while done > 0 and pending and pending[0][0] == seq:
+            pending.popleft()
+            self.acked_ticks += 1
+            done -= 1
+
+        # Replay των inputs που ο server δεν έχει δει ακόμα
+        px, py = x, y
+        for _, keys in pending:
+            px, py = self.step(px, py, keys)
+
+        dx = self.x - px
+        dy = self.y - py
+        if not dx and not dy:
+            return
+
+        self.corrections += 1
+        if abs(dx) > SNAP_DISTANCE or abs(dy) > SNAP_DISTANCE:
+            self.error_x = self.error_y = 0.0
+            self.prev_x, self.prev_y = px, py
+        else:
+            # Η οθόνη μένει εκεί που ήταν και το λάθος σβήνει σταδιακά
+            self.error_x += dx
+            self.error_y += dy
+            self.prev_x -= dx
+            self.prev_y -= dy
+        self.x, self.y = px, py
+
+    # Θέση για την οθόνη: ανάμεσα στα δύο τελευταία ticks, μαζί με το λάθος που δεν έχει σβήσει
+    def render_position(self):
+        alpha = self.accumulator / self.tick_dt
+        x = self.prev_x + (self.x - self.prev_x) * alpha + self.error_x
+        y = self.prev_y + (self.y - self.prev_y) * alpha + self.error_y
+        return x, y
@@ -0,0 +1,29 @@
+# Token bucket για περιορισμό ρυθμού μηνυμάτων ανά client
+#
+# Κάθε client έχει "κουβά" με tokens που γεμίζει με σταθερό ρυθμό (rate ανά δευτερόλεπτο)
+# μέχρι το burst. Κάθε μήνυμα καταναλώνει ένα token, αν δεν υπάρχει token το μήνυμα απορρίπτεται.
+
+import time
+
+class TokenBucket:
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate        # Tokens ανά δευτερόλεπτο
+        self.burst = burst      # Μέγιστος αριθμός tokens
+        self.clock = clock
+
+        self.tokens = float(burst)
+        self.last = clock()
+        self.dropped = 0        # Μηνύματα που απορρίφθηκαν
+
+    # Προσπαθεί να καταναλώσει tokens, επιστρέφει False αν ο client ξεπέρασε το όριο
+    def consume(self, amount=1.0):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+
+        self.dropped += 1
+        return False
@@ -0,0 +1,80 @@
+# Πίνακας περιοχών (regions) του κόσμου
+#
+# Κάθε περιοχή τρέχει σε δικό της server process με δικό της χάρτη και δικές της θύρες:
+#     python server.py --region firstRegion
+#     python server.py --region secondRegion
+#
+# Όταν ένας παίκτης μπει σε μια μετάβαση (object "transition" στο TMX ή άκρη του χάρτη που
+# οδηγεί σε γειτονική περιοχή), ο server τον στέλνει με PUSH στη θύρα handoff της επόμενης
+# περιοχής μαζί με τη θέση άφιξης, και ενημερώνει τον client να συνδεθεί εκεί.
+
+EDGE_MARGIN = 8         # Πάχος (pixels) της λωρίδας στην άκρη του χάρτη που ενεργοποιεί τη μετάβαση
+ARRIVAL_OFFSET = 48     # Πόσο μέσα από την άκρη της νέας περιοχής εμφανίζεται ο παίκτης
+
+# Θύρες ως προς τη βάση κάθε περιοχής
+INPUT_PORT = 0      # Movement input (PULL)
+STATE_PORT = 1      # Broadcast state (PUB)
+CONTROL_PORT = 2    # Control (ROUTER/DEALER)
+HANDOFF_PORT = 3    # Παίκτες που έρχονται από άλλη περιοχή (PULL)
+EVENT_INPUT_PORT = 4    # Chat των clients (PULL, eventChannel.py)
+EVENT_PORT = 5          # Chat και γεγονότα προς τους clients (PUB, eventChannel.py)
+
+class Region:
+    def __init__(self, name, map_path, base_port, host="127.0.0.1", edges=None):
+        self.name = name
+        self.map_path = map_path
+        self.base_port = base_port
+        self.host = host
+        self.edges = edges or {}    # "east"/"west"/"north"/"south" → όνομα γειτονικής περιοχής
+
+    def bind_addr(self, port):
+        return f"tcp://*:{self.base_port + port}"
+
+    def connect_addr(self, port):
+        return f"tcp://{self.host}:{self.base_port + port}"
+
+    # Ό,τι χρειάζεται ο client για να συνδεθεί (στέλνεται με το μήνυμα handoff)
+    def to_dict(self):
+        return {"name": self.name, "map": self.map_path, "host": self.host, "base_port": self.base_port}
+
+# Η πρώτη περιοχή κρατάει τις αρχικές θύρες 5555-5557
+REGIONS = {
+    "firstRegion": Region("firstRegion", "assets/maps/firstRegion.tmx", 5555, edges={"east": "secondRegion"}),
+    "secondRegion": Region("secondRegion", "assets/maps/secondRegion.tmx", 5565, edges={"west": "firstRegion"}),
+}
+
+START_REGION = "firstRegion"
+
+class Transition:
+    def __init__(self, left, bottom, right, top, region, x=None, y=None):
+        self.rect = (left, bottom, right, top)
+        self.region = region    # Περιοχή προορισμού
+        self.x = x              # Θέση άφιξης (None = ίδια συντεταγμένη με αυτή που είχε ο παίκτης,
+        self.y = y              # αρνητική τιμή = απόσταση από την απέναντι άκρη του νέου χάρτη)
+
+    def arrival(self, x, y):
+        return (x if self.x is None else self.x), (y if self.y is None else self.y)
+
+# Η θέση άφιξης στον χάρτη προορισμού (οι αρνητικές συντεταγμένες μετράνε από την απέναντι άκρη)
+def resolve_arrival(x, y, width, height):
+    if x < 0:
+        x += width
+    if y < 0:
+        y += height
+    return x, y
+
+# Μεταβάσεις στις άκρες του χάρτη προς τις γειτονικές περιοχές
+def edge_transitions(region, width, height):
+    transitions = []
+    for edge, target in region.edges.items():
+        if edge == "east":
+            transitions.append(Transition(width - EDGE_MARGIN, 0, width, height, target, x=ARRIVAL_OFFSET))
+        elif edge == "west":
+            transitions.append(Transition(0, 0, EDGE_MARGIN, height, target, x=-ARRIVAL_OFFSET))
+        elif edge == "north":
+            transitions.append(Transition(0, height - EDGE_MARGIN, width, height, target, y=ARRIVAL_OFFSET))
+        elif edge == "south":
+            transitions.append(Transition(0, 0, width, EDGE_MARGIN, target, y=-ARRIVAL_OFFSET))
+        else:
+            raise ValueError(f"Unknown edge {edge!r} in region {region.name}")
+    return transitions
@@ -0,0 +1,143 @@
+# Relay για το PUB της κατάστασης: κάνει subscribe μία φορά στον server και μοιράζει τη ροή στους clients
+#
+# XSUB προς τα πάνω (server ή άλλο relay) και XPUB προς τα κάτω (clients ή άλλα relays). Τα subscriptions
+# των clients (μαζί με τα topics, π.χ. τα κελιά του area of interest) ανεβαίνουν προς τον server, και
+# το XPUB στέλνει πάνω μόνο το πρώτο subscribe και το τελευταίο unsubscribe κάθε topic. Έτσι ο server
+# βλέπει ένα TCP stream ανά relay αντί για ένα ανά client, και στέλνει μόνο τα topics που ζητάει κάποιος.
+# Εξαίρεση η ροή των spectators: κάθε subscribe της ανεβαίνει (XPUB_VERBOSE), για να στείλει ο server keyframe.
+# Τα relays αλυσιδώνονται (το --upstream ενός relay μπορεί να είναι το --bind ενός άλλου):
+#     python relay.py                                                 # server → :5600
+#     python relay.py --upstream tcp://127.0.0.1:5600 --bind tcp://*:5601
+#     python relay.py --upstream tcp://127.0.0.1:5566 --bind tcp://*:5610   # secondRegion
+#
+# Οι clients συνδέονται στο relay με GAME_RELAYS=firstRegion=tcp://host:5600,secondRegion=tcp://host:5610
+
+import argparse
+import time
+import zmq
+from zmq.utils.monitor import recv_monitor_message
+from wireProtocol import SPECTATOR_TOPIC
+
+UPSTREAM_ADDR = "tcp://127.0.0.1:5556"  # PUB του server (firstRegion)
+RELAY_ADDR = "tcp://*:5600"             # XPUB για τους clients
+
+RELAY_BATCH = 1000      # Μέγιστα μηνύματα ανά κατεύθυνση πριν κοιτάξουμε την άλλη
+RELAY_HWM = 10000       # Μηνύματα στην ουρά κάθε subscriber πριν αρχίσουν να πετιούνται
+STATS_INTERVAL = 10.0   # Κάθε πόσα δευτερόλεπτα τυπώνουμε throughput
+
+# Μετρητές ενός relay για το διάστημα από την τελευταία αναφορά
+class RelayStats:
+    def __init__(self):
+        self.messages = 0       # Μηνύματα από πάνω
+        self.bytes = 0
+        self.subscribes = 0     # Subscriptions που στάλθηκαν προς τα πάνω
+        self.unsubscribes = 0
+        self.topics = set()     # Topics με τουλάχιστον έναν subscriber από κάτω
+        self.peers = 0          # Συνδεδεμένοι subscribers (clients ή relays)
+        self.since = time.monotonic()
+
+    def report(self, name):
+        now = time.monotonic()
+        elapsed = max(now - self.since, 1e-9)
+        print(
+            f"[Relay {name}] {self.messages / elapsed:.0f} msg/s {self.bytes / elapsed / 1e6:.2f} MB/s in, "
+            f"peers={self.peers} topics={len(self.topics)} sub=+{self.subscribes}/-{self.unsubscribes}"
+        )
+        self.messages = 0
+        self.bytes = 0
+        self.subscribes = 0
+        self.unsubscribes = 0
+        self.since = now
+
+def run_relay(upstream, bind, stats_interval=STATS_INTERVAL):
+    ctx = zmq.Context()
+
+    xsub = ctx.socket(zmq.XSUB)     # Ξαναστέλνει μόνο του τα subscriptions αν πέσει και ξανασυνδεθεί το upstream
+    xsub.connect(upstream)
+
+    xpub = ctx.socket(zmq.XPUB)
+    xpub.setsockopt(zmq.SNDHWM, RELAY_HWM)
+    xpub.setsockopt(zmq.XPUB_VERBOSE, 1)   # Βλέπουμε κάθε subscribe, ανεβαίνουν το πρώτο ανά topic και των spectators
+    xpub.bind(bind)
+
+    # Συνδέσεις/αποσυνδέσεις subscribers, μόνο για τα στατιστικά
+    monitor = xpub.get_monitor_socket(zmq.EVENT_ACCEPTED | zmq.EVENT_DISCONNECTED)
+
+    poller = zmq.Poller()
+    poller.register(xsub, zmq.POLLIN)
+    poller.register(xpub, zmq.POLLIN)
+    poller.register(monitor, zmq.POLLIN)
+
+    stats = RelayStats()
+    name = f"{upstream} → {bind}"
+    next_stats = time.monotonic() + stats_interval
+    print(f"[Relay {name}] started")
+
+    try:
+        while True:
+            timeout = max(0, int((next_stats - time.monotonic()) * 1000))
+            events = dict(poller.poll(timeout))
+
+            # Κατάσταση από πάνω → όλους τους subscribers του topic (τα frames περνάνε χωρίς αντιγραφή)
+            if xsub in events:
+                for _ in range(RELAY_BATCH):
+                    try:
+                        frames = xsub.recv_multipart(zmq.NOBLOCK, copy=False)
+                    except zmq.Again:
+                        break
+                    xpub.send_multipart(frames, copy=False)
+                    stats.messages += 1
+                    stats.bytes += sum(len(frame) for frame in frames)
+
+            # Subscriptions από κάτω → προς τα πάνω (1 + topic = subscribe, 0 + topic = unsubscribe)
+            if xpub in events:
+                for _ in range(RELAY_BATCH):
+                    try:
+                        msg = xpub.recv(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    if msg[:1] == b"\x01":
+                        topic = msg[1:]
+                        if topic in stats.topics and not SPECTATOR_TOPIC.startswith(topic):
+                            continue    # Το topic το έχει ήδη ζητήσει κάποιος
+                        xsub.send(msg)
+                        stats.subscribes += 1
+                        stats.topics.add(topic)
+                    elif msg[:1] == b"\x00":
+                        xsub.send(msg)
+                        stats.unsubscribes += 1
+                        stats.topics.discard(msg[1:])
+                    else:
+                        xsub.send(msg)
+
+            if monitor in events:
+                while True:
+                    try:
+                        event = recv_monitor_message(monitor, zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    if event["event"] == zmq.EVENT_ACCEPTED:
+                        stats.peers += 1
+                    elif event["event"] == zmq.EVENT_DISCONNECTED:
+                        stats.peers -= 1
+
+            if time.monotonic() >= next_stats:
+                next_stats += stats_interval
+                stats.report(name)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        xpub.disable_monitor()
+        ctx.destroy(linger=0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Relay για τη ροή κατάστασης (XSUB/XPUB)")
+    parser.add_argument("--upstream", default=UPSTREAM_ADDR, help="PUB του server ή XPUB άλλου relay")
+    parser.add_argument("--bind", default=RELAY_ADDR, help="Διεύθυνση για τους clients (ή για επόμενο relay)")
+    parser.add_argument("--stats", type=float, default=STATS_INTERVAL, help="Δευτερόλεπτα ανάμεσα στις αναφορές throughput")
+    args = parser.parse_args()
+
+    run_relay(args.upstream, args.bind, args.stats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Replay ενός journal του server χωρίς δίκτυο
+#
+# Ξαναφτιάχνει τον κόσμο με τις παραμέτρους του journal, εφαρμόζει κάθε γεγονός στο tick
+# που είχε εφαρμοστεί στον server και τρέχει την προσομοίωση όσο πιο γρήγορα γίνεται.
+# Σε κάθε digest ελέγχει ότι η κατάσταση είναι ίδια με του server:
+#     python server.py --journal session.jnl
+#     python replay.py session.jnl
+#     python replay.py session.jnl --profile     # cProfile πάνω σε πραγματική κίνηση
+
+import argparse
+import cProfile
+import pstats
+import time
+from gameWorld import GameWorld
+from mapLoader import load_map, empty_map
+from inputJournal import read_journal, CONNECT, DISCONNECT, INPUT, DIGEST, HANDOFF
+
+def load_world(params, use_numpy=None):
+    if params.get("empty"):
+        game_map = empty_map(*params["empty"])
+    else:
+        game_map = load_map(params["map"])
+
+    world = GameWorld(
+        game_map,
+        params["tick_dt"],
+        use_numpy=use_numpy,
+        mob_count=params["mob_count"],
+        seed=params["seed"]
+    )
+
+    # Ο server είχε ξεκινήσει από checkpoint
+    restore = params.get("restore")
+    if restore:
+        players = [tuple(p) for p in restore["players"]]
+        world.restore(restore["tick"], restore["next_spawn_index"], players)
+
+    return world
+
+# Εφαρμογή όλων των εγγραφών, επιστρέφει (digests που ελέγχθηκαν, ticks όπου υπήρξε απόκλιση)
+def replay(world, records):
+    checked = 0
+    mismatches = []
+
+    for tick, kind, payload in records:
+        while world.tick < tick:
+            world.step()
+
+        if kind == CONNECT:
+            world.connect(payload["id"])
+        elif kind == DISCONNECT:
+            world.disconnect(payload["id"])
+        elif kind == INPUT:
+            world.apply_input(payload["id"], payload["msg"], check_seq=False)
+        elif kind == HANDOFF:
+            world.place_player(payload["id"], payload["x"], payload["y"])
+        elif kind == DIGEST:
+            checked += 1
+            if world.state_digest() != payload["digest"]:
+                mismatches.append(tick)
+
+    return checked, mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay ενός journal του server")
+    parser.add_argument("journal")
+    parser.add_argument("--no-numpy", action="store_true", help="Καθαρή Python αντί για NumPy store")
+    parser.add_argument("--profile", action="store_true", help="Εκτέλεση μέσα σε cProfile")
+    args = parser.parse_args()
+
+    params, records = read_journal(args.journal)
+    world = load_world(params, use_numpy=False if args.no_numpy else None)
+
+    profiler = cProfile.Profile() if args.profile else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+
+    checked, mismatches = replay(world, records)
+
+    if profiler is not None:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    rate = world.tick / elapsed if elapsed > 0 else float("inf")
+    print(f"{world.tick} ticks in {elapsed:.3f}s ({rate:.0f} ticks/s, {rate * world.tick_dt:.1f}x real time)")
+
+    if mismatches:
+        print(f"DESYNC: {len(mismatches)}/{checked} digests differ, first at tick {mismatches[0]}")
+    else:
+        print(f"OK: {checked} digests match")
+
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,199 +1,757 @@
+import argparse
 import asyncio
+import json
+import marshal
+import multiprocessing
 import zmq
 import zmq.asyncio
 import sys
 import time
-import arcade
+from collections import OrderedDict
+from mapLoader import load_map, empty_map
+from gameWorld import GameWorld, TICK_DT
+from tickScheduler import TickScheduler
+from rateLimit import TokenBucket
+from timerWheel import TimerWheel
+from inputJournal import JournalWriter
+from mobSystem import MOB_COUNT
+from sharedRing import SharedRing
+from networkWorkers import ingress_worker, egress_worker, INPUT, CONTROL
+from areaOfInterest import CellDeltas, CellEncoders, stream_topic, TIER_NEAR, ACK_LIMIT
+from spectatorStream import SpectatorStream
+from eventChannel import EventChannel, EVENT_INPUT_ADDR, EVENT_ADDR, TOPIC_SYSTEM, TOPIC_GAME
+from wireProtocol import (
+    encode_json, decode_input, check_input, valid_id, id_fits, choose_protocol, quantization,
+    PROTOCOL_BINARY, PROTOCOL_JSON, STATE_BINARY, STATE_JSON, HANDOFF_TOPIC, SPECTATOR_TOPIC
+)
+from regions import (
+    REGIONS, INPUT_PORT, STATE_PORT, CONTROL_PORT, HANDOFF_PORT, EVENT_INPUT_PORT, EVENT_PORT,
+    edge_transitions, resolve_arrival
+)
+from checkpoint import capture, write_checkpoint, read_checkpoint, CHECKPOINT_PATH, CHECKPOINT_INTERVAL
 
 # Windows fix για να λειτουργεί το asyncio με τον κατάλληλο event loop σε Windows
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-TILE_SCALING = 1.0                      # Scale Πλακιδίων
-
-tile_map = arcade.load_tilemap(
-    "assets/maps/firstRegion.tmx",      # Φόρτωση χάρτη από το tiled
-    scaling=TILE_SCALING,
-    use_spatial_hash=True               # Το collision γίνεται μόνο με κοντινά αντικείμενα (βελτίωση απόδοσης)
-)
-
-wall_list = tile_map.sprite_lists["Walls"]  # Παίρνουμε το walls layer του tiled για να βάλουμε collision μόνο σε αυτά
-
-# Διαστάσεις χάρτη σε pixels
-MAP_WIDTH  = tile_map.width * tile_map.tile_width
-MAP_HEIGHT = tile_map.height * tile_map.tile_height
-
-# Διαστάσεις παίκτη
-PLAYER_WIDTH  = 32
-PLAYER_HEIGHT = 48
-
-SPEED = 5             # Ταχύτητα κίνησης του παίκτη
-
-server_start_time = time.time() # Χρόνος παιχνιδιού
-
-ctx = zmq.asyncio.Context()     # Δημιουργία του zmq context για τη σύνδεση με τα sockets
-
-# Movement input (PULL): Δημιουργία socket για να λαμβάνει τα inputs από τους παίκτες
-pull_socket = ctx.socket(zmq.PULL)
-pull_socket.bind("tcp://*:5555")    # Ακούμε στις εισερχόμενες συνδέσεις στην θύρα 5555
-
-# Broadcast state (PUB): Δημιουργία socket για να στέλνει την κατάσταση του παιχνιδιού στους πελάτες
-pub_socket = ctx.socket(zmq.PUB)
-pub_socket.bind("tcp://*:5556")     # Ακούμε για να στείλουμε κατάσταση στους πελάτες στη θύρα 5556
-
-# Control socket (REQ/REP): Δημιουργία socket για σύνδεση/αποσύνδεση με τους πελάτες (request-response)
-control_socket = ctx.socket(zmq.REP)
-control_socket.bind("tcp://*:5557") # Ακούμε για αιτήματα σύνδεσης και αποσύνδεσης στη θύρα 5557
-
-# Player data: Λεξικό που περιέχει τα δεδομένα των παικτών
-players = {}          # pid → {x, y} (πληροφορίες για την θέση κάθε παίκτη)
-
-connected = set()     # Σύνολο παικτών σε σειρά σύνδεσης
-
-spawn_points = []     # Λίστα για το spawn παικτών
-next_spawn_index = 0
-
-object_layer = tile_map.object_lists.get("Object")  # Παίρνουμε το object layer για το spawn 
-
-if not object_layer:
-    raise RuntimeError("No Object layer found in TMX map")
-
-for obj in object_layer:
-    if obj.name == "player_spawn":  # Για κάθε object με το όνομα player_spawn (έτσι έχει ονομαστεί στο tiled), προσθέτουμε το σημείο στη λίστα
-        x, y = obj.shape
-        spawn_points.append((x, y))
-
-if not spawn_points:
-    raise RuntimeError("No player_spawn objects found in Object layer")
-
-print("Spawn points loaded from TMX:", spawn_points)
-
-TICK_DT = 0.02      # Η διάρκεια κάθε "tick" σε δευτερόλεπτα (ρυθμίζει το frame rate)
-tick = 0            # Μετρητής "tick" για το παιχνίδι
-
-# Μέθοδος για το state των παικτών
-async def handle_control():
-    global next_spawn_index
-    while True:
-        msg = await control_socket.recv_json()  # Περιμένει και λαμβάνει τα μηνύματα ελέγχου
-        pid = msg["id"]     # Το id του παίκτη
-        typ = msg["type"]   # Τύπος αιτήματος (σύνδεση ή αποσύνδεση)
+MAP_PATH = "assets/maps/firstRegion.tmx"    # Χάρτης του server
+
+# Θύρες των sockets
+PULL_ADDR    = "tcp://*:5555"   # Movement input (PULL)
+PUB_ADDR     = "tcp://*:5556"   # Broadcast state (XPUB: βλέπουμε και τα subscriptions)
+CONTROL_ADDR = "tcp://*:5557"   # Control (ROUTER, οι clients με DEALER)
+
+STATS_INTERVAL = 10.0   # Κάθε πόσα δευτερόλεπτα τυπώνουμε στατιστικά για τα ticks
+
+INPUT_RATE = 30         # Μέγιστα μηνύματα input ανά δευτερόλεπτο ανά client
+INPUT_BURST = 60        # Μέγιστη ριπή μηνυμάτων
+
+SESSION_TIMEOUT = 10.0  # Δευτερόλεπτα χωρίς κανένα μήνυμα (input ή heartbeat) πριν αποσυνδεθεί ένας παίκτης
+
+# Admission control: όριο παικτών και ουρά αναμονής για τα connects
+MAX_PLAYERS = 500           # Μέγιστοι παίκτες στον κόσμο (--max-players)
+LOGIN_QUEUE_LIMIT = 2000    # Πέρα από τόσους σε αναμονή απαντάμε "full"
+ADMIT_PER_TICK = 10         # Είσοδοι ανά tick (500/s): ένα κύμα logins μετά από restart μοιράζεται σε πολλά ticks
+QUEUE_UPDATE_INTERVAL = 1.0 # Κάθε πόσα δευτερόλεπτα στέλνουμε τη θέση στην ουρά σε όσους περιμένουν
+
+# Adapter ανάμεσα στο ZeroMQ και στο GameWorld: sockets, rate limiting και tick loop
+class GameServer:
+    def __init__(self, world, journal=None, checkpoint_path=None, region=None, max_players=MAX_PLAYERS):
+        self.world = world
+        self.journal = journal      # Προαιρετικό JournalWriter με όλα τα γεγονότα control/input
+
+        # Περιοχή του κόσμου που τρέχει αυτός ο server (None = ένας server για όλο τον κόσμο)
+        self.region = region
+        if region is not None:
+            self.pull_addr = region.bind_addr(INPUT_PORT)
+            self.pub_addr = region.bind_addr(STATE_PORT)
+            self.control_addr = region.bind_addr(CONTROL_PORT)
+            event_addrs = (region.bind_addr(EVENT_INPUT_PORT), region.bind_addr(EVENT_PORT))
+            self.transitions = world.map.transitions + edge_transitions(region, world.map.width, world.map.height)
+        else:
+            self.pull_addr = PULL_ADDR
+            self.pub_addr = PUB_ADDR
+            self.control_addr = CONTROL_ADDR
+            event_addrs = (EVENT_INPUT_ADDR, EVENT_ADDR)
+            self.transitions = []
+
+        # Chat και γεγονότα: δικά τους sockets σε δικό τους thread, ένα frame ανά topic ανά tick
+        self.events = EventChannel(*event_addrs, world.tick_dt, accept=world.connected.__contains__)
+
+        self.handoff_socket = None  # PULL: παίκτες που έρχονται από άλλες περιοχές
+        self.handoff_peers = {}     # όνομα περιοχής → PUSH socket προς τη θύρα handoff της
+        self.handoffs_out = 0
+        self.handoffs_in = 0
+
+        # Checkpoints: η εγγραφή γίνεται σε thread, το tick δεν περιμένει ποτέ τον δίσκο
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_ticks = max(1, int(CHECKPOINT_INTERVAL / world.tick_dt))
+        self.checkpoint_task = None
+
+        self.server_start_time = time.time()    # Χρόνος παιχνιδιού
+        self.cells = CellDeltas()               # Delta snapshots ανά κελί του χάρτη, κάθε κελί σε δικό του topic
+        self.cell_encoders = CellEncoders(quantization(world.map.width, world.map.height))
+        self.spectators = SpectatorStream()     # Ροή χαμηλού ρυθμού για spectators, μόνο όσο κάποιος την κοιτάει
+        self.spectate_requests = 0
+
+        # Πρωτόκολλο κάθε client (διαπραγμάτευση στο connect): το JSON κωδικοποιείται μόνο αν το ζητάει κάποιος
+        self.protocols = {}         # pid → πρωτόκολλο
+        self.json_clients = 0
+        self.scheduler = TickScheduler(world.tick_dt)   # Fixed-step scheduler πάνω σε monotonic ρολόι
+        self.current_tick = world.tick  # Το tick που τρέχει (ή μόλις έτρεξε), για το ρολόι του server
+
+        # Control: ο ROUTER δέχεται πολλά αιτήματα ταυτόχρονα και οι απαντήσεις μπορεί να έρθουν αργότερα
+        self.max_players = max_players
+        self.login_queue = OrderedDict()    # pid → (identity, πρωτόκολλο, req) με σειρά άφιξης
+        self.control_outbox = []            # (identity, απάντηση) που θα σταλούν στο τέλος του tick
+        self.queue_update_ticks = max(1, int(QUEUE_UPDATE_INTERVAL / world.tick_dt))
+        self.rejected = 0                   # Connects που απορρίφθηκαν επειδή η ουρά ήταν γεμάτη
+
+        self.rate_limits = {}       # pid → TokenBucket
+        self.acked_seqs = {}        # pid → τελευταίο seq που στάλθηκε σε ack, από το παλαιότερο ack
+        self.rate_limited = 0       # Μηνύματα που απορρίφθηκαν λόγω rate limit
+        self.malformed = 0          # Inputs με άκυρους τύπους/τιμές (πετιούνται πριν φτάσουν στον κόσμο)
+
+        # Liveness: timer wheel με ένα timer ανά session, ελέγχεται μόνο όταν λήξει
+        self.timers = TimerWheel()
+        self.timeout_ticks = max(1, int(SESSION_TIMEOUT / world.tick_dt))
+        self.last_seen = {}         # pid → tick του τελευταίου μηνύματος
+        self.session_timers = {}    # pid → Timer
+        self.evicted = 0            # Sessions που έληξαν χωρίς disconnect
+
+        self.ctx = None
+        self.pull_socket = None
+        self.pub_socket = None
+        self.control_socket = None
+
+    # Δημιουργία και bind των sockets
+    def bind(self):
+        self.ctx = zmq.asyncio.Context()     # Δημιουργία του zmq context για τη σύνδεση με τα sockets
+
+        # Movement input (PULL): Δημιουργία socket για να λαμβάνει τα inputs από τους παίκτες
+        self.pull_socket = self.ctx.socket(zmq.PULL)
+        self.pull_socket.bind(self.pull_addr)
+
+        # Broadcast state (XPUB): στέλνει την κατάσταση στους πελάτες, και μας λέει ποια topics ζητάει κάποιος
+        self.pub_socket = self.ctx.socket(zmq.XPUB)
+        self.pub_socket.setsockopt(zmq.XPUB_VERBOSE, 1)    # Κάθε subscribe (κάθε νέος spectator θέλει keyframe)
+        self.pub_socket.bind(self.pub_addr)
+
+        # Control socket (ROUTER): σύνδεση/αποσύνδεση, πολλά αιτήματα σε εξέλιξη και απαντήσεις όποτε είναι έτοιμες
+        self.control_socket = self.ctx.socket(zmq.ROUTER)
+        self.control_socket.bind(self.control_addr)
+
+        # Handoff (PULL): παίκτες που περνάνε σε αυτή την περιοχή από γειτονικές
+        if self.region is not None:
+            self.handoff_socket = self.ctx.socket(zmq.PULL)
+            self.handoff_socket.bind(self.region.bind_addr(HANDOFF_PORT))
+
+        self.events.start()
+
+    # Αιτήματα control: ο ROUTER τα δέχεται όπως έρχονται, χωρίς να περιμένει την απάντηση του προηγούμενου
+    async def handle_control(self):
+        while True:
+            frames = await self.control_socket.recv_multipart()    # [identity, "", JSON] (envelope όπως του REQ)
+            identity = frames[0]
+            try:
+                msg = json.loads(frames[-1])
+            except ValueError:
+                msg = None
+
+            if not isinstance(msg, dict):
+                reply = {"status": "error", "reason": "bad request"}
+            else:
+                reply = self.on_control(identity, msg)
+            if reply is not None:
+                await self.send_control(identity, reply)
+
+    async def send_control(self, identity, reply):
+        await self.control_socket.send_multipart([identity, b"", json.dumps(reply).encode()])
+
+    # Απαντήσεις που βγήκαν μέσα στο tick (είσοδοι από την ουρά, θέσεις στην ουρά)
+    async def flush_control(self):
+        outbox, self.control_outbox = self.control_outbox, []
+        for identity, reply in outbox:
+            await self.send_control(identity, reply)
+
+    # Επεξεργασία ενός αιτήματος control. Επιστρέφει την απάντηση, ή None αν θα σταλεί αργότερα
+    def on_control(self, identity, msg):
+        pid = msg.get("id")     # Το id του παίκτη
+        typ = msg.get("type")   # Τύπος αιτήματος (σύνδεση ή αποσύνδεση)
+        req = msg.get("req")    # Αύξων αριθμός του client, επιστρέφεται στην απάντηση
+
+        # Μόνο το ρολόι και οι spectators δεν χρειάζονται id παίκτη
+        if typ not in ("time", "spectate") and not valid_id(pid):
+            return {"status": "error", "reason": "bad id", "req": req}
 
         if typ == "connect":
-            if pid in connected:
-                await control_socket.send_json({"status": "ok"})
-                continue
-
-            # Προσθήκη του παίκτη στo σύνολο των συνδεδεμένων
-            connected.add(pid)
-
-            # Spawn place
-            spawn_index = next_spawn_index
-            next_spawn_index += 1
-
-            x, y = spawn_points[spawn_index % len(spawn_points)]
-            players[pid] = {"x": x, "y": y} # Αποθήκευση θέσης παίκτη
-
+            if not id_fits(pid):
+                return {"status": "error", "reason": "id too long", "req": req}
+            protocol = choose_protocol(msg.get("protocols"))
+            if protocol is None:
+                return {"status": "error", "reason": "no common protocol", "req": req}
+
+            # Ήδη στον κόσμο (επανασύνδεση, checkpoint ή handoff): δεν χρειάζεται θέση
+            if pid in self.world.connected:
+                self.connect_player(pid)
+                self.set_protocol(pid, protocol)
+                return self.accepted(pid, protocol, req)
+
+            if pid in self.login_queue:
+                self.login_queue[pid] = (identity, protocol, req)
+                return self.queued(pid, req)
+
+            if len(self.login_queue) >= LOGIN_QUEUE_LIMIT:
+                self.rejected += 1
+                return {"status": "full", "req": req}
+
+            # Η είσοδος γίνεται στο tick (admit). Αν δεν υπάρχει ελεύθερη θέση ο client μαθαίνει πού είναι στην ουρά
+            self.login_queue[pid] = (identity, protocol, req)
+            return self.queued(pid, req)
+
+        # Συγχρονισμός ρολογιού (NTP-style, βλ. clockSync.py): δεν χρειάζεται να είναι παίκτης
+        if typ == "time":
+            return {"status": "ok", "server_time": self.server_time(), "req": req}
+
+        # Spectator: δεν μπαίνει στον κόσμο ούτε στην ουρά, απλώς μαθαίνει πού να κάνει subscribe
+        if typ == "spectate":
+            if PROTOCOL_BINARY not in (msg.get("protocols") or ()):
+                return {"status": "error", "reason": "no common protocol", "req": req}
+            self.spectate_requests += 1
+            return {
+                "status": "ok", "protocol": PROTOCOL_BINARY, "topic": SPECTATOR_TOPIC.decode(),
+                "rate": 1.0 / (self.world.tick_dt * self.spectators.every),
+                "width": self.world.map.width, "height": self.world.map.height, "req": req
+            }
+
+        # Αποσύνδεση παίκτη (ή αποχώρηση από την ουρά)
+        if typ == "disconnect":
+            if self.login_queue.pop(pid, None) is not None:
+                print(f"Player {pid} LEFT the login queue")
+            else:
+                print(f"Player {pid} DISCONNECTED")
+                self.remove_player(pid)
+
+            return {"status": "ok", "req": req}
+
+        return {"status": "error", "reason": "unknown request", "req": req}
+
+    # Χρόνος στη χρονογραμμή των ticks (tick × tick_dt, ίδια με τα snapshots) με ακρίβεια μέσα στο tick
+    def server_time(self):
+        scheduler = self.scheduler
+        elapsed = 0.0 if scheduler.tick_start is None else scheduler.clock() - scheduler.tick_start
+        return self.current_tick * self.world.tick_dt + elapsed
+
+    def accepted(self, pid, protocol, req):
+        # Η θέση του παίκτη, ώστε ο client να κάνει αμέσως subscribe στα σωστά κελιά
+        x, y = self.world.players.get(pid)
+        return {"status": "ok", "protocol": protocol, "x": x, "y": y, "req": req}
+
+    # Απάντηση για όποιον είναι στην ουρά, ή None αν χωράει ήδη (η απάντηση θα σταλεί από το admit)
+    def queued(self, pid, req):
+        position = self.queue_position(list(self.login_queue).index(pid))
+        if position <= 0:
+            return None
+        return {"status": "queued", "position": position, "req": req}
+
+    # Θέση στην ουρά όσων περιμένουν θέση: οι πρώτοι που χωράνε στις ελεύθερες θέσεις δεν μετράνε
+    def queue_position(self, index):
+        free = max(0, self.max_players - len(self.world.connected))
+        return index + 1 - free
+
+    # Σύνδεση στον κόσμο (νέος παίκτης ή επανασύνδεση)
+    def connect_player(self, pid):
+        if self.world.connect(pid):
+            # Στο journal μόνο οι συνδέσεις που αλλάζουν τον κόσμο, όχι οι επανασυνδέσεις
+            if self.journal is not None:
+                self.journal.connect(self.world.tick, pid)
+            self.rate_limits[pid] = TokenBucket(INPUT_RATE, INPUT_BURST)
+            self.start_session(pid)
+            spawn_index = self.world.next_spawn_index - 1
             print(f"Player {pid} CONNECTED at spawn {spawn_index}")
-
-            await control_socket.send_json({
-                "status": "ok",
-            })
-
-        # Αποσύνδεση παίκτη
-        elif typ == "disconnect":
-            print(f"Player {pid} DISCONNECTED")
-
-            if pid in connected:
-                connected.remove(pid)   # Αφαίρεση του παίκτη από την λίστα των συνδεδεμένων
-            if pid in players:
-                del players[pid]        # Αφαίρεση του παίκτη από τα δεδομένα
-
-            await control_socket.send_json({"status": "ok"})
-
-# Μέθοδος για το collision
-def collides_with_walls(x, y):
-    # Υπολογισμός ορίων του παίκτη
-    # με βάση το κέντρο του (x, y) και τις διαστάσεις του sprite
-    left   = x - PLAYER_WIDTH / 2
-    right  = x + PLAYER_WIDTH / 2
-    bottom = y - PLAYER_HEIGHT / 2
-    top    = y + PLAYER_HEIGHT / 2
-
-    # Έλεγχος σύγκρουσης με κάθε wall sprite
-    for wall in wall_list:
-        if (
-            right  > wall.left and      # ο παίκτης δεν είναι τελείως αριστερά
-            left   < wall.right and     # ο παίκτης δεν είναι τελείως δεξιά
-            top    > wall.bottom and    # ο παίκτης δεν είναι τελείως κάτω
-            bottom < wall.top           # ο παίκτης δεν είναι τελείως πάνω
-        ):
-            return True
-
-    return False
-
-# Μέθοδος για τα inputs
-async def handle_inputs():
-    while True:
-        msg = await pull_socket.recv_json() # Λαμβάνει τα μηνύματα κίνησης από τους πελάτες
+            self.events.post(TOPIC_SYSTEM, f"{pid} joined", id=pid)
+        else:
+            self.acked_seqs.pop(pid, None)      # Τα seq ξεκινάνε από την αρχή
+            self.touch(pid)
+
+    # Είσοδος από την ουρά όσων χωράνε, το πολύ ADMIT_PER_TICK ανά tick
+    def admit(self):
+        queue = self.login_queue
+        admitted = 0
+        while queue and admitted < ADMIT_PER_TICK and len(self.world.connected) < self.max_players:
+            pid, (identity, protocol, req) = queue.popitem(last=False)
+            self.connect_player(pid)
+            self.set_protocol(pid, protocol)
+            self.control_outbox.append((identity, self.accepted(pid, protocol, req)))
+            admitted += 1
+
+        # Περιοδικά η θέση στην ουρά για όσους περιμένουν ακόμα
+        if queue and self.world.tick % self.queue_update_ticks == 0:
+            for index, (identity, _, req) in enumerate(queue.values()):
+                position = self.queue_position(index)
+                if position > 0:
+                    self.control_outbox.append((identity, {"status": "queued", "position": position, "req": req}))
+
+    def set_protocol(self, pid, protocol):
+        old = self.protocols.get(pid)
+        if old == PROTOCOL_JSON:
+            self.json_clients -= 1
+        if protocol == PROTOCOL_JSON:
+            self.json_clients += 1
+        if protocol is None:
+            self.protocols.pop(pid, None)
+        else:
+            self.protocols[pid] = protocol
+
+    # Αφαίρεση παίκτη από τον κόσμο και από την κατάσταση του adapter
+    def remove_player(self, pid, notice=True):
+        # Στο journal μόνο αποσυνδέσεις παικτών που ήταν πράγματι στον κόσμο
+        if pid in self.world.connected:
+            if self.journal is not None:
+                self.journal.disconnect(self.world.tick, pid)
+            if notice:
+                self.events.post(TOPIC_SYSTEM, f"{pid} left", id=pid)
+        self.world.disconnect(pid)
+        self.set_protocol(pid, None)
+        self.rate_limits.pop(pid, None)
+        self.acked_seqs.pop(pid, None)
+        self.last_seen.pop(pid, None)
+        self.timers.cancel(self.session_timers.pop(pid, None))
+
+    # Έναρξη session: timer που ελέγχει αν ο client είναι ακόμα ζωντανός
+    def start_session(self, pid):
+        self.last_seen[pid] = self.world.tick
+        self.session_timers[pid] = self.timers.schedule(self.timeout_ticks, self.check_session, pid)
+
+    # Παίκτες που επανήλθαν από checkpoint: αν δεν ξανασυνδεθούν μέσα στο timeout, αποσυνδέονται
+    def restore_sessions(self):
+        for pid in self.world.connected:
+            self.rate_limits[pid] = TokenBucket(INPUT_RATE, INPUT_BURST)
+            self.start_session(pid)
+
+    # Ξεκινάει εγγραφή checkpoint στο παρασκήνιο (αν δεν τρέχει ήδη μία)
+    def save_checkpoint(self):
+        if self.checkpoint_task is not None and not self.checkpoint_task.done():
+            return
+        state = capture(self.world)
+        loop = asyncio.get_running_loop()
+        self.checkpoint_task = loop.run_in_executor(None, write_checkpoint, self.checkpoint_path, state)
+        self.checkpoint_task.add_done_callback(self.checkpoint_done)
+
+    def checkpoint_done(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[Checkpoint] write failed: {task.exception()}")
+
+    # Κάθε μήνυμα από τον client τον κρατάει ζωντανό (O(1), χωρίς αλλαγή στον τροχό)
+    def touch(self, pid):
+        if pid in self.last_seen:
+            self.last_seen[pid] = self.world.tick
+
+    # Καλείται όταν λήξει το timer: αν υπήρξε κίνηση στο μεταξύ, ξαναπρογραμματίζουμε για το υπόλοιπο
+    def check_session(self, pid):
+        last_seen = self.last_seen.get(pid)
+        if last_seen is None:
+            return
+
+        silent = self.world.tick - last_seen
+        if silent >= self.timeout_ticks:
+            print(f"Player {pid} TIMED OUT after {silent * self.world.tick_dt:.1f}s")
+            self.evicted += 1
+            self.remove_player(pid)
+        else:
+            self.session_timers[pid] = self.timers.schedule(
+                self.timeout_ticks - silent, self.check_session, pid
+            )
+
+    # Παίκτες που έρχονται από άλλη περιοχή: μπαίνουν στη θέση άφιξης και περιμένουν τον client
+    async def handle_handoffs(self):
+        if self.handoff_socket is None:
+            return
+        while True:
+            msg = await self.handoff_socket.recv_json()
+            self.on_handoff(msg)
+
+    def on_handoff(self, msg):
+        pid = msg["id"]
+        x, y = resolve_arrival(msg["x"], msg["y"], self.world.map.width, self.world.map.height)
+
+        if self.journal is not None:
+            self.journal.handoff(self.world.tick, pid, x, y)
+
+        self.handoffs_in += 1
+        if self.world.place_player(pid, x, y):
+            self.rate_limits[pid] = TokenBucket(INPUT_RATE, INPUT_BURST)
+            self.start_session(pid)     # Αν ο client δεν έρθει μέσα στο timeout, αποσυνδέεται
+            print(f"Player {pid} HANDED OFF from {msg.get('from')}")
+            self.events.post(TOPIC_GAME, f"{pid} arrived from {msg.get('from')}", id=pid, type="handoff")
+        else:
+            self.touch(pid)
+
+    # Παίκτες που μπήκαν σε μετάβαση περνάνε στην επόμενη περιοχή
+    async def check_transitions(self):
+        for transition in self.transitions:
+            for pid in self.world.players_touching(*transition.rect):
+                await self.hand_off(pid, transition)
+
+    async def hand_off(self, pid, transition):
+        target = REGIONS.get(transition.region)
+        if target is None:
+            return
+
+        peer = self.handoff_peers.get(target.name)
+        if peer is None:
+            peer = self.ctx.socket(zmq.PUSH)
+            peer.setsockopt(zmq.IMMEDIATE, 1)   # Χωρίς ζωντανό server στην άλλη περιοχή το send αποτυγχάνει
+            peer.connect(target.connect_addr(HANDOFF_PORT))
+            self.handoff_peers[target.name] = peer
+
+        x, y = self.world.players.get(pid)
+        ax, ay = transition.arrival(x, y)
+        try:
+            await peer.send_json({"id": pid, "x": ax, "y": ay, "from": self.region.name}, flags=zmq.NOBLOCK)
+        except zmq.Again:
+            return      # Η περιοχή δεν τρέχει: ο παίκτης μένει εδώ και ξαναδοκιμάζουμε στο επόμενο tick
+
+        # Ο client συνδέεται μόνος του στη νέα περιοχή όταν δει αυτό το μήνυμα
+        await self.pub_socket.send_multipart([HANDOFF_TOPIC, encode_json({"handoff": {"id": pid, "region": target.to_dict()}})])
+
+        print(f"Player {pid} HANDED OFF to {target.name}")
+        self.handoffs_out += 1
+        self.events.post(TOPIC_GAME, f"{pid} left for {target.name}", id=pid, type="handoff")
+        self.remove_player(pid, notice=False)
+
+    # Subscriptions από το XPUB (clients ή relays): ενεργοποιούν/σταματούν τη ροή των spectators
+    async def handle_subscriptions(self):
+        while True:
+            self.spectators.on_subscription(await self.pub_socket.recv())
+
+    # Μέθοδος για τα inputs: μόνο παραλαβή, η κίνηση εφαρμόζεται μέσα στο tick
+    async def handle_inputs(self):
+        while True:
+            raw = await self.pull_socket.recv()     # Λαμβάνει την κατάσταση πλήκτρων από τους πελάτες (δυαδικά ή JSON)
+            msg = decode_input(raw)
+            if msg is None:
+                self.malformed += 1
+            else:
+                self.on_input(msg)
+
+    def on_input(self, msg):
+        # Ίδιος έλεγχος για JSON και δυαδικά: ένα άκυρο πεδίο δεν πρέπει ποτέ να φτάσει στο tick
+        msg = check_input(msg)
+        if msg is None:
+            self.malformed += 1
+            return
         pid = msg["id"]
-        direction = msg["move"]
-
-        # Αγνοεί τις κινήσεις από παίκτες που δεν είναι συνδεδεμένοι
-        if pid not in players:
-            continue
-
-        p = players[pid]    # Παίκτης που στέλνει την κίνηση
-
-        # Κίνηση του παίκτη με βάση την εισερχόμενη εντολή
-        new_x = p["x"]
-        new_y = p["y"]
-
-        # Εφαρμογή κίνησης με βάση την εντολή που έστειλε ο client
-        if direction == "UP":
-            new_y += SPEED
-        elif direction == "DOWN":
-            new_y -= SPEED
-        elif direction == "LEFT":
-            new_x -= SPEED
-        elif direction == "RIGHT":
-            new_x += SPEED
-
-        # Περιορισμός της νέας θέσης ώστε ο παίκτης να μην βγει εκτός των ορίων του χάρτη
-        new_x = max(PLAYER_WIDTH / 2, min(new_x, MAP_WIDTH - PLAYER_WIDTH / 2))
-        new_y = max(PLAYER_HEIGHT / 2, min(new_y, MAP_HEIGHT - PLAYER_HEIGHT / 2))
-
-        # Έλεγχος collision
-        if not collides_with_walls(new_x, p["y"]):
-            p["x"] = new_x
-
-        if not collides_with_walls(p["x"], new_y):
-            p["y"] = new_y        
-
-# Μέθοδος για τη μετάδοση κατάστασης παιχνιδιού
-async def broadcast_state():
-    while True:
-        global tick
-        tick += 1       # Αύξηση του tick για κάθε frame
-
-        elapsed_time = time.time() - server_start_time
-
-        # Στέλνει την κατάσταση του παιχνιδιού σε όλους τους πελάτες
-        await pub_socket.send_json({
-            "tick": tick,
-            "tick_dt": TICK_DT,             # Διάρκεια κάθε "tick"
-            "players": dict(players),             # Κατάσταση των παικτών
-            "elapsed_time": elapsed_time    # Χρόνος που έχει περάσει από την έναρξη
-        })
 
-        await asyncio.sleep(TICK_DT)  # 50 FPS, ρυθμός ανανέωσης 20ms
+        # Αγνοεί τα inputs από παίκτες που δεν είναι συνδεδεμένοι
+        bucket = self.rate_limits.get(pid)
+        if bucket is None:
+            return
+
+        # Token bucket: ένας client που πλημμυρίζει τον server χάνει τα επιπλέον μηνύματα
+        if not bucket.consume():
+            self.rate_limited += 1
+            return
+
+        self.touch(pid)
+
+        # Heartbeat: μόνο για liveness, δεν είναι input
+        if msg.get("hb"):
+            return
+
+        # Στο journal μόνο τα inputs που δέχτηκε ο κόσμος (το replay δεν ξαναελέγχει τα seq,
+        # που ξεκινάνε από την αρχή σε κάθε επανασύνδεση)
+        if self.world.apply_input(pid, msg) and self.journal is not None:
+            self.journal.input(self.world.tick, pid, msg)
+
+    # Μέθοδος για τη μετάδοση κατάστασης παιχνιδιού
+    async def broadcast_state(self):
+        # Στέλνει κάθε ροή (κελί και tier) στο topic της: το ZeroMQ την παραδίδει μόνο σε όσους κοιτάνε εκεί
+        for stream, state in self.state_messages():
+            await self.pub_socket.send_multipart([stream_topic(STATE_BINARY, stream), self.cell_encoders[stream].encode(state)])
+            if self.json_clients:
+                await self.pub_socket.send_multipart([stream_topic(STATE_JSON, stream), encode_json(state)])
+
+        # Spectators: ένα μήνυμα για όλο τον κόσμο, κοινό για όλους, κάθε SPECTATOR_EVERY ticks
+        tick = self.world.tick
+        if self.spectators.watching and self.spectators.due(tick):
+            data = self.spectators.encode(tick, self.state_sections(), self.state_extra())
+            await self.pub_socket.send_multipart([SPECTATOR_TOPIC, data])
+
+    # Λίστα από ((tier, κελί), delta μήνυμα) για τις ροές που έχουν κάτι να στείλουν σε αυτό το tick
+    def state_messages(self):
+        inputs = self.world.player_inputs
+        acked = self.acked_seqs
+
+        # Παίκτες που ο server εφάρμοσε νέο seq από το τελευταίο ack: το ack φεύγει σε αυτό το tick,
+        # στην κοντινή ροή του κελιού τους, ακόμα κι αν η θέση τους δεν άλλαξε. Πρώτα όσοι δεν έχουν
+        # πάρει ποτέ ack και μετά όσοι περιμένουν περισσότερο, ώστε το ACK_LIMIT να μην αφήνει κανέναν πίσω
+        cell_of = self.cells.cell
+        positions = self.world.players
+        advanced = {}
+        for pid, applied in inputs.items():
+            if applied["seq"] >= 0 and pid not in acked:
+                advanced.setdefault(cell_of(*positions.get(pid)), []).append(pid)
+        for pid, seq in acked.items():
+            applied = inputs.get(pid)
+            if applied is not None and applied["seq"] != seq:
+                advanced.setdefault(cell_of(*positions.get(pid)), []).append(pid)
+
+        messages = self.cells.encode(self.world.tick, self.state_sections(), advanced.keys())
+        extra = self.state_extra()
+        for (tier, cell), state in messages:
+            state.update(extra)
+
+            # Acks για το prediction: ποιο input (seq) έχει εφαρμοστεί και από ποιο tick, για κάθε παίκτη με
+            # νέο seq και, αν μένει χώρος, με θέση σε αυτό το μήνυμα. Ο δικός του παίκτης είναι πάντα σε
+            # κοντινή ροή, οι μακρινές δεν τα χρειάζονται
+            if tier != TIER_NEAR:
+                continue
+            acks = {}
+            for pid in advanced.get(cell, ()):
+                if len(acks) == ACK_LIMIT:
+                    break
+                applied = inputs[pid]
+                acks[pid] = (applied["seq"], applied["tick"])
+            for pid in state.get("players", ()):
+                if len(acks) == ACK_LIMIT:
+                    break
+                applied = inputs.get(pid)
+                if applied is not None and applied["seq"] >= 0 and pid not in acks:
+                    acks[pid] = (applied["seq"], applied["tick"])
+            if acks:
+                state["acks"] = acks
+                for pid, (seq, _) in acks.items():
+                    acked.pop(pid, None)    # Στο τέλος της σειράς
+                    acked[pid] = seq
+        return messages
+
+    # Οντότητες ανά section ως (id, x, y)
+    def state_sections(self):
+        return {
+            "players": self.world.players.items(),
+            "mobs": self.world.mobs.store.items(),
+        }
+
+    def state_extra(self):
+        extra = {
+            "tick_dt": self.world.tick_dt,
+            "elapsed_time": time.time() - self.server_start_time   # Χρόνος που έχει περάσει από την έναρξη
+        }
+        if self.region is not None:
+            extra["region"] = self.region.name
+        return extra
+
+    # Μηνύματα που περιμένουν εκτός asyncio (μόνο στη λειτουργία πολλών processes)
+    def receive(self):
+        pass
+
+    # Κεντρικό loop προσομοίωσης: inputs → κίνηση → broadcast, μία φορά ανά tick
+    async def game_loop(self):
+        scheduler = self.scheduler
+        scheduler.start()
+        next_stats = time.monotonic() + STATS_INTERVAL
+
+        while True:
+            await scheduler.wait_next_tick()    # Περιμένουμε το deadline του tick (50 Hz)
+            self.current_tick = self.world.tick + 1
+
+            self.receive()
+            self.timers.advance()               # Καθυστερημένα γεγονότα (π.χ. λήξη sessions)
+            self.admit()                        # Είσοδος παικτών από την ουρά, αν υπάρχουν θέσεις
+            await self.flush_control()
+            self.world.step()                   # Inputs και κίνηση
+            if self.journal is not None:
+                self.journal.after_step(self.world)     # Περιοδικό digest της κατάστασης
+            if self.transitions:
+                await self.check_transitions()  # Handoff παικτών σε γειτονικές περιοχές
+            if self.checkpoint_path and self.world.tick % self.checkpoint_ticks == 0:
+                self.save_checkpoint()
+            await self.broadcast_state()        # Μετάδοση της νέας κατάστασης
+
+            scheduler.end_tick()
+
+            # Περιοδική εκτύπωση στατιστικών αν κάποια ticks ξεπέρασαν το όριο
+            if time.monotonic() >= next_stats:
+                next_stats += STATS_INTERVAL
+                self.print_stats()
+
+    def print_stats(self):
+        stats = self.scheduler.stats()
+        if stats["overruns"] or stats["skipped_ticks"]:
+            print(
+                f"[Tick] rate={stats['rate']:.1f}Hz overruns={stats['overruns']} "
+                f"skipped={stats['skipped_ticks']} max={stats['max_tick_ms']:.1f}ms "
+                f"avg={stats['avg_tick_ms']:.2f}ms rate_limited={self.rate_limited} malformed={self.malformed} "
+                f"dropped_inputs={self.world.dropped_inputs} evicted={self.evicted} "
+                f"deferred={self.cells.deferred}"
+            )
+        events = self.events
+        if events.rate_limited or events.rejected:
+            print(
+                f"[Events] received={events.received} frames={events.frames} "
+                f"rate_limited={events.rate_limited} rejected={events.rejected}"
+            )
+        if self.login_queue or self.rejected:
+            print(
+                f"[Login] players={len(self.world.connected)}/{self.max_players} "
+                f"queued={len(self.login_queue)} rejected={self.rejected}"
+            )
+
+    def close(self):
+        self.events.stop()
+        if self.ctx is not None:
+            self.ctx.destroy(linger=0)
+
+    async def run(self):
+        await asyncio.gather(
+            self.handle_control(),      # Επεξεργασία αιτημάτων σύνδεσης/αποσύνδεσης
+            self.handle_inputs(),       # Παραλαβή των κινήσεων των παικτών
+            self.handle_handoffs(),     # Παίκτες από γειτονικές περιοχές
+            self.handle_subscriptions(),    # Ποια topics του PUB ζητάει κάποιος (spectators)
+            self.game_loop()            # Προσομοίωση και μετάδοση της κατάστασης ανά tick
+        )
+
+# Η προσομοίωση σε δικό της process: τα sockets και το JSON ζουν στα network workers,
+# και inputs/καταστάσεις περνάνε από ring buffers σε shared memory
+class SharedMemoryServer(GameServer):
+    def __init__(self, world, journal=None, checkpoint_path=None, max_players=MAX_PLAYERS):
+        super().__init__(world, journal, checkpoint_path, max_players=max_players)
+        self.inputs = SharedRing.create()           # ingress → προσομοίωση
+        self.replies = SharedRing.create(1 << 20)   # προσομοίωση → ingress ((identity, απάντηση) control)
+        self.states = SharedRing.create(1 << 24)    # προσομοίωση → egress
+        self.workers = []
+
+    def bind(self):
+        self.workers = [
+            multiprocessing.Process(
+                target=ingress_worker,
+                args=(self.inputs.name, self.replies.name, PULL_ADDR, CONTROL_ADDR),
+                name="ingress", daemon=True
+            ),
+            multiprocessing.Process(
+                target=egress_worker,
+                args=(self.states.name, PUB_ADDR, self.cell_encoders.scale, self.spectators.every),
+                name="egress", daemon=True
+            ),
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.events.start()
+
+    # Όλα τα μηνύματα που έφτασαν από το προηγούμενο tick
+    def receive(self):
+        for data in self.inputs.drain():
+            kind, msg = marshal.loads(data)
+            if kind == INPUT:
+                self.on_input(msg)
+            elif kind == CONTROL:
+                identity, request = msg
+                reply = self.on_control(identity, request)
+                if reply is not None:
+                    self.replies.put(marshal.dumps((identity, reply)))
+
+    # Οι απαντήσεις control τις στέλνει το ingress process
+    async def send_control(self, identity, reply):
+        self.replies.put(marshal.dumps((identity, reply)))
+
+    async def broadcast_state(self):
+        # Η κωδικοποίηση (δυαδική και, αν χρειάζεται, JSON) γίνεται στο egress process. Τα subscriptions
+        # τα βλέπει μόνο το egress, οπότε οι θέσεις για τους spectators πάνε πάντα (κάθε SPECTATOR_EVERY ticks)
+        # και το egress αποφασίζει αν θα τις κωδικοποιήσει
+        tick = self.world.tick
+        spectator = None
+        if self.spectators.due(tick):
+            sections = {name: list(items) for name, items in self.state_sections().items()}
+            spectator = (tick, sections, self.state_extra())
+        self.states.put(marshal.dumps((self.state_messages(), self.json_clients > 0, spectator)))
+
+    def print_stats(self):
+        super().print_stats()
+        if self.states.dropped or self.replies.dropped:
+            print(f"[Rings] dropped states={self.states.dropped} replies={self.replies.dropped}")
+
+    async def run(self):
+        await self.game_loop()
+
+    def close(self):
+        super().close()
+        for worker in self.workers:
+            worker.terminate()
+            worker.join()
+        for ring in (self.inputs, self.replies, self.states):
+            ring.close()
 
 async def main():
-    await asyncio.gather(
-        handle_control(),       # Επεξεργασία αιτημάτων σύνδεσης/αποσύνδεσης
-        handle_inputs(),        # Επεξεργασία των κινήσεων των παικτών
-        broadcast_state()       # Μετάδοση της κατάστασης του παιχνιδιού
-    )
+    parser = argparse.ArgumentParser(description="Game server")
+    parser.add_argument("--journal", default=None, help="Καταγραφή όλων των inputs σε αρχείο για replay.py")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="Αρχείο checkpoint της κατάστασης")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Χωρίς checkpoints και επαναφορά")
+    parser.add_argument("--processes", action="store_true", help="Sockets/JSON σε ξεχωριστά processes από την προσομοίωση")
+    parser.add_argument("--region", default=None, choices=sorted(REGIONS), help="Τρέχει μόνο αυτή την περιοχή του κόσμου")
+    parser.add_argument("--empty", default=None, help="Άδειος χάρτης WxH σε pixels αντί για TMX (τοπικές δοκιμές)")
+    parser.add_argument("--max-players", type=int, default=MAX_PLAYERS, help="Όριο παικτών, οι υπόλοιποι περιμένουν σε ουρά")
+    args = parser.parse_args()
+
+    region = REGIONS[args.region] if args.region else None
+    if region is not None and args.processes:
+        parser.error("--region is not supported together with --processes")
+
+    map_path = region.map_path if region is not None else MAP_PATH
+    empty = None
+    if args.empty:
+        empty = [int(v) for v in args.empty.lower().split("x")]
+        game_map = empty_map(*empty)
+    else:
+        game_map = load_map(map_path)
+        print("Spawn points loaded from map:", game_map.spawn_points)
+
+    # Κάθε περιοχή κρατάει το δικό της checkpoint
+    if region is not None and args.checkpoint == CHECKPOINT_PATH:
+        args.checkpoint = f"checkpoint-{region.name}.bin"
+
+    seed = 0
+    world = GameWorld(game_map, TICK_DT, mob_count=MOB_COUNT, seed=seed)
+
+    # Επαναφορά από το τελευταίο checkpoint, ώστε οι clients να συνεχίσουν από εκεί που ήταν
+    checkpoint_path = None if args.no_checkpoint else args.checkpoint
+    state = read_checkpoint(checkpoint_path) if checkpoint_path else None
+    restored = None
+    if state is not None and (state["width"], state["height"]) == (int(game_map.width), int(game_map.height)):
+        start = time.perf_counter()
+        world.restore(state["tick"], state["next_spawn_index"], state["players"])
+        restored = {key: state[key] for key in ("tick", "next_spawn_index", "players")}
+        age = time.time() - state["saved_at"]
+        print(
+            f"Restored {len(state['players'])} players from {checkpoint_path} "
+            f"(tick {state['tick']}, {age:.0f}s old) in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    journal = None
+    if args.journal:
+        journal = JournalWriter(args.journal, {
+            "map": map_path, "empty": empty, "tick_dt": TICK_DT, "mob_count": MOB_COUNT, "seed": seed,
+            "restore": restored     # Κατάσταση checkpoint από την οποία ξεκίνησε ο κόσμος
+        })
+        print(f"Journaling inputs to {args.journal}")
+
+    if region is not None:
+        server = GameServer(world, journal, checkpoint_path, region, args.max_players)
+        print(f"Region {region.name} on ports {region.base_port}-{region.base_port + EVENT_PORT}")
+    elif args.processes:
+        server = SharedMemoryServer(world, journal, checkpoint_path, args.max_players)
+    else:
+        server = GameServer(world, journal, checkpoint_path, max_players=args.max_players)
+    server.restore_sessions()
+    server.bind()
+    try:
+        await server.run()
+    finally:
+        server.close()
+        if journal is not None:
+            journal.close(world)
+        if checkpoint_path:
+            write_checkpoint(checkpoint_path, capture(world))     # Τελικό checkpoint στο κλείσιμο
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
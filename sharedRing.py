@@ -0,0 +1,105 @@
+# Ring buffer ενός παραγωγού / ενός καταναλωτή πάνω σε multiprocessing.shared_memory
+#
+# Τα μηνύματα γράφονται ως (μήκος 4 bytes, payload) σε κυκλικό buffer. Ο παραγωγός γράφει
+# μόνο το head και ο καταναλωτής μόνο το tail, οπότε δεν χρειάζεται κλείδωμα: ο παραγωγός
+# ενημερώνει το head αφού γράψει ολόκληρο το μήνυμα. Αν ο buffer είναι γεμάτος το μήνυμα
+# απορρίπτεται (put → False), ο παραγωγός δεν περιμένει ποτέ τον καταναλωτή.
+
+import struct
+from multiprocessing import shared_memory
+
+RING_SIZE = 1 << 22     # Χωρητικότητα σε bytes (4 MB)
+
+COUNTER = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+
+HEAD_OFFSET = 0         # Συνολικά bytes που έχουν γραφτεί (μόνο ο παραγωγός)
+TAIL_OFFSET = 64        # Συνολικά bytes που έχουν διαβαστεί (μόνο ο καταναλωτής), σε άλλη cache line
+DATA_OFFSET = 128
+
+class SharedRing:
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.buf = shm.buf
+        self.owner = owner      # Ο δημιουργός κάνει και unlink
+        self.capacity = shm.size - DATA_OFFSET
+        self.dropped = 0        # Μηνύματα που απορρίφθηκαν επειδή ο buffer ήταν γεμάτος
+
+    @classmethod
+    def create(cls, size=RING_SIZE):
+        shm = shared_memory.SharedMemory(create=True, size=size + DATA_OFFSET)
+        shm.buf[:DATA_OFFSET] = bytes(DATA_OFFSET)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _head(self):
+        return COUNTER.unpack_from(self.buf, HEAD_OFFSET)[0]
+
+    def _tail(self):
+        return COUNTER.unpack_from(self.buf, TAIL_OFFSET)[0]
+
+    def __len__(self):
+        return self._head() - self._tail()     # Bytes που περιμένουν
+
+    # Αντιγραφή στη θέση pos με αναδίπλωση στο τέλος του buffer
+    def _write(self, pos, data):
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        base = DATA_OFFSET + start
+        self.buf[base:base + first] = data[:first]
+        if first < len(data):
+            rest = len(data) - first
+            self.buf[DATA_OFFSET:DATA_OFFSET + rest] = data[first:]
+
+    def _read(self, pos, size):
+        start = pos % self.capacity
+        first = min(size, self.capacity - start)
+        base = DATA_OFFSET + start
+        if first == size:
+            return bytes(self.buf[base:base + size])
+        return bytes(self.buf[base:base + first]) + bytes(self.buf[DATA_OFFSET:DATA_OFFSET + size - first])
+
+    # Παραγωγός: προσθήκη μηνύματος, False αν δεν χωράει
+    def put(self, data):
+        size = LENGTH.size + len(data)
+        head = self._head()
+        if size > self.capacity - (head - self._tail()):
+            self.dropped += 1
+            return False
+
+        self._write(head, LENGTH.pack(len(data)))
+        self._write(head + LENGTH.size, memoryview(data))
+        COUNTER.pack_into(self.buf, HEAD_OFFSET, head + size)     # Το μήνυμα γίνεται ορατό μόνο τώρα
+        return True
+
+    # Καταναλωτής: το επόμενο μήνυμα ή None αν ο buffer είναι άδειος
+    def get(self):
+        tail = self._tail()
+        if tail == self._head():
+            return None
+
+        size = LENGTH.unpack(self._read(tail, LENGTH.size))[0]
+        data = self._read(tail + LENGTH.size, size)
+        COUNTER.pack_into(self.buf, TAIL_OFFSET, tail + LENGTH.size + size)
+        return data
+
+    # Όλα τα μηνύματα που υπάρχουν αυτή τη στιγμή
+    def drain(self):
+        while True:
+            data = self.get()
+            if data is None:
+                return
+            yield data
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,129 @@
+# Ιστορικό θέσεων των τελευταίων N ticks (ring buffer)
+#
+# Για κάθε tick αντιγράφουμε τους πίνακες θέσεων του store σε μια προδεσμευμένη γραμμή
+# (row = tick % N). Δεν δεσμεύεται μνήμη ανά tick και δεν αντιγράφονται dicts, μόνο μνήμη
+# σε μνήμη. Το generation κάθε slot ξεχωρίζει έναν παίκτη από τον επόμενο που πήρε το ίδιο slot.
+#
+# Χρήσεις: lag compensation ("πού ήταν ο E στο tick T") και deltas ως προς παλιότερο baseline.
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:     # Το NumPy είναι προαιρετικό
+    np = None
+
+HISTORY_TICKS = 64      # Πόσα ticks κρατάμε (64 × 20ms ≈ 1.3 δευτερόλεπτα)
+
+class SnapshotHistory:
+    def __init__(self, store, length=HISTORY_TICKS):
+        self.store = store
+        self.length = length
+        self.capacity = 0
+
+        # Με NumPy store κρατάμε 2D πίνακες (length × capacity), αλλιώς επίπεδα arrays
+        self.vectorized = np is not None and isinstance(store.x, np.ndarray)
+
+        self.ticks = array("q", [-1] * length)     # Ποιο tick είναι αποθηκευμένο σε κάθε γραμμή
+        self._allocate(store.capacity)
+
+    def _allocate(self, capacity):
+        old = self.capacity
+        length = self.length
+
+        if self.vectorized:
+            def grow(arr, dtype):
+                new = np.zeros((length, capacity), dtype=dtype)
+                if old:
+                    new[:, :old] = arr
+                return new
+
+            self.x = grow(getattr(self, "x", None), np.float64)
+            self.y = grow(getattr(self, "y", None), np.float64)
+            self.gen = grow(getattr(self, "gen", None), np.uint32)
+            self.alive = grow(getattr(self, "alive", None), np.bool_)
+        else:
+            def grow(arr, typecode, itemsize):
+                new = array(typecode, bytes(itemsize * length * capacity))
+                for row in range(length if old else 0):
+                    new[row * capacity:row * capacity + old] = arr[row * old:(row + 1) * old]
+                return new
+
+            self.x = grow(getattr(self, "x", None), "d", 8)
+            self.y = grow(getattr(self, "y", None), "d", 8)
+            self.gen = grow(getattr(self, "gen", None), "I", 4)
+            alive = bytearray(length * capacity)
+            for row in range(length if old else 0):
+                alive[row * capacity:row * capacity + old] = self.alive[row * old:(row + 1) * old]
+            self.alive = alive
+
+        self.capacity = capacity
+
+    # Αποθήκευση της κατάστασης του store για το tick (μόνο αντιγραφή πινάκων)
+    def record(self, tick):
+        store = self.store
+        if store.capacity != self.capacity:
+            self._allocate(store.capacity)     # Σπάνιο: μόνο όταν μεγαλώσει το store
+
+        row = tick % self.length
+        self.ticks[row] = tick
+
+        if self.vectorized:
+            self.x[row] = store.x
+            self.y[row] = store.y
+            self.gen[row] = store.gen
+            self.alive[row] = store.alive
+        else:
+            cap = self.capacity
+            base = row * cap
+            self.x[base:base + cap] = store.x
+            self.y[base:base + cap] = store.y
+            self.gen[base:base + cap] = store.gen
+            self.alive[base:base + cap] = store.alive
+
+    def has_tick(self, tick):
+        return self.ticks[tick % self.length] == tick
+
+    # Ticks που υπάρχουν στο ιστορικό (το παλαιότερο και το νεότερο)
+    def tick_range(self):
+        stored = [t for t in self.ticks if t >= 0]
+        if not stored:
+            return None
+        return min(stored), max(stored)
+
+    # Θέση του slot στο tick, αν το ίδιο entity (generation) υπήρχε τότε
+    def _slot_position(self, slot, gen, tick):
+        row = tick % self.length
+        if self.ticks[row] != tick or slot >= self.capacity:
+            return None
+
+        if self.vectorized:
+            if not self.alive[row, slot] or self.gen[row, slot] != gen:
+                return None
+            return float(self.x[row, slot]), float(self.y[row, slot])
+
+        i = row * self.capacity + slot
+        if not self.alive[i] or self.gen[i] != gen:
+            return None
+        return self.x[i], self.y[i]
+
+    # "Πού ήταν ο pid στο tick"; Για μη ακέραιο tick κάνουμε interpolation ανάμεσα στα δύο ticks
+    def position_at(self, pid, tick):
+        store = self.store
+        slot = store.slot_of(pid)
+        if slot is None:
+            return None
+        gen = store.gen[slot]
+
+        t0 = math.floor(tick)
+        p0 = self._slot_position(slot, gen, t0)
+        if t0 == tick or p0 is None:
+            return p0
+
+        p1 = self._slot_position(slot, gen, t0 + 1)
+        if p1 is None:
+            return p0
+
+        a = tick - t0
+        return p0[0] + (p1[0] - p0[0]) * a, p0[1] + (p1[1] - p0[1]) * a
@@ -0,0 +1,155 @@
+# Spatial hash (ομοιόμορφο πλέγμα) για γρήγορες ερωτήσεις γειτνίασης
+#
+# Κάθε οντότητα (παίκτης, mob, ...) μπαίνει στο κελί του κέντρου της. Οι ερωτήσεις
+# ελέγχουν μόνο τα κελιά γύρω από την περιοχή που ζητάμε, όχι όλες τις οντότητες (O(n²)).
+# Η ενημέρωση είναι incremental: αλλάζουμε κελί μόνο όταν η οντότητα περάσει σε άλλο.
+
+import math
+
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}         # (cx, cy) → set από keys
+        self.entries = {}       # key → [x, y, half_w, half_h, cell]
+
+        # Μέγιστο μισό μέγεθος κουτιού, για να ξέρουμε πόσο να "φουσκώσουμε" τις ερωτήσεις
+        self.max_half_w = 0.0
+        self.max_half_h = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def _cell(self, x, y):
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size))
+
+    # Προσθήκη οντότητας με κέντρο (x, y) και κουτί width × height
+    def insert(self, key, x, y, width=0.0, height=0.0):
+        if key in self.entries:
+            self.remove(key)
+
+        half_w = width / 2
+        half_h = height / 2
+        self.max_half_w = max(self.max_half_w, half_w)
+        self.max_half_h = max(self.max_half_h, half_h)
+
+        cell = self._cell(x, y)
+        self.entries[key] = [x, y, half_w, half_h, cell]
+        self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        bucket = self.cells.get(entry[4])
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[entry[4]]
+
+    # Μετακίνηση οντότητας, αλλάζει κελί μόνο αν χρειάζεται
+    def update(self, key, x, y):
+        entry = self.entries[key]
+        entry[0] = x
+        entry[1] = y
+
+        cell = self._cell(x, y)
+        if cell != entry[4]:
+            bucket = self.cells[entry[4]]
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[entry[4]]
+            self.cells.setdefault(cell, set()).add(key)
+            entry[4] = cell
+
+    def position(self, key):
+        entry = self.entries[key]
+        return entry[0], entry[1]
+
+    # Keys στα κελιά που καλύπτει το ορθογώνιο (υποψήφιοι, χωρίς ακριβή έλεγχο)
+    def _candidates(self, left, bottom, right, top):
+        cx0, cy0 = self._cell(left, bottom)
+        cx1, cy1 = self._cell(right, top)
+        cells = self.cells
+
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    # Οντότητες με κέντρο μέσα στο ορθογώνιο
+    def query_rect(self, left, bottom, right, top):
+        entries = self.entries
+        result = []
+        for key in self._candidates(left, bottom, right, top):
+            x, y = entries[key][0], entries[key][1]
+            if left <= x <= right and bottom <= y <= top:
+                result.append(key)
+        return result
+
+    # Οντότητες με κέντρο σε απόσταση ≤ radius από το (x, y)
+    def query_radius(self, x, y, radius):
+        entries = self.entries
+        r2 = radius * radius
+        result = []
+        for key in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            entry = entries[key]
+            dx = entry[0] - x
+            dy = entry[1] - y
+            if dx * dx + dy * dy <= r2:
+                result.append(key)
+        return result
+
+    # Η πλησιέστερη οντότητα σε απόσταση ≤ radius (ή None)
+    def nearest(self, x, y, radius, exclude=None):
+        best = None
+        best_d2 = radius * radius
+        entries = self.entries
+        for key in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            if key == exclude:
+                continue
+            entry = entries[key]
+            dx = entry[0] - x
+            dy = entry[1] - y
+            d2 = dx * dx + dy * dy
+            if d2 <= best_d2:
+                best = key
+                best_d2 = d2
+        return best
+
+    # Οντότητες που το κουτί τους τέμνει το κουτί (left, bottom, right, top)
+    def query_boxes(self, left, bottom, right, top, exclude=None):
+        entries = self.entries
+        cells = self.cells
+        size = self.cell_size
+        result = []
+
+        cx0 = math.floor((left - self.max_half_w) / size)
+        cx1 = math.floor((right + self.max_half_w) / size)
+        cy0 = math.floor((bottom - self.max_half_h) / size)
+        cy1 = math.floor((top + self.max_half_h) / size)
+
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    if key == exclude:
+                        continue
+                    x, y, half_w, half_h, _ = entries[key]
+                    if right > x - half_w and left < x + half_w and top > y - half_h and bottom < y + half_h:
+                        result.append(key)
+        return result
+
+    # Οντότητες που θα τέμνονταν με το κουτί του key αν αυτό βρισκόταν στο (x, y)
+    def overlapping(self, key, x, y):
+        entry = self.entries[key]
+        half_w = entry[2]
+        half_h = entry[3]
+        return self.query_boxes(x - half_w, y - half_h, x + half_w, y + half_h, exclude=key)
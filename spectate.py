@@ -0,0 +1,103 @@
+# Spectator χωρίς γραφικά: παρακολουθεί όλο τον κόσμο από τη ροή των spectators (spectatorStream.py)
+#
+# Κάνει "spectate" στο control (χωρίς να μπει στον κόσμο), subscribe στο SPECTATOR_TOPIC και κρατάει
+# την κατάσταση με StateDecoder + DeltaDecoder. Τυπώνει περιοδικά στατιστικά, και με --dump γράφει
+# μία γραμμή JSON ανά μήνυμα με όλες τις θέσεις (για overlays, καταγραφή αγώνων κ.λπ.):
+#     python spectate.py
+#     python spectate.py --region secondRegion --state tcp://127.0.0.1:5610    # μέσα από relay
+#     python spectate.py --dump match.jsonl
+
+import argparse
+import json
+import time
+import uuid
+import zmq
+from deltaSnapshot import DeltaDecoder
+from regions import REGIONS, START_REGION, STATE_PORT, CONTROL_PORT
+from wireProtocol import StateDecoder, PROTOCOL_BINARY, SPECTATOR_TOPIC
+
+CONTROL_TIMEOUT_MS = 3000   # Μέγιστη αναμονή για την απάντηση του spectate
+STATS_INTERVAL = 5.0        # Κάθε πόσα δευτερόλεπτα τυπώνουμε τι βλέπουμε
+
+# Αίτημα spectate. Επιστρέφει την απάντηση του server, None αν δεν απάντησε
+def request_spectate(ctx, control_addr):
+    control = ctx.socket(zmq.DEALER)
+    control.connect(control_addr)
+    try:
+        request = {"type": "spectate", "id": f"spectator-{uuid.uuid4().hex[:8]}", "protocols": [PROTOCOL_BINARY], "req": 1}
+        control.send_multipart([b"", json.dumps(request).encode()])
+        if not control.poll(CONTROL_TIMEOUT_MS):
+            return None
+        return json.loads(control.recv_multipart()[-1])
+    finally:
+        control.close(linger=0)
+
+def run_spectator(region, state_addr=None, dump_path=None, stats_interval=STATS_INTERVAL):
+    ctx = zmq.Context()
+    reply = request_spectate(ctx, region.connect_addr(CONTROL_PORT))
+    if reply is None or reply.get("status") != "ok":
+        print(f"[Spectate] {region.name}: no spectator stream ({reply})")
+        ctx.destroy(linger=0)
+        return
+
+    topic = reply["topic"].encode()
+    sub = ctx.socket(zmq.SUB)
+    sub.connect(state_addr or region.connect_addr(STATE_PORT))
+    sub.setsockopt(zmq.SUBSCRIBE, topic)
+    print(f"[Spectate] {region.name} at {reply['rate']:.0f} Hz, map {reply['width']:.0f}x{reply['height']:.0f}")
+
+    wire = StateDecoder()
+    state = DeltaDecoder()
+    dump = open(dump_path, "w") if dump_path else None
+
+    messages = 0
+    size = 0
+    next_stats = time.monotonic() + stats_interval
+    try:
+        while True:
+            if sub.poll(int(stats_interval * 1000)):
+                frames = sub.recv_multipart()
+                if frames[0] != SPECTATOR_TOPIC:
+                    continue
+                messages += 1
+                size += len(frames[1])
+
+                msg = wire.decode(frames[1])
+                # Πριν το πρώτο keyframe τα deltas δεν έχουν βάση
+                if msg is None or not state.apply(msg):
+                    continue
+                if dump is not None:
+                    dump.write(json.dumps({
+                        "tick": msg["tick"], "elapsed_time": msg["elapsed_time"],
+                        "players": state.sections["players"], "mobs": state.sections["mobs"]
+                    }) + "\n")
+
+            now = time.monotonic()
+            if now >= next_stats:
+                elapsed = stats_interval + (now - next_stats)
+                next_stats = now + stats_interval
+                print(
+                    f"[Spectate] tick={state.tick} players={len(state.sections['players'])} mobs={len(state.sections['mobs'])} "
+                    f"{messages / elapsed:.1f} msg/s {size / elapsed / 1000:.1f} KB/s"
+                )
+                messages = 0
+                size = 0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if dump is not None:
+            dump.close()
+        ctx.destroy(linger=0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Spectator: όλος ο κόσμος σε χαμηλό ρυθμό, χωρίς να μπούμε στο παιχνίδι")
+    parser.add_argument("--region", default=START_REGION, choices=sorted(REGIONS))
+    parser.add_argument("--state", default=None, help="Διεύθυνση της ροής (π.χ. relay.py), αλλιώς το PUB της περιοχής")
+    parser.add_argument("--dump", default=None, help="Αρχείο για μία γραμμή JSON ανά μήνυμα με όλες τις θέσεις")
+    parser.add_argument("--stats", type=float, default=STATS_INTERVAL, help="Δευτερόλεπτα ανάμεσα στα στατιστικά")
+    args = parser.parse_args()
+
+    run_spectator(REGIONS[args.region], args.state, args.dump, args.stats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Ροή για spectators: όλος ο κόσμος σε χαμηλό ρυθμό, κοινή για όλους όσους παρακολουθούν
+#
+# Ένας spectator δεν είναι παίκτης: κάνει "spectate" στο control (δεν μπαίνει στον κόσμο ούτε στην ουρά)
+# και subscribe στο SPECTATOR_TOPIC. Κάθε SPECTATOR_EVERY ticks ο server στέλνει ένα delta snapshot όλων
+# των οντοτήτων, δυαδικά με θέσεις σε ακέραια pixels. Το μήνυμα φτιάχνεται μία φορά για όλους, και μόνο
+# όταν υπάρχει subscriber: το PUB είναι XPUB, οπότε ο server βλέπει πότε μπαίνει ο πρώτος και πότε φεύγει
+# ο τελευταίος (και μέσα από relays). Με XPUB_VERBOSE φτάνει και κάθε επόμενο subscribe, οπότε κάθε νέος
+# spectator παίρνει keyframe στο επόμενο μήνυμα αντί να περιμένει το περιοδικό.
+
+from deltaSnapshot import DeltaEncoder
+from wireProtocol import StateEncoder, SPECTATOR_TOPIC
+
+SPECTATOR_EVERY = 5     # 50 Hz / 5 = 10 Hz
+SPECTATOR_SCALE = 1     # Βήματα ανά pixel (ακέραια pixels)
+
+class SpectatorStream:
+    def __init__(self, every=SPECTATOR_EVERY, scale=SPECTATOR_SCALE):
+        self.every = every
+        self.scale = scale
+        self.topics = set()     # Subscriptions (από το XPUB) που περιλαμβάνουν το SPECTATOR_TOPIC
+        self.delta = None       # DeltaEncoder/StateEncoder μόνο όσο κάποιος παρακολουθεί
+        self.encoder = None
+
+    # Μήνυμα subscription του XPUB: 1 + topic (subscribe) ή 0 + topic (unsubscribe)
+    def on_subscription(self, msg):
+        topic = msg[1:]
+        if not SPECTATOR_TOPIC.startswith(topic):
+            return
+        if msg[:1] == b"\x01":
+            self.topics.add(topic)
+        elif msg[:1] == b"\x00":
+            self.topics.discard(topic)
+
+        if self.topics and self.delta is None:
+            self.delta = DeltaEncoder()
+            self.encoder = StateEncoder(self.scale)
+        elif self.topics and msg[:1] == b"\x01":
+            self.delta.force_keyframe()     # Νέος spectator σε ροή που ήδη τρέχει
+        elif not self.topics:
+            self.delta = None
+            self.encoder = None
+
+    @property
+    def watching(self):
+        return self.delta is not None
+
+    def due(self, tick):
+        return tick % self.every == 0
+
+    # sections: section → iterable από (id, x, y), extra: tick_dt, elapsed_time, region
+    def encode(self, tick, sections, extra):
+        msg = self.delta.encode(tick, sections)
+        msg.update(extra)
+        return self.encoder.encode(msg)
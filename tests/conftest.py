@@ -0,0 +1,35 @@
+# Τα modules του server είναι στη ρίζα του repo (χωρίς package): τα tests τα βλέπουν από εκεί.
+# Εδώ και οι κοινοί βοηθοί για τους χάρτες των tests (from conftest import ...)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collisionGrid import CollisionGrid
+from mapLoader import GameMap
+
+TILE = 32
+
+def tile_rect(c, r):
+    return (c * TILE, r * TILE, (c + 1) * TILE, (r + 1) * TILE)
+
+# Τυχαίοι τοίχοι σε χάρτη cols × rows: ολόκληρα πλακίδια και ορθογώνια που δεν είναι ευθυγραμμισμένα με το πλέγμα
+def random_walls(rng, cols, rows, tiles=500, rects=40):
+    walls = [tile_rect(rng.randrange(cols), rng.randrange(rows)) for _ in range(tiles)]
+    for _ in range(rects):
+        left = rng.uniform(0, cols * TILE - 80)
+        bottom = rng.uniform(0, rows * TILE - 80)
+        walls.append((left, bottom, left + rng.uniform(1, 70), bottom + rng.uniform(1, 70)))
+    return walls
+
+# Χάρτης cols × rows πλακιδίων με τους τοίχους walls
+def make_map(walls, cols, rows, spawn_points):
+    grid = CollisionGrid(walls, cols * TILE, rows * TILE, TILE, TILE)
+    return GameMap(grid, cols * TILE, rows * TILE, TILE, TILE, spawn_points)
+
+# Τυχαίος χάρτης με spawns τυχαία σκορπισμένα (και πάνω σε τοίχους: ο κόσμος πρέπει να τα αντέχει)
+def random_map(rng, cols=60, rows=45, spawns=40):
+    walls = random_walls(rng, cols, rows)
+    spawn_points = [(rng.uniform(20, cols * TILE - 20), rng.uniform(30, rows * TILE - 30)) for _ in range(spawns)]
+    return make_map(walls, cols, rows, spawn_points)
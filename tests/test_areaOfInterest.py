@@ -0,0 +1,77 @@
+# Ροές ανά κελί: το δυαδικό μέγεθος κάθε delta σε ένα γεμάτο κελί μένει μέσα στο STATE_BUDGET
+
+import random
+from areaOfInterest import CellDeltas, CellEncoders, STATE_BUDGET, REGION_BYTES, ACK_LIMIT, TIER_NEAR
+from deltaSnapshot import DeltaDecoder
+from wireProtocol import StateDecoder, quantization
+
+def test_crowded_cell_deltas_fit_budget():
+    rng = random.Random(19)
+    cells = CellDeltas()
+    encoders = CellEncoders(quantization(2048, 2048))
+    decoders = {}
+    baselines = {}
+
+    def spot():
+        return float(rng.randrange(512)), float(rng.randrange(512))
+
+    # Όλοι στο κελί (0, 0), με μακριά ids ώστε τα ονόματα να μετράνε
+    players = {f"player-{i:04d}-" + "x" * 16: spot() for i in range(300)}
+    mobs = {i: spot() for i in range(400)}
+
+    sizes = []
+    def tick(t):
+        sections = {
+            "players": [(pid, x, y) for pid, (x, y) in players.items()],
+            "mobs": [(mid, x, y) for mid, (x, y) in mobs.items()],
+        }
+        for stream, msg in cells.encode(t, sections, {(0, 0)}):
+            msg["region"] = "r" * REGION_BYTES
+            msg["tick_dt"] = 0.02
+            if stream[0] == TIER_NEAR:
+                # Όσα acks θα έβαζε ο server, για παίκτες που ο client ήδη ξέρει
+                known = list(encoders[stream].net_ids["players"].ids)[:ACK_LIMIT]
+                if known:
+                    msg["acks"] = {pid: (t, t) for pid in known}
+            data = encoders[stream].encode(msg)
+            if "key" not in msg:
+                sizes.append(len(data))
+            decoded = decoders.setdefault(stream, StateDecoder()).decode(data)
+            assert baselines.setdefault(stream, DeltaDecoder()).apply(decoded)
+
+    t = 0
+    for t in range(1, 120):
+        for pid in players:
+            if rng.random() < 0.7:
+                players[pid] = spot()
+        for mid in mobs:
+            if rng.random() < 0.5:
+                mobs[mid] = spot()
+        if t == 30:
+            players.update({f"joined-{i:04d}-" + "y" * 40: spot() for i in range(150)})    # Κύμα εισόδων
+        if t == 60:
+            for pid in list(players)[:250]:
+                del players[pid]    # Κύμα αποχωρήσεων
+        if t == 90:
+            players.update({f"{i}-" + "z" * 240: spot() for i in range(40)})   # Ids στο μέγιστο μήκος
+        tick(t)
+
+    assert max(sizes) <= STATE_BUDGET
+    assert max(sizes) > STATE_BUDGET - 100     # Το budget όντως γέμισε
+    assert cells.deferred > 0
+
+    # Χωρίς κίνηση οι ροές φτάνουν την ακριβή κατάσταση
+    for t in range(t + 1, t + 30):
+        tick(t)
+    near = baselines[TIER_NEAR, (0, 0)]
+    assert {pid: (pos["x"], pos["y"]) for pid, pos in near.sections["players"].items()} == players
+    assert {mid: (pos["x"], pos["y"]) for mid, pos in near.sections["mobs"].items()} == mobs
+
+    # Όλοι φεύγουν μαζί: οι αφαιρέσεις μοιράζονται σε ticks και η ροή σβήνει μόνο όταν σταλούν όλες
+    players.clear()
+    mobs.clear()
+    for t in range(t + 1, t + 30):
+        tick(t)
+    assert max(sizes) <= STATE_BUDGET
+    assert not near.sections["players"] and not near.sections["mobs"]
+    assert not any(cells.encoders.values())
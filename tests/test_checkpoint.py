@@ -0,0 +1,97 @@
+# Checkpoints: εγγραφή σε thread με ατομική αντικατάσταση, ανάγνωση με mmap και επαναφορά του κόσμου
+
+import asyncio
+import os
+import random
+import pytest
+from gameWorld import GameWorld
+from checkpoint import capture, encode, write_checkpoint, read_checkpoint, HEADER, MAGIC, VERSION
+from conftest import random_map
+
+@pytest.fixture(scope="module")
+def game_map():
+    return random_map(random.Random(4))
+
+def played_world(game_map, ticks=200):
+    world = GameWorld(game_map, mob_count=0)
+    rng = random.Random(9)
+    pids = [f"p{i}" for i in range(30)] + [7, 8]
+    for pid in pids:
+        world.connect(pid)
+    for tick in range(ticks):
+        for pid in rng.sample(pids, 5):
+            world.apply_input(pid, {"seq": tick + 1, "keys": rng.randrange(16)})
+        if tick == 100:
+            world.disconnect("p3")
+        world.step()
+    return world
+
+def test_round_trip_restores_world(tmp_path, game_map):
+    world = played_world(game_map)
+    path = str(tmp_path / "checkpoint.bin")
+    size = write_checkpoint(path, capture(world))
+    assert size == os.path.getsize(path)
+
+    state = read_checkpoint(path)
+    assert (state["width"], state["height"]) == (int(game_map.width), int(game_map.height))
+    assert state["players"] == list(world.players.items())
+
+    restored = GameWorld(game_map, mob_count=0)
+    restored.restore(state["tick"], state["next_spawn_index"], state["players"])
+    assert restored.tick == world.tick
+    assert restored.state_digest() == world.state_digest()
+
+    # Οι νέοι παίκτες συνεχίζουν από το ίδιο σημείο spawn
+    assert restored.next_spawn_index == world.next_spawn_index
+
+# Όπως ο server: η εγγραφή τρέχει σε executor και αντικαθιστά το προηγούμενο checkpoint ολόκληρο
+def test_write_from_executor_replaces_atomically(tmp_path, game_map):
+    path = str(tmp_path / "checkpoint.bin")
+    world = played_world(game_map, ticks=20)
+    write_checkpoint(path, capture(world))
+
+    async def save(state):
+        return await asyncio.get_running_loop().run_in_executor(None, write_checkpoint, path, state)
+
+    for _ in range(10):
+        world.step()
+    asyncio.run(save(capture(world)))
+    assert read_checkpoint(path)["tick"] == world.tick
+    assert os.listdir(tmp_path) == ["checkpoint.bin"]
+
+    # Αποτυχία στην κωδικοποίηση: το παλιό checkpoint μένει άθικτο
+    broken = dict(capture(world), players=[(object(), 1.0, 2.0)])
+    with pytest.raises(TypeError):
+        asyncio.run(save(broken))
+    assert read_checkpoint(path)["tick"] == world.tick
+
+def test_missing_or_foreign_files(tmp_path):
+    assert read_checkpoint(str(tmp_path / "none.bin")) is None
+
+    path = tmp_path / "checkpoint.bin"
+    path.write_bytes(b"")
+    assert read_checkpoint(str(path)) is None
+
+    state = {"saved_at": 0.0, "tick": 1, "next_spawn_index": 0, "width": 64, "height": 64, "players": []}
+    data = encode(state)
+    path.write_bytes(b"XXXX" + data[4:])
+    assert read_checkpoint(str(path)) is None
+    path.write_bytes(HEADER.pack(MAGIC, VERSION + 1, 0.0, 1, 0, 64, 64, 0))
+    assert read_checkpoint(str(path)) is None
+
+# Αρχείο κομμένο σε οποιοδήποτε σημείο ή με σκουπίδια στο τέλος: None, όχι εξαίρεση από το struct/mmap/json
+def test_truncated_or_corrupt_files(tmp_path):
+    state = {"saved_at": 0.0, "tick": 1, "next_spawn_index": 0, "width": 64, "height": 64,
+             "players": [("a", 1.0, 2.0), (12, 3.0, 4.0), ("ελληνικά", 5.0, 6.0)]}
+    data = encode(state)
+    path = tmp_path / "checkpoint.bin"
+    for size in range(len(data)):
+        path.write_bytes(data[:size])
+        assert read_checkpoint(str(path)) is None, size
+
+    path.write_bytes(data + b"\0")
+    assert read_checkpoint(str(path)) is None
+    path.write_bytes(data.replace(b'"a"', b'"a\xff'))
+    assert read_checkpoint(str(path)) is None
+    path.write_bytes(data)
+    assert read_checkpoint(str(path))["players"] == state["players"]
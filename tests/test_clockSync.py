@@ -0,0 +1,62 @@
+# Εκτίμηση ρολογιού: δείγμα με το μικρότερο rtt, σταδιακή διόρθωση και άλμα για μεγάλες διαφορές
+
+import pytest
+from clockSync import ClockSync, CLOCK_SLEW, CLOCK_STEP, CLOCK_SAMPLES
+
+def test_first_sample_sets_offset():
+    clock = ClockSync()
+    clock.on_sample(10.0, 10.1, 105.05)
+    assert clock.synced
+    assert clock.rtt == pytest.approx(0.1)
+    assert clock.offset == pytest.approx(95.0)
+
+def test_keeps_sample_with_smallest_rtt():
+    clock = ClockSync()
+    clock.on_sample(10.0, 10.02, 105.01)     # rtt 0.02, offset 95
+    # Αργή απάντηση (ουρά στο δίκτυο): το offset της είναι λάθος και αγνοείται
+    clock.on_sample(11.0, 11.2, 106.19)
+    assert clock.rtt == pytest.approx(0.02)
+    assert clock.offset == pytest.approx(95.0)
+
+    # Το καλό δείγμα βγαίνει από το παράθυρο: μένει το καλύτερο των υπόλοιπων
+    for i in range(CLOCK_SAMPLES):
+        clock.on_sample(20.0 + i, 20.05 + i, 115.025 + i + 0.1)
+    assert clock.rtt == pytest.approx(0.05)
+    assert 95.0 < clock.offset < 95.1
+
+def test_small_changes_slew():
+    clock = ClockSync()
+    clock.on_sample(10.0, 10.02, 105.01)
+    clock.on_sample(11.0, 11.01, 106.105)   # Νέα εκτίμηση 95.1 με μικρότερο rtt
+    assert clock.offset == pytest.approx(95.0 + 0.1 * CLOCK_SLEW)
+
+def test_large_changes_step():
+    clock = ClockSync()
+    clock.on_sample(10.0, 10.02, 105.01)
+    clock.on_sample(11.0, 11.01, 106.005 + 2 * CLOCK_STEP)
+    assert clock.offset == pytest.approx(95.0 + 2 * CLOCK_STEP)
+
+def test_seed_is_rough_until_first_sample():
+    clock = ClockSync()
+    clock.seed(50.0, 10.0)
+    assert clock.offset == 40.0 and not clock.synced
+    clock.seed(60.0, 10.0)
+    assert clock.offset == 40.0
+
+    # Το πρώτο ping αντικαθιστά την πρόχειρη εκτίμηση χωρίς slew
+    clock.on_sample(10.0, 10.02, 50.2)
+    assert clock.synced
+    assert clock.offset == pytest.approx(40.19)
+
+def test_reset_and_server_now():
+    now = [100.0]
+    clock = ClockSync(clock=lambda: now[0])
+    assert clock.server_now() is None
+    clock.on_sample(10.0, 10.0, 15.0)
+    assert clock.server_now() == pytest.approx(105.0)
+    assert clock.to_server(1.0) == pytest.approx(6.0)
+    now[0] = 101.5
+    assert clock.server_now() == pytest.approx(106.5)
+
+    clock.reset()
+    assert clock.server_now() is None and clock.rtt is None and not clock.synced
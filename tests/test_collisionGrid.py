@@ -0,0 +1,69 @@
+# Το πλέγμα πρέπει να δίνει ακριβώς τις απαντήσεις του γραμμικού ελέγχου σε όλους τους τοίχους
+
+import random
+import pytest
+from collisionGrid import CollisionGrid
+from conftest import TILE, tile_rect, random_walls
+
+COLS, ROWS = 30, 20
+WIDTH, HEIGHT = COLS * TILE, ROWS * TILE
+
+# Ο παλιός έλεγχος του server: αυστηρές ανισότητες, οπότε ένα κουτί που ακουμπάει τοίχο δεν συγκρούεται
+def linear_collides(walls, left, bottom, right, top):
+    for w_left, w_bottom, w_right, w_top in walls:
+        if right > w_left and left < w_right and top > w_bottom and bottom < w_top:
+            return True
+    return False
+
+@pytest.fixture(scope="module")
+def walls():
+    rng = random.Random(7)
+    walls = random_walls(rng, COLS, ROWS, tiles=120, rects=30)
+    # Τοίχοι πολλών πλακιδίων, και τοίχοι που βγαίνουν (ή είναι όλοι) έξω από τα όρια του χάρτη
+    walls += [(5 * TILE, 5 * TILE, 8 * TILE, 6 * TILE), (12 * TILE, 2 * TILE, 13 * TILE, 9 * TILE)]
+    walls += [(-40, 100, 20, 150), (WIDTH - 10, 300, WIDTH + 50, 330), (200, HEIGHT - 5, 260, HEIGHT + 64)]
+    walls += [(-100, -100, -60, -20), (WIDTH + 10, HEIGHT + 10, WIDTH + 90, HEIGHT + 40), tile_rect(COLS, 3)]
+    return walls
+
+@pytest.fixture(scope="module")
+def grid(walls):
+    return CollisionGrid(walls, WIDTH, HEIGHT, TILE, TILE)
+
+def test_random_boxes(grid, walls):
+    rng = random.Random(11)
+    for _ in range(20000):
+        x = rng.uniform(-120, WIDTH + 120)
+        y = rng.uniform(-120, HEIGHT + 120)
+        w = rng.choice((32, 48, rng.uniform(1, 100)))
+        h = rng.choice((32, 48, rng.uniform(1, 100)))
+        expected = linear_collides(walls, x - w / 2, y - h / 2, x + w / 2, y + h / 2)
+        assert grid.collides(x, y, w, h) == expected, (x, y, w, h)
+
+# Κουτιά με πλευρές ακριβώς πάνω στις πλευρές των τοίχων και πάνω στα όρια των πλακιδίων
+def test_boxes_touching_walls(grid, walls):
+    for left, bottom, right, top in walls:
+        for w, h in ((32, 48), (TILE, TILE), (5, 7)):
+            for x, y in (
+                (left - w / 2, (bottom + top) / 2), (right + w / 2, (bottom + top) / 2),
+                ((left + right) / 2, bottom - h / 2), ((left + right) / 2, top + h / 2),
+                (left - w / 2, bottom - h / 2), (right + w / 2, top + h / 2),
+                (left - w / 2 + 0.5, (bottom + top) / 2), (right + w / 2 - 0.5, top + h / 2 - 0.5),
+            ):
+                expected = linear_collides(walls, x - w / 2, y - h / 2, x + w / 2, y + h / 2)
+                assert grid.collides(x, y, w, h) == expected, (x, y, w, h)
+
+def test_tile_aligned_boxes(grid, walls):
+    for r in range(-2, ROWS + 2):
+        for c in range(-2, COLS + 2):
+            for span in (1, 2):
+                box = (c * TILE, r * TILE, (c + span) * TILE, (r + span) * TILE)
+                assert grid.box_collides(*box) == linear_collides(walls, *box), box
+
+def test_single_partial_wall():
+    grid = CollisionGrid([(40, 40, 50, 50)], WIDTH, HEIGHT, TILE, TILE)
+    assert grid.box_collides(30, 30, 41, 41)
+    assert not grid.box_collides(0, 0, 40, 64)      # Ακουμπάει μόνο την αριστερή πλευρά
+    assert not grid.box_collides(50, 40, 60, 50)
+    assert not grid.tile_is_free(1, 1)
+    assert grid.tile_is_free(0, 0)
+    assert not grid.tile_is_free(-1, 0) and not grid.tile_is_free(COLS, 0)
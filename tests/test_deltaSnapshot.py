@@ -0,0 +1,168 @@
+# Delta snapshots: keyframes, deltas πάνω στη βάση, απώλειες, skip_unchanged και budget
+
+import random
+from deltaSnapshot import DeltaEncoder, DeltaDecoder
+
+def sections(players, mobs=None):
+    return {
+        "players": [(eid, x, y) for eid, (x, y) in players.items()],
+        "mobs": [(eid, x, y) for eid, (x, y) in (mobs or {}).items()],
+    }
+
+def positions(decoder, name="players"):
+    return {eid: (pos["x"], pos["y"]) for eid, pos in decoder.sections[name].items()}
+
+def test_first_message_is_keyframe_then_deltas():
+    encoder = DeltaEncoder(keyframe_interval=10)
+    players = {"a": (1.0, 2.0), "b": (3.0, 4.0)}
+    first = encoder.encode(1, sections(players))
+    assert first["key"] == 1 and set(first["players"]) == {"a", "b"}
+
+    players["a"] = (1.5, 2.0)
+    delta = encoder.encode(2, sections(players))
+    assert "key" not in delta and delta["base"] == 1
+    assert delta["players"] == {"a": {"x": 1.5, "y": 2.0}}
+
+    assert encoder.encode(10, sections(players))["key"] == 1     # Κάθε keyframe_interval ticks
+
+def test_removed_entities():
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+    players = {"a": (1.0, 1.0), "b": (2.0, 2.0)}
+    decoder.apply(encoder.encode(1, sections(players)))
+
+    del players["b"]
+    players["c"] = (5.0, 5.0)
+    msg = encoder.encode(2, sections(players))
+    assert msg["removed"] == {"players": ["b"]}
+    assert decoder.apply(msg)
+    assert positions(decoder) == players
+
+def test_decoder_follows_random_walk():
+    rng = random.Random(4)
+    encoder = DeltaEncoder(keyframe_interval=25)
+    decoder = DeltaDecoder()
+    players = {f"p{i}": (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(40)}
+    mobs = {i: (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(10)}
+    for tick in range(1, 200):
+        for eid in rng.sample(list(players), 10):
+            x, y = players[eid]
+            players[eid] = (x + rng.uniform(-1, 1), y)
+        if rng.random() < 0.2:
+            players.pop(rng.choice(list(players)))
+        if rng.random() < 0.2:
+            players[f"n{tick}"] = (0.0, 0.0)
+        assert decoder.apply(encoder.encode(tick, sections(players, mobs)))
+        assert positions(decoder) == players
+        assert positions(decoder, "mobs") == mobs
+
+def test_lost_delta_waits_for_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=5)
+    decoder = DeltaDecoder()
+    players = {"a": (0.0, 0.0)}
+    decoder.apply(encoder.encode(0, sections(players)))
+
+    players["a"] = (1.0, 0.0)
+    encoder.encode(1, sections(players))       # Χάθηκε
+    players["a"] = (2.0, 0.0)
+    assert not decoder.apply(encoder.encode(2, sections(players)))
+    assert decoder.missed == 1 and decoder.tick is None
+
+    players["a"] = (3.0, 0.0)
+    assert not decoder.apply(encoder.encode(3, sections(players)))
+    assert decoder.missed == 1      # Περιμένει ήδη keyframe
+    encoder.encode(4, sections(players))
+    assert decoder.apply(encoder.encode(5, sections(players)))
+    assert positions(decoder) == players
+
+def test_late_joiner_needs_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=50)
+    players = {"a": (0.0, 0.0)}
+    encoder.encode(0, sections(players))
+    players["a"] = (1.0, 0.0)
+
+    late = DeltaDecoder()
+    assert not late.apply(encoder.encode(1, sections(players)))
+
+    encoder.force_keyframe()
+    msg = encoder.encode(2, sections(players))
+    assert msg["key"] == 1
+    assert late.apply(msg) and positions(late) == players
+
+def test_skip_unchanged_and_force():
+    encoder = DeltaEncoder(skip_unchanged=True)
+    decoder = DeltaDecoder()
+    players = {"a": (0.0, 0.0)}
+    decoder.apply(encoder.encode(0, sections(players)))
+    assert encoder.encode(1, sections(players)) is None
+    assert encoder.encode(2, sections(players)) is None
+
+    # Με force βγαίνει μήνυμα χωρίς αλλαγές, πάνω στη βάση του τελευταίου που στάλθηκε
+    msg = encoder.encode(3, sections(players), force=True)
+    assert msg == {"tick": 3, "base": 0}
+    assert decoder.apply(msg)
+
+    players["a"] = (1.0, 0.0)
+    msg = encoder.encode(4, sections(players))
+    assert msg["base"] == 3 and decoder.apply(msg)
+
+def test_budget_delivers_everything_eventually():
+    encoder = DeltaEncoder(keyframe_interval=1000, budget=5)
+    decoder = DeltaDecoder()
+    players = {f"p{i}": (0.0, 0.0) for i in range(20)}
+    decoder.apply(encoder.encode(0, sections(players)))
+
+    players = {eid: (1.0, 1.0) for eid in players}
+    ticks = 0
+    while positions(decoder) != players:
+        ticks += 1
+        msg = encoder.encode(ticks, sections(players))
+        assert len(msg.get("players", {})) <= 5
+        assert decoder.apply(msg)
+    assert ticks == 4
+    assert encoder.deferred == 15 + 10 + 5
+
+def test_budget_sends_new_entities_first():
+    encoder = DeltaEncoder(keyframe_interval=1000, budget=2)
+    players = {f"p{i}": (0.0, 0.0) for i in range(5)}
+    encoder.encode(0, sections(players))
+
+    players = {eid: (1.0, 1.0) for eid in players}
+    players["new"] = (9.0, 9.0)
+    msg = encoder.encode(1, sections(players))
+    assert "new" in msg["players"]
+
+# Budget σε κόστος: οι νέες οντότητες κοστίζουν περισσότερο και οι αφαιρέσεις που δεν χωράνε περιμένουν
+def test_budget_with_costs_and_deferred_removals():
+    cost = lambda eid, new: 10 if new else 1
+    encoder = DeltaEncoder(keyframe_interval=1000, budget=12, cost=cost, removed_cost=2)
+    decoder = DeltaDecoder()
+    players = {f"p{i}": (0.0, 0.0) for i in range(10)}
+    decoder.apply(encoder.encode(0, sections(players)))
+
+    def spent(msg):
+        total = sum(cost(eid, eid not in before) for eid in msg.get("players", {}))
+        return total + 2 * len(msg.get("removed", {}).get("players", []))
+
+    players.update({"new1": (5.0, 5.0), "new2": (6.0, 6.0)})
+    for eid in ("p0", "p1", "p2"):
+        players[eid] = (1.0, 1.0)
+    ticks = 0
+    while positions(decoder) != players:
+        ticks += 1
+        before = dict(positions(decoder))
+        msg = encoder.encode(ticks, sections(players))
+        assert spent(msg) <= 12
+        assert decoder.apply(msg)
+    assert ticks == 2
+
+    # Επτά αφαιρέσεις (14) δεν χωράνε σε ένα μήνυμα: η βάση τις κρατάει για το επόμενο
+    for eid in [f"p{i}" for i in range(3, 10)]:
+        del players[eid]
+    before = dict(positions(decoder))
+    msg = encoder.encode(10, sections(players))
+    assert len(msg["removed"]["players"]) == 6 and decoder.apply(msg)
+    msg = encoder.encode(11, sections(players))
+    assert len(msg["removed"]["players"]) == 1 and decoder.apply(msg)
+    assert positions(decoder) == players
+    assert encoder.deferred == 2 + 1
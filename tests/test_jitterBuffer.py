@@ -0,0 +1,68 @@
+# Jitter buffer: interpolation ανάμεσα στα snapshots και delay που ακολουθεί το jitter
+
+import random
+import pytest
+from jitterBuffer import JitterBuffer, AdaptiveDelay, MIN_DELAY, MAX_DELAY
+
+TICK_DT = 0.02
+
+def pos(x, y):
+    return {"x": x, "y": y}
+
+def test_interpolates_between_snapshots():
+    buffer = JitterBuffer({0: TICK_DT})
+    delay = buffer.delays[0].delay
+    buffer.push(0, 1.0, None, {"a": pos(0.0, 0.0)})
+    buffer.push(0, 1.1, 1.0, {"a": pos(10.0, 20.0)})
+
+    assert buffer.sample("a", 1.0 + delay - 0.5) == (0.0, 0.0)
+    assert buffer.sample("a", 1.05 + delay) == pytest.approx((5.0, 10.0))
+    # Μετά το τελευταίο snapshot στέκεται εκεί (χωρίς extrapolation)
+    assert buffer.sample("a", 5.0) == (10.0, 20.0)
+    assert buffer.sample("missing", 1.0) is None
+
+def test_base_time_holds_entity_until_it_moves():
+    buffer = JitterBuffer({0: TICK_DT})
+    delay = buffer.delays[0].delay
+    buffer.push(0, 1.0, None, {"a": pos(0.0, 0.0)})
+    # Ακίνητη ως το tick 2.0 (base του delta), μετά κινείται
+    buffer.push(0, 2.1, 2.0, {"a": pos(10.0, 0.0)})
+
+    assert buffer.sample("a", 1.5 + delay) == pytest.approx((0.0, 0.0))
+    assert buffer.sample("a", 2.05 + delay) == pytest.approx((5.0, 0.0))
+
+def test_same_tick_from_second_stream_ignored():
+    buffer = JitterBuffer({0: TICK_DT, 1: 4 * TICK_DT})
+    buffer.push(0, 1.0, None, {"a": pos(0.0, 0.0)})
+    buffer.push(1, 1.0, None, {"a": pos(99.0, 99.0)})
+    assert buffer.tiers["a"] == 0
+    assert list(buffer.entities["a"]) == [(1.0, 0.0, 0.0)]
+
+    buffer.remove("a")
+    assert buffer.sample("a", 1.0) is None
+
+def arrivals(delay, jitter, count=500, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        snapshot_time = i * delay.interval
+        delay.on_arrival(snapshot_time, snapshot_time + 0.05 + rng.uniform(0, jitter))
+    return delay.delay
+
+def test_delay_follows_jitter():
+    steady = arrivals(AdaptiveDelay(TICK_DT), 0.0)
+    assert steady == pytest.approx(max(MIN_DELAY, TICK_DT))
+
+    jittery = AdaptiveDelay(TICK_DT)
+    arrivals(jittery, 0.08)
+    assert jittery.jitter > 0.01
+    assert jittery.delay > steady
+
+    # Το δίκτυο ηρεμεί: το delay κατεβαίνει (αργά)
+    high = jittery.delay
+    arrivals(jittery, 0.0, count=2000)
+    assert jittery.delay < high
+
+def test_delay_clamped():
+    assert arrivals(AdaptiveDelay(TICK_DT), 2.0, count=2000) == pytest.approx(MAX_DELAY, rel=0.01)
+    assert AdaptiveDelay(TICK_DT).delay >= MIN_DELAY
+    assert AdaptiveDelay(10.0).delay == MAX_DELAY
@@ -0,0 +1,71 @@
+# Compiled χάρτες: φόρτωση χωρίς arcade και έλεγχος αν ισχύουν ακόμα για το TMX τους
+
+import json
+import os
+import mapLoader
+from collisionGrid import CollisionGrid
+from mapLoader import HEADER, WALL, MAGIC, VERSION, compiled_is_fresh, load_compiled_map, _file_hash
+
+# Ό,τι γράφει το compile_map, χωρίς να χρειάζεται arcade για το TMX
+def write_compiled(tmx_path, out_path, grid, meta):
+    stat = os.stat(tmx_path)
+    walls = grid.extra_walls()
+    meta = json.dumps(meta).encode()
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, grid.cols * grid.tile_width, grid.rows * grid.tile_height, grid.tile_width,
+            grid.tile_height, grid.cols, grid.rows, stat.st_mtime_ns, stat.st_size, _file_hash(tmx_path),
+            len(walls), len(meta)
+        ))
+        f.write(bytes(grid.solid))
+        for rect in walls:
+            f.write(WALL.pack(*rect))
+        f.write(meta)
+
+def make_files(tmp_path):
+    tmx = tmp_path / "region.tmx"
+    tmx.write_text("<map/>")
+    grid = CollisionGrid([(64, 64, 128, 96), (300, 300, 310, 317)], 640, 480, 32, 32)
+    out = str(tmp_path / "region.mapbin")
+    meta = {"spawn_points": [[100, 100]], "mob_spawns": [], "transitions": []}
+    write_compiled(str(tmx), out, grid, meta)
+    return str(tmx), out, grid
+
+def test_load_compiled_map(tmp_path):
+    _, out, grid = make_files(tmp_path)
+    game_map = load_compiled_map(out)
+    assert (game_map.width, game_map.height) == (640, 480)
+    assert game_map.spawn_points == [(100, 100)]
+    assert bytes(game_map.collision_grid.solid) == bytes(grid.solid)
+    for x, y in ((96, 80), (305, 310), (400, 400), (310, 300)):
+        assert game_map.collision_grid.collides(x, y, 8, 8) == grid.collides(x, y, 8, 8)
+
+def test_fresh_until_content_changes(tmp_path):
+    tmx, out, _ = make_files(tmp_path)
+    assert compiled_is_fresh(tmx, out)
+
+    with open(tmx, "w") as f:
+        f.write("<map>")    # Ίδιο μέγεθος, άλλο περιεχόμενο
+    os.utime(tmx, ns=(os.stat(tmx).st_atime_ns, os.stat(tmx).st_mtime_ns + 10**9))
+    assert not compiled_is_fresh(tmx, out)
+
+def test_touched_tmx_updates_stored_mtime(tmp_path, monkeypatch):
+    tmx, out, _ = make_files(tmp_path)
+    mtime = os.stat(tmx).st_mtime_ns + 10**9
+    os.utime(tmx, ns=(mtime, mtime))     # Π.χ. git checkout: ίδιο περιεχόμενο, νέο mtime
+
+    hashed = []
+    monkeypatch.setattr(mapLoader, "_file_hash", lambda path: hashed.append(path) or _file_hash(path))
+    assert compiled_is_fresh(tmx, out)
+    assert compiled_is_fresh(tmx, out)
+    assert len(hashed) == 1     # Η δεύτερη φορά βγαίνει από το mtime
+
+    with open(out, "rb") as f:
+        assert HEADER.unpack(f.read(HEADER.size))[8] == mtime
+
+def test_missing_or_foreign_compiled_file(tmp_path):
+    tmx, out, _ = make_files(tmp_path)
+    assert not compiled_is_fresh(tmx, str(tmp_path / "missing.mapbin"))
+    with open(out, "r+b") as f:
+        f.write(b"XXXX")
+    assert not compiled_is_fresh(tmx, out)
@@ -0,0 +1,104 @@
+# A* με χονδρικό επίπεδο περιοχών, αναζητήσεις σε κομμάτια και όριο επεκτάσεων ανά tick
+
+import math
+import pytest
+import gameWorld
+from gameWorld import GameWorld
+from movement import PLAYER_WIDTH, PLAYER_HEIGHT
+from pathfinding import Pathfinder
+from conftest import TILE, tile_rect, make_map
+
+# Χάρτης cols × rows με κάθετους τοίχους ανά 8 στήλες (με ανοίγματα) και ένα κλειστό κουτί γύρω από το (box, box)
+def maze(cols=120, rows=120, box=60):
+    walls = []
+    for c in range(4, cols, 8):
+        gap = (c * 7) % (rows - 4)
+        walls.extend(tile_rect(c, r) for r in range(rows) if not gap <= r < gap + 4)
+    for i in range(box - 6, box + 7):
+        walls.extend((tile_rect(i, box - 6), tile_rect(i, box + 6), tile_rect(box - 6, i), tile_rect(box + 6, i)))
+    return make_map(walls, cols, rows, [(2 * TILE + 16, 2 * TILE + 16)])
+
+@pytest.fixture(scope="module")
+def maze_map():
+    return maze()
+
+def assert_valid(finder, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (c0, r0), (c1, r1) in zip(path, path[1:]):
+        assert max(abs(c1 - c0), abs(r1 - r0)) == 1
+        assert finder.is_walkable(c1, r1)
+
+def test_long_path(maze_map):
+    finder = Pathfinder(maze_map.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+    path = finder.find_path((2, 2), (117, 117))
+    assert_valid(finder, path, (2, 2), (117, 117))
+
+def test_unreachable_goal_needs_no_search(maze_map):
+    finder = Pathfinder(maze_map.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+    search = finder.search((2, 2), (57, 58))
+    assert search.done and search.path is None and search.expansions == 0
+
+    # Το ίδιο αίτημα (και από άλλο σημείο του ίδιου κομματιού) απαντιέται από τη cache αποτυχιών
+    for start in ((2, 2), (10, 3)):
+        assert finder.search(start, (57, 58)).path is None
+    assert finder.failure_hits == 2
+
+def test_resumable_search_matches_full_search(maze_map):
+    finder = Pathfinder(maze_map.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+    search = finder.search((2, 2), (117, 117))
+    runs = 0
+    while not search.done:
+        assert search.run(25) <= 25
+        runs += 1
+    assert runs > 1
+
+    fresh = Pathfinder(maze_map.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+    assert search.path == fresh.find_path((2, 2), (117, 117))
+    assert finder.find_path((2, 2), (117, 117)) == search.path     # Από την cache
+    assert finder.hits == 1
+
+def test_rebuild_drops_cached_results(maze_map):
+    finder = Pathfinder(maze_map.collision_grid, PLAYER_WIDTH, PLAYER_HEIGHT)
+    finder.find_path((2, 2), (30, 30))
+    finder.find_path((2, 2), (57, 58))
+    version = finder.version
+    finder.rebuild()
+    assert finder.version == version + 1
+    assert not finder.cache and not finder.unreachable
+
+def test_world_spreads_searches_over_ticks(maze_map, monkeypatch):
+    monkeypatch.setattr(gameWorld, "PATH_EXPANSIONS_PER_TICK", 200)
+    world = GameWorld(maze_map, mob_count=0)
+    world.connect("p")
+    world.apply_input("p", {"seq": 1, "keys": 0, "goto": [117 * TILE + 16, 117 * TILE + 16]})
+
+    ticks = 0
+    while "p" not in world.paths:
+        world.step()
+        ticks += 1
+        assert ticks < 500
+    assert ticks > 1
+    assert not world.path_searches
+
+def test_world_unreachable_gotos_are_cheap(maze_map):
+    world = GameWorld(maze_map, mob_count=0)
+    for i in range(8):
+        world.connect(f"p{i}")
+        world.apply_input(f"p{i}", {"seq": 1, "keys": 0, "goto": [57 * TILE + 16, 58 * TILE + 16]})
+    world.step()
+    assert not world.paths and not world.path_searches
+    assert world.pathfinder.misses + world.pathfinder.failure_hits == 8
+
+def test_goto_throttled_per_client(maze_map):
+    world = GameWorld(maze_map, mob_count=0)
+    world.connect("p")
+    world.apply_input("p", {"seq": 1, "keys": 0, "goto": [10 * TILE + 16, 3 * TILE + 16]})
+    world.step()
+    world.apply_input("p", {"seq": 2, "keys": 0, "goto": [3 * TILE + 16, 10 * TILE + 16]})
+    world.step()
+    assert "p" in world.path_requests       # Περιμένει το cooldown
+
+    for _ in range(gameWorld.PATH_COOLDOWN_TICKS):
+        world.step()
+    assert "p" not in world.path_requests
+    assert math.isclose(world.paths["p"][0][0], 3 * TILE + 16) and math.isclose(world.paths["p"][0][1], 10 * TILE + 16)
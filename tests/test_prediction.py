@@ -0,0 +1,66 @@
+# Prediction του τοπικού παίκτη: με τους ίδιους κανόνες κίνησης με τον server δεν χρειάζεται διόρθωση
+
+import random
+import pytest
+from gameWorld import GameWorld
+from mapLoader import empty_map
+from prediction import PlayerPrediction, SNAP_DISTANCE
+
+TICK_DT = 0.02
+
+def make_world():
+    game_map = empty_map(1024, 768)
+    for i in range(10):
+        game_map.collision_grid.add_wall(100 * i + 40, 200, 100 * i + 80, 260)
+    world = GameWorld(game_map, TICK_DT, mob_count=0)
+    world.connect("me")
+    prediction = PlayerPrediction(game_map.collision_grid, game_map.width, game_map.height, TICK_DT)
+    prediction.reset(*world.players.get("me"))
+    return world, prediction
+
+# Client και server με latency ticks καθυστέρηση σε κάθε κατεύθυνση. server_offset μετακινεί τον παίκτη στον server
+def simulate(world, prediction, latency, ticks=1500, seed=3, server_offset=None):
+    rng = random.Random(seed)
+    history = []
+    uplink = []
+    downlink = []
+    seq = keys = 0
+    for tick in range(ticks):
+        if rng.random() < 0.05:
+            seq += 1
+            keys = rng.randrange(16)
+            uplink.append((tick + latency, {"seq": seq, "keys": keys}))
+        prediction.advance(TICK_DT + 1e-9, seq, keys)
+
+        for _, msg in [item for item in uplink if item[0] == tick]:
+            world.apply_input("me", msg)
+        uplink = [item for item in uplink if item[0] > tick]
+        world.step()
+        if server_offset is not None and tick == server_offset[0]:
+            x, y = world.players.get("me")
+            world.place_player("me", x + server_offset[1], y)
+
+        applied = world.player_inputs["me"]
+        if applied["seq"] >= 0:
+            downlink.append((tick + latency, (world.tick, applied["seq"], applied["tick"]) + world.players.get("me")))
+        for _, ack in [item for item in downlink if item[0] == tick]:
+            prediction.reconcile(*ack)
+        downlink = [item for item in downlink if item[0] > tick]
+        history.append(prediction.corrections)
+    return history
+
+@pytest.mark.parametrize("latency", [0, 3, 10])
+def test_no_corrections_without_interference(latency):
+    world, prediction = make_world()
+    simulate(world, prediction, latency)
+    assert prediction.corrections == 0
+    assert len(prediction.pending) <= 2 * latency + 2
+
+def test_server_disagreement_is_corrected():
+    world, prediction = make_world()
+    history = simulate(world, prediction, 3, ticks=800, server_offset=(200, SNAP_DISTANCE * 2))
+    assert history[200] == 0
+    assert prediction.corrections > 0
+
+    # Μετά τη διόρθωση η πρόβλεψη ξανασυμφωνεί με τον server
+    assert history[300] == history[-1]
@@ -0,0 +1,125 @@
+# Journal → replay: το replay ενός journal καταλήγει στα ίδια digests με τον κόσμο που το έγραψε
+
+import random
+from collections import Counter
+import struct
+import pytest
+from inputJournal import JournalWriter, read_journal, CONNECT, DISCONNECT, INPUT, FILE_HEADER, MAGIC, VERSION
+from replay import load_world, replay
+
+PARAMS = {"empty": [2000, 2000], "tick_dt": 0.02, "mob_count": 20, "seed": 3, "map": None}
+
+# Κόσμος με τυχαίες συνδέσεις, αποσυνδέσεις, πλήκτρα και goto, γράφοντας ό,τι θα έγραφε ο server
+def record_session(path, ticks=600, seed=1):
+    world = load_world(PARAMS)
+    journal = JournalWriter(path, PARAMS, digest_interval=50)
+    rng = random.Random(seed)
+    seqs = {}
+    for _ in range(ticks):
+        if rng.random() < 0.2:
+            pid = f"p{rng.randrange(30)}"
+            if world.connect(pid):
+                journal.connect(world.tick, pid)
+            seqs[pid] = 0
+        if rng.random() < 0.03 and seqs:
+            pid = rng.choice(list(seqs))
+            journal.disconnect(world.tick, pid)
+            world.disconnect(pid)
+            del seqs[pid]
+        for pid in list(seqs):
+            if rng.random() < 0.1:
+                seqs[pid] += 1
+                if rng.random() < 0.9:
+                    msg = {"seq": seqs[pid], "keys": rng.randrange(16)}
+                else:
+                    msg = {"seq": seqs[pid], "keys": 0, "goto": [rng.uniform(0, 2000), rng.uniform(0, 2000)]}
+                if world.apply_input(pid, msg):
+                    journal.input(world.tick, pid, msg)
+        world.step()
+        journal.after_step(world)
+    journal.close(world)
+    return world
+
+@pytest.mark.parametrize("use_numpy", [None, False])
+def test_replay_matches_recorded_digests(tmp_path, use_numpy):
+    path = str(tmp_path / "session.jnl")
+    original = record_session(path)
+
+    params, records = read_journal(path)
+    world = load_world(params, use_numpy=use_numpy)
+    checked, mismatches = replay(world, records)
+
+    assert checked == 600 // 50 + 1
+    assert mismatches == []
+    assert world.tick == original.tick
+    assert world.state_digest() == original.state_digest()
+
+def test_replay_detects_missing_inputs(tmp_path):
+    path = str(tmp_path / "session.jnl")
+    record_session(path)
+
+    params, records = read_journal(path)
+    records = list(records)
+    counts = Counter(payload["id"] for _, kind, payload in records if kind == INPUT)
+    pid = counts.most_common(1)[0][0]
+    records = [(tick, kind, payload) for tick, kind, payload in records if kind != INPUT or payload["id"] != pid]
+
+    _, mismatches = replay(load_world(params), records)
+    assert mismatches
+
+def test_truncated_journal_stops_at_last_full_record(tmp_path):
+    path = str(tmp_path / "session.jnl")
+    record_session(path, ticks=100)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-3])      # Crash στη μέση της τελευταίας εγγραφής
+
+    params, records = read_journal(path)
+    assert list(records)
+
+# Τα journals της έκδοσης 1 γράφουν και inputs που απέρριψε ο κόσμος: το replay τους θα απέκλινε
+@pytest.mark.parametrize("version", [VERSION - 1, VERSION + 1])
+def test_rejects_other_versions(tmp_path, version):
+    path = tmp_path / "other.jnl"
+    path.write_bytes(FILE_HEADER.pack(MAGIC, version, 2) + b"{}")
+    with pytest.raises(ValueError):
+        read_journal(str(path))
+
+# Ο server γράφει connect/disconnect μόνο όταν αλλάζει ο κόσμος, και το replay μένει ίδιο
+# ακόμα κι αν ο client ξανασυνδεθεί και τα seq του ξεκινήσουν από την αρχή
+def test_server_journals_only_world_changes(tmp_path):
+    pytest.importorskip("zmq")
+    from server import GameServer
+
+    path = str(tmp_path / "server.jnl")
+    world = load_world(PARAMS)
+    journal = JournalWriter(path, PARAMS, digest_interval=10)
+    server = GameServer(world, journal)
+
+    def connect():
+        server.on_control(b"client", {"type": "connect", "id": "p1", "protocols": ["json"], "req": 1})
+        server.admit()
+
+    connect()
+    for seq in range(1, 30):
+        server.on_input({"id": "p1", "seq": seq, "keys": 1})
+        world.step()
+        journal.after_step(world)
+    connect()
+    for seq in range(1, 30):
+        server.on_input({"id": "p1", "seq": seq, "keys": 4})
+        world.step()
+        journal.after_step(world)
+    server.remove_player("never-connected")
+    server.remove_player("p1")
+    world.step()
+    journal.close(world)
+
+    params, records = read_journal(path)
+    records = list(records)
+    assert [kind for _, kind, _ in records if kind in (CONNECT, DISCONNECT)] == [CONNECT, DISCONNECT]
+    assert sum(kind == INPUT for _, kind, _ in records) == 58
+
+    _, mismatches = replay(load_world(params), records)
+    assert mismatches == []
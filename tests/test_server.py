@@ -0,0 +1,151 @@
+# GameServer χωρίς δίκτυο: οι handlers (on_control, on_input, state_messages) καλούνται απευθείας
+
+import pytest
+from gameWorld import GameWorld
+from mapLoader import empty_map
+from wireProtocol import decode_input, encode_input, StateDecoder
+from deltaSnapshot import DeltaDecoder
+
+pytest.importorskip("zmq")
+from server import GameServer
+from areaOfInterest import ACK_LIMIT
+
+def make_server(max_players=10, size=2048):
+    world = GameWorld(empty_map(size, size), mob_count=0)
+    return GameServer(world, max_players=max_players)
+
+def connect(server, pid, identity=b"client", protocols=("bin1",)):
+    reply = server.on_control(identity, {"type": "connect", "id": pid, "protocols": list(protocols), "req": 1})
+    server.admit()
+    return reply
+
+def test_malformed_inputs_dropped_and_counted():
+    server = make_server()
+    world = server.world
+    connect(server, "p")
+
+    bad = [
+        {"id": ["x"]}, {"id": True}, {"id": "p", "seq": "a"}, {"id": "p", "seq": 1000000, "keys": "zz"},
+        {"id": "p", "seq": 5, "keys": 0, "goto": ["a", 1]}, {"id": "p", "seq": 6, "keys": 0, "goto": [1]},
+        decode_input(encode_input("p", 7, 0, (float("nan"), 1.0))),
+    ]
+    for msg in bad:
+        server.on_input(msg)
+    assert server.malformed == len(bad)
+    assert not world.pending_inputs
+
+    server.on_input({"id": "p", "seq": 8, "keys": 1})
+    server.on_input(decode_input(encode_input("p", 9, 0, (100.0, 100.0))))
+    world.step()
+    assert world.player_inputs["p"]["seq"] == 9
+    assert server.malformed == len(bad)
+
+@pytest.mark.parametrize("msg", [
+    {"type": "connect", "protocols": ["json"]},
+    {"type": "connect", "id": None, "protocols": ["json"]},
+    {"type": "connect", "id": ["p"], "protocols": ["json"]},
+    {"type": "connect", "id": True, "protocols": ["json"]},
+    {"type": "disconnect", "id": {"p": 1}},
+])
+def test_control_bad_id_gets_error(msg):
+    server = make_server()
+    reply = server.on_control(b"client", dict(msg, req=3))
+    assert reply == {"status": "error", "reason": "bad id", "req": 3}
+
+def test_control_time_needs_no_id():
+    reply = make_server().on_control(b"client", {"type": "time", "req": 4})
+    assert reply["status"] == "ok" and "server_time" in reply
+
+def test_queue_positions():
+    server = make_server(max_players=3)
+    replies = [
+        server.on_control(b"c%d" % i, {"type": "connect", "id": f"p{i}", "protocols": ["bin1"], "req": 1})
+        for i in range(6)
+    ]
+    # Οι τρεις πρώτοι χωράνε: η απάντησή τους έρχεται από το admit
+    assert replies[:3] == [None, None, None]
+    assert [reply["position"] for reply in replies[3:]] == [1, 2, 3]
+
+    server.admit()
+    accepted = [reply for _, reply in server.control_outbox if reply["status"] == "ok"]
+    assert len(accepted) == 3 and len(server.world.connected) == 3
+
+    # Ξανά connect όσο περιμένει: ίδια θέση
+    reply = server.on_control(b"c4", {"type": "connect", "id": "p4", "protocols": ["bin1"], "req": 2})
+    assert reply == {"status": "queued", "position": 2, "req": 2}
+
+    # Μία θέση αδειάζει: ο πρώτος της ουράς μπαίνει, οι υπόλοιποι προχωράνε
+    server.on_control(b"c0", {"type": "disconnect", "id": "p0", "req": 3})
+    server.control_outbox.clear()
+    server.world.tick = server.queue_update_ticks
+    server.admit()
+    assert "p3" in server.world.connected
+    positions = {identity: reply.get("position") for identity, reply in server.control_outbox}
+    assert positions == {b"c3": None, b"c4": 1, b"c5": 2}
+
+def test_connect_rejects_ids_longer_than_name_record():
+    server = make_server()
+    assert connect(server, "x" * 253) is None
+    reply = connect(server, "x" * 254)
+    assert reply == {"status": "error", "reason": "id too long", "req": 1}
+    assert server.world.connected == {"x" * 253}
+
+# Ακίνητος παίκτης με νέο seq: το ack φεύγει αμέσως, ακόμα κι αν η θέση του δεν αλλάζει στο delta
+def test_ack_for_stationary_player():
+    server = make_server()
+    world = server.world
+    connect(server, "me", b"a")
+    connect(server, "other", b"b")
+
+    encoders = server.cell_encoders
+    decoders = {}
+    baselines = {}
+    def tick(msg=None):
+        if msg is not None:
+            server.on_input(msg)
+        world.step()
+        acks = {}
+        players = {}
+        for stream, state in server.state_messages():
+            decoded = decoders.setdefault(stream, StateDecoder()).decode(encoders[stream].encode(state))
+            assert baselines.setdefault(stream, DeltaDecoder()).apply(decoded)
+            acks.update(decoded.get("acks", {}))
+            players.update(decoded.get("players", {}))
+        return acks, players
+
+    for _ in range(4):
+        tick()
+    assert "me" not in tick()[0]
+
+    acks, players = tick({"id": "me", "seq": 1, "keys": 0})
+    assert tuple(acks["me"]) == (1, world.tick)
+    assert "me" not in players
+    assert "me" not in tick()[0]
+
+    acks, players = tick({"id": "me", "seq": 2, "keys": 0})
+    assert tuple(acks["me"]) == (2, world.tick)
+    assert sum(baseline.missed for baseline in baselines.values()) == 0
+
+# Πολλοί παίκτες με νέο seq στο ίδιο κελί: το πολύ ACK_LIMIT acks ανά μήνυμα, και κάθε παίκτης παίρνει
+# το δικό του με τη σειρά (όποιος περιμένει περισσότερο πρώτος)
+def test_acks_limited_per_message_and_fair():
+    server = make_server(max_players=40, size=480)   # Όλα τα spawns στο κελί (0, 0)
+    world = server.world
+    pids = [f"p{i}" for i in range(40)]
+    for i, pid in enumerate(pids):
+        connect(server, pid, b"c%d" % i)
+
+    decoders = {}
+    last_acked = {}
+    for seq in range(1, 20):
+        for pid in pids:
+            server.on_input({"id": pid, "seq": seq, "keys": 0})
+        world.step()
+        for stream, state in server.state_messages():
+            assert len(state.get("acks", ())) <= ACK_LIMIT
+            decoded = decoders.setdefault(stream, StateDecoder()).decode(server.cell_encoders[stream].encode(state))
+            for pid in decoded.get("acks", {}):
+                last_acked[pid] = seq
+        if seq > 3:
+            # 40 παίκτες, 16 acks ανά tick: κανείς δεν περιμένει πάνω από 3 ticks
+            assert all(seq - last_acked.get(pid, 0) < 3 for pid in pids)
@@ -0,0 +1,75 @@
+# Ring buffer πάνω σε shared memory: σειρά, αναδίπλωση στο τέλος του buffer, γεμάτος buffer, δεύτερο process
+
+import multiprocessing
+import time
+import pytest
+from sharedRing import SharedRing, LENGTH
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create(256)
+    yield ring
+    ring.close()
+
+def test_fifo(ring):
+    assert ring.get() is None
+    for i in range(5):
+        assert ring.put(b"msg%d" % i)
+    assert list(ring.drain()) == [b"msg%d" % i for i in range(5)]
+    assert ring.get() is None
+    assert len(ring) == 0
+
+def test_empty_message(ring):
+    assert ring.put(b"")
+    assert ring.get() == b""
+    assert ring.get() is None
+
+def test_wraps_around(ring):
+    # Μηνύματα που δεν διαιρούν τη χωρητικότητα: κάποια κόβονται στο τέλος του buffer (και τα μήκη τους)
+    for i in range(200):
+        data = bytes([i % 256]) * (i % 37 + 1)
+        assert ring.put(data)
+        assert ring.get() == data
+    assert len(ring) == 0
+
+def test_full_ring_drops(ring):
+    payload = b"x" * 60
+    accepted = 0
+    while ring.put(payload):
+        accepted += 1
+    assert accepted == ring.capacity // (LENGTH.size + len(payload))
+    assert ring.dropped == 1
+
+    # Ο παραγωγός συνεχίζει μόλις ο καταναλωτής ελευθερώσει χώρο
+    assert ring.get() == payload
+    assert ring.put(payload)
+    assert len(list(ring.drain())) == accepted
+
+def produce(name, count):
+    ring = SharedRing.attach(name)
+    sent = 0
+    while sent < count:
+        if ring.put(sent.to_bytes(4, "little") * (sent % 7 + 1)):
+            sent += 1
+    ring.close()
+
+def test_across_processes():
+    ring = SharedRing.create(1024)
+    try:
+        count = 2000
+        process = multiprocessing.get_context("spawn").Process(target=produce, args=(ring.name, count))
+        process.start()
+
+        received = []
+        deadline = time.monotonic() + 30
+        while len(received) < count:
+            assert time.monotonic() < deadline, "ο παραγωγός σταμάτησε"
+            data = ring.get()
+            if data is not None:
+                received.append(data)
+        process.join(10)
+
+        assert received == [i.to_bytes(4, "little") * (i % 7 + 1) for i in range(count)]
+        assert process.exitcode == 0
+    finally:
+        ring.close()
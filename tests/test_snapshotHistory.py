@@ -0,0 +1,77 @@
+# Ιστορικό θέσεων: interpolation ανάμεσα σε ticks, ring που ξαναγράφεται, παίκτες που μπαίνουν και φεύγουν
+
+import pytest
+from entityStore import make_player_store
+from snapshotHistory import SnapshotHistory
+
+LENGTH = 8
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def store(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return make_player_store(request.param)
+
+# Ο παίκτης a κινείται 10 pixels ανά tick στον x από το tick 0 ως το tick last
+def record_walk(store, history, last, start=0):
+    for tick in range(start, last + 1):
+        store.set_position("a", 10.0 * tick, 5.0)
+        history.record(tick)
+
+def test_exact_and_interpolated_ticks(store):
+    store.add("a", 0.0, 5.0)
+    history = SnapshotHistory(store, LENGTH)
+    record_walk(store, history, 5)
+
+    assert history.position_at("a", 3) == (30.0, 5.0)
+    assert history.position_at("a", 3.25) == pytest.approx((32.5, 5.0))
+    assert history.position_at("missing", 3) is None
+    assert history.tick_range() == (0, 5)
+
+def test_ticks_outside_the_ring(store):
+    store.add("a", 0.0, 5.0)
+    history = SnapshotHistory(store, LENGTH)
+    record_walk(store, history, 20)
+
+    # Μόνο τα τελευταία LENGTH ticks: τα παλιότερα έχουν ξαναγραφτεί
+    assert history.tick_range() == (20 - LENGTH + 1, 20)
+    assert history.position_at("a", 20 - LENGTH) is None
+    assert history.position_at("a", 2) is None
+    assert history.position_at("a", 20 - LENGTH + 1) == (10.0 * (20 - LENGTH + 1), 5.0)
+
+    # Μετά το νεότερο tick: τίποτα για ακέραιο tick, η τελευταία θέση ανάμεσα σε αυτό και το επόμενο
+    assert history.position_at("a", 21) is None
+    assert history.position_at("a", 20.5) == (200.0, 5.0)
+
+def test_player_missing_on_one_side(store):
+    store.add("a", 0.0, 5.0)
+    history = SnapshotHistory(store, LENGTH)
+    record_walk(store, history, 2)
+
+    # Ο b μπαίνει στο tick 3: πριν από αυτό δεν υπήρχε
+    store.add("b", 100.0, 100.0)
+    record_walk(store, history, 4, start=3)
+    assert history.position_at("b", 2.5) is None
+    assert history.position_at("b", 3) == (100.0, 100.0)
+
+    # Ο a φεύγει και το slot του παίρνει ο c: ο c δεν "κληρονομεί" τις παλιές θέσεις του a
+    store.remove("a")
+    store.add("c", 500.0, 500.0)
+    assert store.slot_of("c") == 0
+    history.record(5)
+    assert history.position_at("a", 4) is None
+    assert history.position_at("c", 4) is None
+    assert history.position_at("c", 4.5) is None
+    assert history.position_at("c", 5) == (500.0, 500.0)
+
+def test_store_growth_keeps_history(store):
+    store.add("a", 0.0, 5.0)
+    history = SnapshotHistory(store, LENGTH)
+    record_walk(store, history, 3)
+
+    for i in range(store.capacity + 10):
+        store.add(f"p{i}", float(i), float(i))
+    history.record(4)
+    assert history.capacity == store.capacity
+    assert history.position_at("a", 2.5) == pytest.approx((25.0, 5.0))
+    assert history.position_at("p70", 4) == (70.0, 70.0)
@@ -0,0 +1,38 @@
+# Ροή spectators: ενεργή μόνο με subscribers, και keyframe για κάθε νέο spectator
+
+from spectatorStream import SpectatorStream
+from wireProtocol import StateDecoder, SPECTATOR_TOPIC
+
+SECTIONS = {"players": [("a", 10.0, 20.0), ("b", 30.0, 40.0)]}
+
+def encode(stream, tick):
+    return StateDecoder().decode(stream.encode(tick, SECTIONS, {"tick_dt": 0.02}))
+
+def test_active_only_while_subscribed():
+    stream = SpectatorStream()
+    assert not stream.watching
+    stream.on_subscription(b"\x01other")
+    assert not stream.watching
+
+    stream.on_subscription(b"\x01" + SPECTATOR_TOPIC)
+    stream.on_subscription(b"\x01")     # Subscribe σε όλα τα topics
+    assert stream.watching
+    stream.on_subscription(b"\x00" + SPECTATOR_TOPIC)
+    assert stream.watching
+    stream.on_subscription(b"\x00")
+    assert not stream.watching
+
+def test_late_subscriber_gets_keyframe():
+    stream = SpectatorStream()
+    stream.on_subscription(b"\x01" + SPECTATOR_TOPIC)
+    first = encode(stream, 5)
+    assert first.get("key") and len(first["players"]) == 2
+
+    # Τίποτα δεν άλλαξε: delta χωρίς οντότητες
+    second = encode(stream, 10)
+    assert second["base"] == 5 and not second.get("players")
+
+    # Δεύτερος spectator στο ίδιο topic (XPUB_VERBOSE): το επόμενο μήνυμα είναι πλήρες
+    stream.on_subscription(b"\x01" + SPECTATOR_TOPIC)
+    third = encode(stream, 15)
+    assert third.get("key") and "base" not in third and len(third["players"]) == 2
@@ -0,0 +1,68 @@
+# Hashed timer wheel: λήξη στο σωστό tick, ακύρωση, καθυστερήσεις πάνω από έναν γύρο
+
+from timerWheel import TimerWheel
+
+def run(wheel, ticks):
+    for _ in range(ticks):
+        wheel.advance()
+
+def test_fires_on_deadline():
+    wheel = TimerWheel(slots=8)
+    fired = []
+    for delay in (1, 3, 7):
+        wheel.schedule(delay, lambda d: fired.append((d, wheel.now)), delay)
+    assert len(wheel) == 3
+
+    run(wheel, 10)
+    assert fired == [(1, 1), (3, 3), (7, 7)]
+    assert len(wheel) == 0
+
+def test_delay_longer_than_wheel():
+    wheel = TimerWheel(slots=8)
+    fired = []
+    for delay in (8, 9, 20, 64):
+        wheel.schedule(delay, lambda: fired.append(wheel.now))
+    run(wheel, 70)
+    assert fired == [8, 9, 20, 64]
+
+def test_zero_delay_fires_next_tick():
+    wheel = TimerWheel(slots=4)
+    fired = []
+    wheel.schedule(0, lambda: fired.append(wheel.now))
+    wheel.advance()
+    assert fired == [1]
+
+def test_cancel():
+    wheel = TimerWheel(slots=8)
+    fired = []
+    timer = wheel.schedule(5, lambda: fired.append("cancelled"))
+    wheel.schedule(5, lambda: fired.append("kept"))
+    wheel.cancel(timer)
+    wheel.cancel(timer)     # Δεύτερη ακύρωση: τίποτα
+    wheel.cancel(None)
+    assert len(wheel) == 1
+
+    run(wheel, 10)
+    assert fired == ["kept"]
+    assert len(wheel) == 0
+
+def test_cancel_after_fire_is_noop():
+    wheel = TimerWheel(slots=8)
+    timer = wheel.schedule(1, lambda: None)
+    wheel.advance()
+    wheel.cancel(timer)
+    assert len(wheel) == 0
+
+def test_callback_can_reschedule():
+    wheel = TimerWheel(slots=4)
+    fired = []
+
+    def tick(remaining):
+        fired.append(wheel.now)
+        if remaining:
+            wheel.schedule(3, tick, remaining - 1)
+
+    wheel.schedule(3, tick, 3)
+    run(wheel, 20)
+    assert fired == [3, 6, 9, 12]
+    assert len(wheel) == 0
@@ -0,0 +1,150 @@
+# Δυαδικό πρωτόκολλο: η κατάσταση και τα inputs βγαίνουν ίδια με το JSON μετά την αποκωδικοποίηση
+
+import json
+import random
+import pytest
+from deltaSnapshot import DeltaEncoder, DeltaDecoder
+from wireProtocol import (
+    StateEncoder, StateDecoder, encode_json, encode_input, encode_heartbeat, decode_input,
+    choose_protocol, quantization, id_fits, check_input, valid_id, PROTOCOL_BINARY, PROTOCOL_JSON, MAX_ID_BYTES, MAX_SEQ
+)
+
+EXTRA = {"tick_dt": 0.02, "elapsed_time": 12.5, "region": "firstRegion"}
+
+def entities(items):
+    return [(eid, x, y) for eid, (x, y) in items.items()]
+
+def test_choose_protocol():
+    assert choose_protocol(None) == PROTOCOL_JSON
+    assert choose_protocol([PROTOCOL_JSON, PROTOCOL_BINARY]) == PROTOCOL_BINARY
+    assert choose_protocol([PROTOCOL_JSON]) == PROTOCOL_JSON
+    assert choose_protocol(["bin9"]) is None
+
+def test_quantization_fits_uint16():
+    for size in (100, 2048, 4095, 4096, 65535, 100000):
+        scale = quantization(size, size // 2)
+        assert scale >= 1
+        assert scale == 1 or size * scale <= 0xFFFF
+
+def test_binary_matches_json():
+    rng = random.Random(1)
+    players = {f"p{i}": (rng.uniform(0, 2000), rng.uniform(0, 2000)) for i in range(100)}
+    mobs = {i: (rng.uniform(0, 2000), rng.uniform(0, 2000)) for i in range(30)}
+    scale = quantization(2000, 2000)
+    delta = DeltaEncoder(keyframe_interval=40)
+    encoder = StateEncoder(scale)
+    decoder = StateDecoder()
+    binary = DeltaDecoder()
+    text = DeltaDecoder()
+
+    for tick in range(150):
+        for eid in rng.sample(list(players), 20):
+            players[eid] = (min(1999.0, players[eid][0] + rng.uniform(0, 3)), players[eid][1])
+        if rng.random() < 0.2:
+            players.pop(rng.choice(list(players)))
+        if rng.random() < 0.2:
+            players[f"n{tick}"] = (5.0, 7.0)
+
+        msg = delta.encode(tick, {"players": entities(players), "mobs": entities(mobs)})
+        msg.update(EXTRA)
+        data = encoder.encode(msg)
+        decoded = decoder.decode(data)
+        assert decoded["tick"] == tick and decoded["region"] == "firstRegion"
+        assert len(data) < len(encode_json(msg))
+
+        assert binary.apply(decoded)
+        assert text.apply(json.loads(encode_json(msg)))
+
+    assert set(binary.sections["players"]) == set(players) == set(text.sections["players"])
+    for eid, (x, y) in players.items():
+        pos = binary.sections["players"][eid]
+        assert abs(pos["x"] - x) <= 0.5 / scale and abs(pos["y"] - y) <= 0.5 / scale
+    assert set(binary.sections["mobs"]) == set(mobs)     # Τα int ids μένουν int
+
+def test_positions_clamped_to_range():
+    encoder = StateEncoder(4)
+    msg = {"tick": 1, "key": 1, "players": {"a": {"x": -10.0, "y": 1e9}}, "mobs": {}}
+    decoded = StateDecoder().decode(encoder.encode(msg))
+    assert decoded["players"]["a"] == {"x": 0.0, "y": 0xFFFF / 4}
+
+def test_net_ids_reused_after_removal():
+    delta = DeltaEncoder()
+    encoder = StateEncoder(1)
+    decoder = StateDecoder()
+    base = DeltaDecoder()
+    for tick, players in enumerate(({"a": (1, 1)}, {"b": (2, 2)}, {"b": (2, 2), "c": (3, 3)})):
+        base.apply(decoder.decode(encoder.encode(delta.encode(tick, {"players": entities(players), "mobs": []}))))
+        assert set(base.sections["players"]) == set(players)
+    assert len(encoder.net_ids["players"].ids) == 2
+
+def test_acks_for_known_players_only():
+    encoder = StateEncoder(1)
+    decoder = StateDecoder()
+    decoder.decode(encoder.encode({"tick": 10, "key": 1, "players": {"a": {"x": 1, "y": 1}}, "mobs": {}}))
+
+    # Το "b" δεν έχει net id σε αυτή τη ροή: το ack του θα πάει μαζί με την πρώτη του εγγραφή
+    msg = {"tick": 11, "base": 10, "acks": {"a": (7, 9), "b": (3, 11)}}
+    assert decoder.decode(encoder.encode(msg))["acks"] == {"a": (7, 9)}
+
+def test_long_names():
+    pid = "x" * (MAX_ID_BYTES - 2)
+    assert id_fits(pid) and not id_fits(pid + "x")
+    assert not id_fits("é" * 43)     # é στο JSON: 6 bytes ανά χαρακτήρα
+
+    msg = {"tick": 1, "key": 1, "players": {pid: {"x": 1, "y": 2}}, "mobs": {}}
+    assert list(StateDecoder().decode(StateEncoder(1).encode(msg))["players"]) == [pid]
+
+def test_other_wire_version_ignored():
+    data = bytearray(StateEncoder(1).encode({"tick": 1, "key": 1, "players": {}, "mobs": {}}))
+    data[0] += 1
+    assert StateDecoder().decode(bytes(data)) is None
+
+@pytest.mark.parametrize("pid", ["player", 42, "ελληνικά"])
+def test_input_roundtrip(pid):
+    assert decode_input(encode_input(pid, 5, 9)) == {"id": pid, "seq": 5, "keys": 9}
+    assert decode_input(encode_input(pid, 6, 0, (10.5, 20.25))) == {"id": pid, "seq": 6, "keys": 0, "goto": [10.5, 20.25]}
+    assert decode_input(encode_heartbeat(pid)) == {"id": pid, "hb": 1}
+    assert decode_input(json.dumps({"id": pid, "seq": 1, "keys": 2}).encode()) == {"id": pid, "seq": 1, "keys": 2}
+
+@pytest.mark.parametrize("data", [b"", b"\x01", b"{not json", b"[1, 2]", encode_input("p", 1, 0)[:-2], b"\x09" + encode_input("p", 1, 0)[1:]])
+def test_undecodable_input(data):
+    assert decode_input(data) is None
+
+def test_valid_id():
+    assert valid_id("p1") and valid_id(7)
+    assert not any(valid_id(pid) for pid in (None, True, 1.5, ["p"], {"p": 1}))
+
+def test_check_input_keeps_known_fields():
+    assert check_input({"id": "p", "seq": 3, "keys": 5, "extra": "x"}) == {"id": "p", "seq": 3, "keys": 5}
+    assert check_input({"id": "p", "seq": 1, "keys": 0, "goto": [1, 2.5]}) == {"id": "p", "seq": 1, "keys": 0, "goto": [1.0, 2.5]}
+    assert check_input({"id": "p", "hb": 1, "seq": "x"}) == {"id": "p", "hb": 1}
+    assert check_input({"id": "p"}) == {"id": "p", "seq": 0, "keys": 0}
+    assert check_input({"id": "p", "seq": MAX_SEQ, "keys": 255}) is not None
+
+@pytest.mark.parametrize("msg", [
+    None, [], "p",
+    {"seq": 1, "keys": 0},
+    {"id": None, "seq": 1, "keys": 0},
+    {"id": ["p"], "seq": 1, "keys": 0},
+    {"id": "p", "seq": "1", "keys": 0},
+    {"id": "p", "seq": 1.0, "keys": 0},
+    {"id": "p", "seq": True, "keys": 0},
+    {"id": "p", "seq": -1, "keys": 0},
+    {"id": "p", "seq": MAX_SEQ + 1, "keys": 0},
+    {"id": "p", "seq": 1, "keys": 256},
+    {"id": "p", "seq": 1, "keys": [1]},
+    {"id": "p", "seq": 1, "keys": 0, "goto": "here"},
+    {"id": "p", "seq": 1, "keys": 0, "goto": [1]},
+    {"id": "p", "seq": 1, "keys": 0, "goto": [1, "2"]},
+    {"id": "p", "seq": 1, "keys": 0, "goto": [1, float("nan")]},
+    {"id": "p", "seq": 1, "keys": 0, "goto": [float("inf"), 1]},
+    {"id": "p", "seq": 1, "keys": 0, "goto": [True, 1]},
+])
+def test_check_input_rejects_malformed(msg):
+    assert check_input(msg) is None
+
+# Τα δυαδικά inputs περνάνε από τους ίδιους ελέγχους με τα JSON
+def test_binary_input_checked_like_json():
+    assert check_input(decode_input(encode_input("p", 4, 3, (1.0, 2.0)))) == {"id": "p", "seq": 4, "keys": 3, "goto": [1.0, 2.0]}
+    assert check_input(decode_input(encode_input(None, 4, 3))) is None
+    assert check_input(decode_input(encode_input("p", 4, 3, (float("nan"), 2.0)))) is None
@@ -0,0 +1,91 @@
+# Scheduler για σταθερό βήμα προσομοίωσης (fixed-step)
+#
+# Τα ticks υπολογίζονται πάνω σε monotonic ρολόι ως start + n * tick_dt, οπότε ο χρόνος
+# επεξεργασίας κάθε tick δεν προστίθεται στο επόμενο (drift compensation).
+# Αν ο server καθυστερήσει πολύ, πηδάμε μπροστά αντί να τρέξουμε ριπή από ticks.
+
+import asyncio
+import time
+
+class TickScheduler:
+    def __init__(self, tick_dt, max_catchup_ticks=5, clock=time.monotonic):
+        self.tick_dt = tick_dt
+        self.max_catchup_ticks = max_catchup_ticks  # Μέγιστη καθυστέρηση (σε ticks) πριν κάνουμε resync
+        self.clock = clock
+
+        self.start_time = None
+        self.next_deadline = None
+        self.tick_start = None
+
+        # Στατιστικά
+        self.ticks = 0              # Πόσα ticks έχουν τρέξει
+        self.overruns = 0           # Ticks που η επεξεργασία τους ξεπέρασε το tick_dt
+        self.skipped_ticks = 0      # Ticks που χάθηκαν σε resync
+        self.max_tick_time = 0.0    # Μέγιστος χρόνος επεξεργασίας ενός tick
+        self.total_tick_time = 0.0
+
+    # Έναρξη του ρολογιού
+    def start(self):
+        self.start_time = self.clock()
+        self.next_deadline = self.start_time
+
+    # Πόσος χρόνος μένει μέχρι το επόμενο tick (0 αν έχουμε ήδη αργήσει)
+    def time_until_next_tick(self):
+        return max(0.0, self.next_deadline - self.clock())
+
+    # Περιμένει μέχρι το επόμενο tick
+    async def wait_next_tick(self):
+        if self.start_time is None:
+            self.start()
+
+        delay = self.time_until_next_tick()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)  # Αφήνουμε τα υπόλοιπα tasks (sockets) να τρέξουν
+
+        self.begin_tick()
+
+    # Σημειώνει την αρχή ενός tick και υπολογίζει το επόμενο deadline
+    def begin_tick(self):
+        now = self.clock()
+        self.tick_start = now
+        self.next_deadline += self.tick_dt
+
+        # Αν έχουμε μείνει πολύ πίσω, κάνουμε resync αντί για catch-up
+        behind = now - self.next_deadline
+        if behind > self.max_catchup_ticks * self.tick_dt:
+            missed = int(behind // self.tick_dt)
+            self.skipped_ticks += missed
+            self.next_deadline += missed * self.tick_dt
+
+    # Σημειώνει το τέλος ενός tick και ενημερώνει τα στατιστικά
+    def end_tick(self):
+        elapsed = self.clock() - self.tick_start
+        self.ticks += 1
+        self.total_tick_time += elapsed
+
+        if elapsed > self.max_tick_time:
+            self.max_tick_time = elapsed
+
+        if elapsed > self.tick_dt:
+            self.overruns += 1
+
+        return elapsed
+
+    # Πραγματικός ρυθμός ticks από την αρχή
+    def actual_rate(self):
+        if self.start_time is None:
+            return 0.0
+        elapsed = self.clock() - self.start_time
+        return self.ticks / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "rate": self.actual_rate(),
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+            "max_tick_ms": self.max_tick_time * 1000,
+            "avg_tick_ms": (self.total_tick_time / self.ticks * 1000) if self.ticks else 0.0,
+        }
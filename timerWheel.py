@@ -0,0 +1,71 @@
+# Hashed timer wheel για καθυστερημένα γεγονότα του server
+#
+# Ο τροχός έχει σταθερό αριθμό θέσεων (slots), μία ανά tick. Ένα timer μπαίνει στη θέση
+# (now + delay) % slots, με "rounds" για καθυστερήσεις μεγαλύτερες από έναν γύρο.
+# Προσθήκη και ακύρωση είναι O(1), και σε κάθε tick κοιτάμε μόνο τη θέση του τρέχοντος tick.
+
+class Timer:
+    __slots__ = ("deadline", "rounds", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, rounds, callback, args):
+        self.deadline = deadline    # Tick στο οποίο λήγει
+        self.rounds = rounds        # Πόσους ολόκληρους γύρους πρέπει να περιμένει ακόμα
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+class TimerWheel:
+    def __init__(self, slots=512):
+        self.slots = [[] for _ in range(slots)]
+        self.size = slots
+        self.now = 0        # Τρέχον tick του τροχού
+        self.pending = 0    # Ενεργά timers
+
+    def __len__(self):
+        return self.pending
+
+    # Προγραμματίζει το callback(*args) να τρέξει μετά από delay ticks (τουλάχιστον 1)
+    def schedule(self, delay, callback, *args):
+        delay = max(1, int(delay))
+        deadline = self.now + delay
+        rounds = (delay - 1) // self.size
+
+        timer = Timer(deadline, rounds, callback, args)
+        self.slots[deadline % self.size].append(timer)
+        self.pending += 1
+        return timer
+
+    # Lazy ακύρωση: το timer αφαιρείται όταν ο τροχός φτάσει στη θέση του
+    def cancel(self, timer):
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self.pending -= 1
+
+    # Προχωράει τον τροχό ένα tick και τρέχει τα timers που έληξαν
+    def advance(self):
+        self.now += 1
+        index = self.now % self.size
+        bucket = self.slots[index]
+        if not bucket:
+            return 0
+
+        due = []
+        waiting = []
+        for timer in bucket:
+            if timer.cancelled:
+                continue
+            if timer.rounds > 0:
+                timer.rounds -= 1
+                waiting.append(timer)
+            else:
+                due.append(timer)
+
+        self.slots[index] = waiting
+
+        # Τα callbacks μπορούν να ξαναπρογραμματίσουν timers (μπαίνουν σε επόμενες θέσεις)
+        for timer in due:
+            timer.cancelled = True
+            self.pending -= 1
+            timer.callback(*timer.args)
+
+        return len(due)
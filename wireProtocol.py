@@ -0,0 +1,336 @@
+# Δυαδικό πρωτόκολλο για το PUB (κατάσταση) και το PULL (inputs)
+#
+# Ο client προτείνει πρωτόκολλα στο connect ("protocols") και ο server απαντάει με αυτό που
+# διάλεξε. Το JSON μένει διαθέσιμο για debugging. Στο PUB κάθε μήνυμα έχει topic ανά μορφή
+# (multipart [topic, payload]), οπότε ο client κάνει subscribe μόνο σε αυτή που χρησιμοποιεί.
+#
+# Κατάσταση (δυαδικά): header, και για κάθε section (players, mobs) τα ids που αφαιρέθηκαν,
+# εγγραφές σταθερού μήκους (net id, x, y) με κβαντισμένες θέσεις σε uint16 και πίνακας
+# net id → πραγματικό id για τις οντότητες που εμφανίστηκαν (ή όλες σε keyframe). Τα net ids
+# είναι μικροί αριθμοί που δίνει ο server ξεχωριστά για κάθε ροή (κελί του χάρτη, βλ.
+# areaOfInterest.py), οπότε ο client βλέπει την ίδια οντότητα με το ίδιο id σε όποιο κελί κι αν είναι.
+# Με το flag ACKS ακολουθούν τα acks των inputs για τους παίκτες του μηνύματος (net id, seq, πόσα ticks
+# πριν εφαρμόστηκε): ο client τα χρειάζεται για το prediction της κίνησής του (prediction.py).
+#
+# Inputs (δυαδικά): version, τύπος, seq, πλήκτρα, (x, y για goto) και στο τέλος το pid.
+
+import json
+import math
+import struct
+
+PROTOCOL_BINARY = "bin1"
+PROTOCOL_JSON = "json"
+SUPPORTED_PROTOCOLS = (PROTOCOL_BINARY, PROTOCOL_JSON)     # Σε σειρά προτίμησης του server
+
+WIRE_VERSION = 1
+
+# Topics του PUB
+STATE_BINARY = b"B"
+STATE_JSON = b"J"
+HANDOFF_TOPIC = b"H"    # Μηνύματα handoff (πάντα JSON, σπάνια)
+SPECTATOR_TOPIC = b"S"  # Ροή για spectators (πάντα δυαδικά, βλ. spectatorStream.py)
+
+SECTIONS = ("players", "mobs")
+
+# Flags του header
+KEYFRAME = 1
+ACKS = 2
+
+STATE_HEADER = struct.Struct("<BBIIBffB")   # version, flags, tick, base, scale, tick_dt, elapsed, μήκος region
+COUNT = struct.Struct("<H")
+RECORD = struct.Struct("<HHH")              # net id, x, y (κβαντισμένα σε 1/scale pixel)
+NAME = struct.Struct("<HB")                 # net id, μήκος του id (JSON)
+ACK = struct.Struct("<HIH")                 # net id, seq, ticks από το tick που εφαρμόστηκε το seq
+REMOVED_BYTES = 2                           # Ένα net id (uint16) στη λίστα των αφαιρέσεων
+
+INPUT_HEADER = struct.Struct("<BBIB")       # version, τύπος, seq, πλήκτρα
+GOTO = struct.Struct("<ff")
+
+INPUT_KEYS = 0
+INPUT_HEARTBEAT = 1
+INPUT_GOTO = 2
+
+MAX_QUANT = 16      # Μέγιστα βήματα ανά pixel
+
+MAX_SEQ = 0xFFFFFFFF    # Τα seq χωράνε σε uint32 (όπως στο δυαδικό input)
+MAX_KEYS = 0xFF
+MAX_ID_BYTES = 0xFF     # Το μήκος του id (JSON) στην εγγραφή NAME είναι ένα byte
+
+# Πρωτόκολλο που θα χρησιμοποιήσει ο server για τα πρωτόκολλα που προτείνει ο client
+def choose_protocol(offered):
+    if not offered:
+        return PROTOCOL_JSON    # Παλιοί clients χωρίς negotiation
+    for protocol in SUPPORTED_PROTOCOLS:
+        if protocol in offered:
+            return protocol
+    return None
+
+# Βήματα κβαντισμού ανά pixel ώστε όλος ο χάρτης να χωράει σε uint16
+def quantization(width, height):
+    return max(1, min(MAX_QUANT, 0xFFFF // max(1, int(max(width, height)))))
+
+def encode_json(msg):
+    # Τα keys των dicts γίνονται str στο JSON, οπότε και τα ids που αφαιρέθηκαν
+    removed = msg.get("removed")
+    if removed:
+        msg = dict(msg, removed={name: [str(eid) for eid in ids] for name, ids in removed.items()})
+    return json.dumps(msg).encode()
+
+# Μικροί αριθμοί για τα ids των οντοτήτων, επαναχρησιμοποιούνται όταν μια οντότητα φύγει
+class NetIds:
+    def __init__(self):
+        self.ids = {}
+        self.free = []
+        self.next = 0
+
+    def get(self, eid):
+        nid = self.ids.get(eid)
+        if nid is not None:
+            return nid, False
+        if self.free:
+            nid = self.free.pop()
+        else:
+            if self.next > 0xFFFF:
+                raise OverflowError("out of net ids")
+            nid = self.next
+            self.next += 1
+        self.ids[eid] = nid
+        return nid, True
+
+    def release(self, eid):
+        nid = self.ids.pop(eid, None)
+        if nid is not None:
+            self.free.append(nid)
+        return nid
+
+    # Σε keyframe κρατάμε μόνο τα ids των οντοτήτων που υπάρχουν
+    def retain(self, eids):
+        for eid in [eid for eid in self.ids if eid not in eids]:
+            self.release(eid)
+
+# Bytes μιας οντότητας στο μήνυμα κατάστασης: η εγγραφή της και, αν ο client δεν την ξέρει, το όνομά της
+def record_bytes(eid, new):
+    if new:
+        return RECORD.size + NAME.size + len(json.dumps(eid).encode())
+    return RECORD.size
+
+# Server: delta μήνυμα (από το DeltaEncoder) → bytes
+class StateEncoder:
+    def __init__(self, scale):
+        self.scale = scale
+        self.net_ids = {name: NetIds() for name in SECTIONS}
+
+    def encode(self, msg):
+        keyframe = bool(msg.get("key"))
+        acks = msg.get("acks")
+        region = msg.get("region", "").encode()
+        scale = self.scale
+        limit = 0xFFFF
+
+        flags = (KEYFRAME if keyframe else 0) | (ACKS if acks else 0)
+        parts = [STATE_HEADER.pack(
+            WIRE_VERSION, flags, msg["tick"], msg.get("base", 0),
+            scale, msg.get("tick_dt", 0.0), msg.get("elapsed_time", 0.0), len(region)
+        ), region]
+
+        # Κάθε section: ids που αφαιρέθηκαν, εγγραφές, πίνακας ονομάτων για τα νέα net ids
+        removed = msg.get("removed", {})
+        for name in SECTIONS:
+            net_ids = self.net_ids[name]
+            changed = msg.get(name, {})
+            if keyframe:
+                net_ids.retain(changed)
+
+            # Πρώτα οι αφαιρέσεις ώστε τα ids που ελευθερώνονται να μπορούν να ξαναδοθούν αμέσως
+            gone = [net_ids.release(eid) for eid in removed.get(name, ())]
+            gone = [nid for nid in gone if nid is not None]
+            parts.append(COUNT.pack(len(gone)))
+            parts.append(struct.pack(f"<{len(gone)}H", *gone))
+
+            # Όλες οι εγγραφές (net id, x, y) με ένα μόνο struct.pack
+            names = []
+            flat = []
+            for eid, pos in changed.items():
+                nid, new = net_ids.get(eid)
+                if new or keyframe:
+                    names.append((nid, json.dumps(eid).encode()))
+                x = int(pos["x"] * scale + 0.5)
+                y = int(pos["y"] * scale + 0.5)
+                flat.append(nid)
+                flat.append(x if 0 <= x <= limit else (0 if x < 0 else limit))
+                flat.append(y if 0 <= y <= limit else (0 if y < 0 else limit))
+            parts.append(COUNT.pack(len(changed)))
+            parts.append(struct.pack(f"<{len(flat)}H", *flat))
+
+            parts.append(COUNT.pack(len(names)))
+            for nid, raw in names:
+                parts.append(NAME.pack(nid, len(raw)))
+                parts.append(raw)
+
+        # Acks: μόνο για παίκτες με net id σε αυτή τη ροή, που ο client ήδη ξέρει (οι υπόλοιποι
+        # θα πάρουν ack μαζί με την πρώτη τους εγγραφή)
+        if acks:
+            tick = msg["tick"]
+            player_ids = self.net_ids["players"].ids
+            flat = []
+            for pid, (seq, applied) in acks.items():
+                nid = player_ids.get(pid)
+                if nid is not None:
+                    flat.append(nid)
+                    flat.append(seq & 0xFFFFFFFF)
+                    flat.append(min(limit, max(0, tick - applied)))
+            parts.append(COUNT.pack(len(flat) // 3))
+            parts.append(struct.pack("<" + "HIH" * (len(flat) // 3), *flat))
+
+        return b"".join(parts)
+
+# Client: bytes → το ίδιο dict που θα έδινε το JSON (για το DeltaDecoder)
+class StateDecoder:
+    def __init__(self):
+        self.names = {name: {} for name in SECTIONS}    # section → {net id → πραγματικό id}
+
+    def decode(self, data):
+        version, flags, tick, base, scale, tick_dt, elapsed, region_len = STATE_HEADER.unpack_from(data, 0)
+        if version != WIRE_VERSION:
+            return None
+
+        offset = STATE_HEADER.size
+        keyframe = flags & KEYFRAME
+        msg = {"tick": tick, "tick_dt": tick_dt, "elapsed_time": elapsed}
+        if keyframe:
+            msg["key"] = 1
+        else:
+            msg["base"] = base
+        if region_len:
+            msg["region"] = data[offset:offset + region_len].decode()
+            offset += region_len
+
+        inv = 1.0 / scale
+        removed = {}
+        for name in SECTIONS:
+            names = self.names[name]
+            if keyframe:
+                names.clear()
+
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            if count:
+                gone = struct.unpack_from(f"<{count}H", data, offset)
+                removed[name] = [names.pop(nid, nid) for nid in gone]
+                offset += 2 * count
+
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            records = RECORD.iter_unpack(data[offset:offset + count * RECORD.size])
+            offset += count * RECORD.size
+
+            # Τα ονόματα έρχονται μετά τις εγγραφές αλλά πρέπει να εφαρμοστούν πριν τις μεταφράσουμε
+            (size_names,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            for _ in range(size_names):
+                nid, size = NAME.unpack_from(data, offset)
+                offset += NAME.size
+                names[nid] = json.loads(data[offset:offset + size])
+                offset += size
+
+            entities = {names.get(nid, nid): {"x": x * inv, "y": y * inv} for nid, x, y in records}
+            if entities or keyframe:
+                msg[name] = entities
+
+        if removed:
+            msg["removed"] = removed
+
+        if flags & ACKS:
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            names = self.names["players"]
+            msg["acks"] = {
+                names.get(nid, nid): (seq, tick - ago)
+                for nid, seq, ago in ACK.iter_unpack(data[offset:offset + count * ACK.size])
+            }
+
+        return msg
+
+# Inputs του client
+
+def encode_input(pid, seq, keys, goto=None):
+    raw = json.dumps(pid).encode()
+    if goto is not None:
+        return INPUT_HEADER.pack(WIRE_VERSION, INPUT_GOTO, seq, keys) + GOTO.pack(*goto) + raw
+    return INPUT_HEADER.pack(WIRE_VERSION, INPUT_KEYS, seq, keys) + raw
+
+def encode_heartbeat(pid):
+    return INPUT_HEADER.pack(WIRE_VERSION, INPUT_HEARTBEAT, 0, 0) + json.dumps(pid).encode()
+
+# Id παίκτη: str ή int (όχι bool, λίστα κ.λπ., που δεν χρησιμοποιούνται ως keys)
+def valid_id(pid):
+    return isinstance(pid, (str, int)) and not isinstance(pid, bool)
+
+# Id που χωράει στην εγγραφή NAME. Ελέγχεται μία φορά στο connect, όχι σε κάθε input
+def id_fits(pid):
+    return len(json.dumps(pid)) <= MAX_ID_BYTES     # ensure_ascii: χαρακτήρες = bytes
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+# Έλεγχος τύπων και ορίων ενός input (από JSON ή δυαδικά) πριν φτάσει στον κόσμο.
+# Επιστρέφει καθαρό dict μόνο με τα γνωστά πεδία, ή None αν κάποιο πεδίο είναι άκυρο
+def check_input(msg):
+    if not isinstance(msg, dict):
+        return None
+    pid = msg.get("id")
+    if not valid_id(pid):
+        return None
+    if msg.get("hb"):
+        return {"id": pid, "hb": 1}
+
+    seq = msg.get("seq", 0)
+    keys = msg.get("keys", 0)
+    if not is_int(seq) or not 0 <= seq <= MAX_SEQ or not is_int(keys) or not 0 <= keys <= MAX_KEYS:
+        return None
+    checked = {"id": pid, "seq": seq, "keys": keys}
+
+    goto = msg.get("goto")
+    if goto is not None:
+        if not isinstance(goto, (list, tuple)) or len(goto) != 2:
+            return None
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in goto):
+            return None
+        checked["goto"] = [float(goto[0]), float(goto[1])]
+    return checked
+
+# Μήνυμα input (JSON ή δυαδικό) → dict, None αν δεν αποκωδικοποιείται (οι τύποι ελέγχονται στο check_input)
+def decode_input(data):
+    if data[:1] == b"{":
+        try:
+            msg = json.loads(data)
+        except ValueError:
+            return None
+        return msg if isinstance(msg, dict) else None
+
+    if len(data) < INPUT_HEADER.size:
+        return None
+    version, kind, seq, keys = INPUT_HEADER.unpack_from(data, 0)
+    if version != WIRE_VERSION:
+        return None
+
+    offset = INPUT_HEADER.size
+    goto = None
+    if kind == INPUT_GOTO:
+        if len(data) < offset + GOTO.size:
+            return None
+        goto = list(GOTO.unpack_from(data, offset))
+        offset += GOTO.size
+
+    try:
+        pid = json.loads(data[offset:])
+    except ValueError:
+        return None
+
+    if kind == INPUT_HEARTBEAT:
+        return {"id": pid, "hb": 1}
+
+    msg = {"id": pid, "seq": seq, "keys": keys}
+    if goto is not None:
+        msg["goto"] = goto
+    return msg